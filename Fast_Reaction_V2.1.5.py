@@ -11,6 +11,7 @@ os.environ.setdefault("QT_QUICK_BACKEND", "software")
 
 import csv
 from datetime import datetime
+from typing import Optional
 try:
     from re import T  # type: ignore
 except ImportError:
@@ -23,8 +24,14 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from requests.exceptions import ConnectionError, Timeout, RequestException
 import time   
+import select
+import queue
+import threading
+import collections
+import random
+import socket
+from concurrent.futures import Future
 import numpy as np
-import json
 from PyQt5.QtGui import QPainter, QColor, QFont,QFontDatabase ,QImage, QPixmap,QPen, QPainterPath , QPolygonF, QBrush, QRadialGradient, QLinearGradient, QSurfaceFormat, QMovie
 from PyQt5.QtCore import QTimer,Qt, pyqtSignal, pyqtSlot ,QThread , QTime,QSize,QRectF,QPointF, QUrl, QObject
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget ,QGridLayout,QLabel,QPushButton,QVBoxLayout,QHBoxLayout,QTableWidget,QTableWidgetItem,QHeaderView,QFrame
@@ -53,8 +60,20 @@ import sys
 
 # Import our new API and configuration system
 from api.game_api import GameAPI
+from api.async_game_api import AsyncGameAPI
+from api.leaderboard_cache import LeaderboardCache
 from config import config
 from utils.logger import get_logger
+from utils.serial_events import SerialEvent, SerialEventKind
+from utils.panel_protocol import FRAMING_BINARY, FRAMING_LINE, create_decoder, parse_serial_line
+from utils.game_state import GameCounterStore, merge_counters
+from utils.score_outbox import ScoreOutbox, ScoreSender
+from utils.mqtt_events import MqttEventIngest
+from utils.serial_session_log import SerialSessionRecorder, DIRECTION_RX, DIRECTION_TX
+from utils.device_watcher import DeviceWatcher, device_present
+from utils.runtime_settings import RuntimeSettings, TIMER_VALUE_MS, FINAL_SCREEN_TIMER_MS
+from utils.metrics import metrics, MetricsPublisher, WINDOW_GAME, WINDOW_INTERVAL
+from utils.mqtt_topics import TopicLayout
 
 # Setup logging
 logger = get_logger(__name__)
@@ -65,16 +84,31 @@ ui_config = config.settings.ui
 
 
 
+# Timers pushed over MQTT; screens read them from here when they start
+runtime_settings = RuntimeSettings(game_config.runtime_settings_path)
+
 # Initialize global variables
 final_screen_timer_idle = game_config.final_screen_timer
 count = 0
-TimerValue = game_config.timer_value
+TimerValue = runtime_settings.get(TIMER_VALUE_MS, game_config.timer_value)
 global scaled
 scaled = 1
 scored = 0
-correct_count = 0
-miss_count = 0
-wrong_count = 0
+# Correct/wrong/miss counts and the panel score, written by the serial thread only
+game_counters = GameCounterStore()
+# The same for panels reporting over MQTT (FastReaction/score/Pub), written by the MQTT thread only
+mqtt_counters = GameCounterStore()
+
+
+def current_game_counters():
+    """Coherent counters across serial and MQTT panels (any thread)"""
+    return merge_counters(game_counters.snapshot(), mqtt_counters.snapshot())
+
+
+def reset_game_counters():
+    """Zero the counters of every panel source for a new game (UI thread)"""
+    game_counters.reset()
+    mqtt_counters.reset()
 last_team_name = ""
 last_score = 0
 
@@ -89,6 +123,11 @@ list_players_name = []
 list_players_score = [0,0,0,0,0]
 list_players_id = []
 list_top5_FastReaction = []
+lastplayed = None  # Last-played entry of the leaderboard snapshot
+# Non-blocking API client for the UI thread (created in __main__)
+async_api = None
+# Leaderboard served from memory and refreshed in the background (created in __main__)
+leaderboard_cache = None
 RemainingTime = 0
 teamName = ""
 homeOpened = False
@@ -107,10 +146,15 @@ class SimpleSerialThread(QThread):
     Reads simple data lines from serial port with automatic reconnection
     """
     # Qt signals for thread communication
-    data_received = pyqtSignal(str)  # Emitted when data is received
-    # connection_status_changed = pyqtSignal(bool)  # Emitted when connection status changes
+    data_received = pyqtSignal(str)  # Emitted when data is received (raw line, legacy)
+    event_received = pyqtSignal(object)  # Emitted with a parsed SerialEvent for every line
+    events_batch_received = pyqtSignal(list)  # Emitted once per wakeup with all drained SerialEvents (batch mode)
+    handshake_completed = pyqtSignal(str, bool)  # Emitted with (command, acknowledged) when Start/Stop is acked or times out
+    connection_status_changed = pyqtSignal(bool)  # Emitted when connection status changes
     # error_occurred = pyqtSignal(str)  # Emitted when an error occurs
     # 
+    RECONNECT_BACKOFF_INITIAL = 0.25  # Seconds, first retry delay without device notifications
+    
     def __init__(self, config):
         super().__init__()
         self.config = config
@@ -120,14 +164,48 @@ class SimpleSerialThread(QThread):
         self.auto_reconnect = config.auto_reconnect
         self.reconnect_interval = config.reconnect_interval
         self.max_reconnect_attempts = config.max_reconnect_attempts
+        self.read_mode = getattr(config, 'read_mode', 'select')
+        self.framing = getattr(config, 'framing', FRAMING_LINE)
+        if self.framing not in (FRAMING_LINE, FRAMING_BINARY):
+            logger.warning(f"️  Unknown serial framing '{self.framing}', using '{FRAMING_LINE}'")
+            self.framing = FRAMING_LINE
+        self.max_wake_latency_ms = max(1, int(getattr(config, 'max_wake_latency_ms', 50)))
+        self.batch_events = getattr(config, 'batch_events', True)
+        self.max_batch_size = max(1, int(getattr(config, 'max_batch_size', 64)))
+        self.handshake_timeout_ms = int(getattr(config, 'handshake_timeout_ms', 1000))
+        self.capture_enabled = getattr(config, 'capture_enabled', False)
+        self.capture_dir = getattr(config, 'capture_dir', 'serial_sessions')
+        self.hotplug_detection = getattr(config, 'hotplug_detection', True)
+        self.reconnect_backoff_max = getattr(config, 'reconnect_backoff_max', 30)
         
         self.serial_connection = None
         self.is_monitoring = False
         self.connected = False
         self.should_stop = False
         self.reconnect_attempts = 0
-        
-        logger.info(f" SimpleSerial initialized for port: {self.port} (baudrate: {self.baudrate})")
+        self.event_seq = 0
+        
+        # Start/Stop handshakes are queued here and executed on the serial thread
+        self._commands = queue.SimpleQueue()
+        self._pending_handshake = None  # (command, future, deadline_ns)
+        self._awaiting_ack = set()  # Port ids that still owe an "OK" for the pending handshake
+        self._wake_r, self._wake_w = self._create_wakeup_pipe()
+        self._recorder = None  # SerialSessionRecorder while a game is being captured
+        
+        # Outbound messages from other threads, written by the serial thread per wakeup
+        self._thread_ident = None
+        self._decoders = {}  # port_id -> utils.panel_protocol decoder
+        self._pending_messages = {}  # port_id -> deque of decoded (message, timestamp) not yet delivered
+        self._outbox = collections.deque(maxlen=max(1, int(getattr(config, 'write_queue_size', 256))))
+        self._score_to_send = 0
+        self._score_version = 0
+        self._score_sent_version = 0
+        
+        # Reconnection: wake on /dev notifications when possible, otherwise back off exponentially
+        self._device_watcher = DeviceWatcher(self.port) if self.auto_reconnect and self.hotplug_detection else None
+        self._backoff_delay = self.RECONNECT_BACKOFF_INITIAL
+        
+        logger.info(f" SimpleSerial initialized for port: {self.port} (baudrate: {self.baudrate}, read mode: {self.read_mode})")
     
     def connect(self) -> bool:
         """Establish serial connection"""
@@ -143,14 +221,14 @@ class SimpleSerialThread(QThread):
                 baudrate=self.baudrate,
                 timeout=self.timeout
             )
-            self.connected = True
             self.reconnect_attempts = 0  # Reset reconnect attempts on successful connection
-            # self.connection_status_changed.emit(True)
+            self._reset_decoder(0)
+            self._backoff_delay = self.RECONNECT_BACKOFF_INITIAL
+            self._set_connected(True)
             logger.info(f" Serial connected to {self.port}")
             return True
         except Exception as e:
-            self.connected = False
-            # self.connection_status_changed.emit(False)
+            self._set_connected(False)
             error_msg = f" Failed to connect to {self.port}: {e}"
             logger.error(error_msg)
             # self.error_occurred.emit(error_msg)
@@ -163,12 +241,47 @@ class SimpleSerialThread(QThread):
         if self.serial_connection and self.serial_connection.is_open:
             try:
                 self.serial_connection.close()
-                self.connected = False
-                # self.connection_status_changed.emit(False)
+                self._set_connected(False)
                 logger.info(f" Serial disconnected from {self.port}")
             except Exception as e:
                 logger.warning(f"Error disconnecting serial: {e}")
     
+    def _set_connected(self, connected: bool):
+        """Update the connection flag and notify listeners when it actually changes"""
+        changed = connected != self.connected
+        self.connected = connected
+        if changed:
+            self.connection_status_changed.emit(connected)
+    
+    def _wait_for_reconnect(self):
+        """
+        Sleep until a reconnection attempt is worth making.
+        
+        With device notifications this returns as soon as the port node is (re)created,
+        with reconnect_interval as a safety net. Without them it waits an exponentially
+        growing delay, capped at reconnect_backoff_max seconds.
+        """
+        watcher = self._device_watcher
+        if watcher is not None and watcher.available:
+            timeout = self.reconnect_interval
+            fds = [watcher.fileno()]
+        else:
+            timeout = self._backoff_delay
+            self._backoff_delay = min(self._backoff_delay * 2, self.reconnect_backoff_max)
+            fds = []
+        
+        if self._wake_r is None and not fds:
+            self.msleep(int(timeout * 1000))
+            return
+        if self._wake_r is not None:
+            fds.append(self._wake_r)
+        readable, _, _ = select.select(fds, [], [], timeout)
+        if self._wake_r is not None and self._wake_r in readable:
+            self._drain_wakeups()
+        if watcher is not None and watcher.available and watcher.fileno() in readable:
+            if watcher.read_events():
+                logger.info(f" Device change detected for {self.port}")
+    
     def reconnect(self) -> bool:
         """Attempt to reconnect to serial port"""
         if self.should_stop:
@@ -192,122 +305,333 @@ class SimpleSerialThread(QThread):
     
     from typing import Optional
 
-    def read_line(self) -> Optional[str]:
-
-        """Read a single line from serial port - BIDIRECTIONAL"""
-        if not self.serial_connection or not self.serial_connection.is_open:
-            return None
+    def _decoder(self, port_id: int):
+        """Return the protocol decoder for a port, creating it on first use"""
+        decoder = self._decoders.get(port_id)
+        if decoder is None:
+            decoder = self._decoders[port_id] = create_decoder(self.framing)
+        return decoder
+    
+    def _reset_decoder(self, port_id: int):
+        """Forget partial input and undelivered messages of a (re)opened or lost port"""
+        self._decoders.pop(port_id, None)
+        self._pending_messages.pop(port_id, None)
+    
+    def _next_message(self, connection, port_id: int = 0):
+        """
+        Return the next decoded message from a port as (message, arrival timestamp), or None
         
+        Everything buffered on the port is read in one call and decoded at once; messages
+        beyond the current batch wait in a per-port queue for the next drain.
+        """
+        pending = self._pending_messages.get(port_id)
+        if not pending:
+            if not connection or not connection.is_open:
+                return None
+            waiting = connection.in_waiting
+            if waiting <= 0:
+                return None
+            chunk = connection.read(waiting)
+            received_at = time.monotonic_ns()
+            messages = self._decoder(port_id).feed(chunk)
+            if not messages:
+                return None
+            pending = self._pending_messages.setdefault(port_id, collections.deque())
+            recorder = self._recorder
+            for message in messages:
+                logger.debug(f"[BIDIRECTIONAL] RECEIVED: {message.text}")
+                if recorder and message.raw:
+                    recorder.record(DIRECTION_RX, message.raw, received_at, port_id)
+                pending.append((message, received_at))
+        return pending.popleft()
+    
+    def _next_event_seq(self) -> int:
+        """Return the next event sequence number (only called from the serial thread)"""
+        self.event_seq += 1
+        return self.event_seq
+    
+    def _create_wakeup_pipe(self):
+        """Create a non-blocking pipe used to wake select() when a command is queued"""
+        if os.name == 'nt':
+            # select() only accepts sockets on Windows; commands are picked up on the next wake instead
+            return None, None
         try:
-            if self.serial_connection.in_waiting > 0:
-                line = self.serial_connection.readline().decode('utf-8', errors='ignore').strip()
-                if line:
-                    logger.debug(f"[BIDIRECTIONAL] RECEIVED: {line}")
-                return line if line else None
-        except Exception as e:
-            logger.warning(f"️  Error reading serial data: {e}")
+            read_fd, write_fd = os.pipe()
+            os.set_blocking(read_fd, False)
+            os.set_blocking(write_fd, False)
+            return read_fd, write_fd
+        except OSError as e:
+            logger.warning(f"️  Could not create serial wakeup pipe: {e}")
+            return None, None
+    
+    def _wake(self):
+        """Interrupt a select() wait on the serial thread"""
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass  # Pipe full - a wakeup is already pending
+    
+    def _drain_wakeups(self):
+        try:
+            while os.read(self._wake_r, 512):
+                pass
+        except OSError:
+            pass
+    
+    def _wait_timeout(self) -> float:
+        """Seconds select() may block: max wake latency, capped by a pending handshake deadline"""
+        timeout = self.max_wake_latency_ms / 1000.0
+        if self._pending_handshake is not None:
+            remaining = (self._pending_handshake[2] - time.monotonic_ns()) / 1e9
+            timeout = max(0.0, min(timeout, remaining))
+        return timeout
+    
+    def _wait_idle(self):
+        """Sleep while idle, waking early when a command is queued"""
+        if self._wake_r is None:
+            self.msleep(self.max_wake_latency_ms)
+            return
+        readable, _, _ = select.select([self._wake_r], [], [], self._wait_timeout())
+        if readable:
+            self._drain_wakeups()
+    
+    def _serial_fileno(self, connection=None) -> Optional[int]:
+        """Return the OS file descriptor of the open port, or None if it cannot be selected on"""
+        try:
+            return (connection or self.serial_connection).fileno()
+        except Exception:
+            # Windows ports (and some virtual ports) expose no selectable descriptor
             return None
+    
+    def wait_for_data(self) -> bool:
+        """
+        Block until bytes arrive on the serial port or max_wake_latency_ms elapses.
+        
+        Returns True when data is ready to be read. The thread sleeps in the kernel
+        instead of spinning on in_waiting, so idle CPU stays near zero while a
+        Crct/Mstk/Miss byte still wakes the reader immediately.
+        """
+        if not self.serial_connection or not self.serial_connection.is_open:
+            self.msleep(self.max_wake_latency_ms)
+            return False
+        
+        if self._pending_messages.get(0) or self.serial_connection.in_waiting > 0:
+            return True
         
-        return None
+        fileno = self._serial_fileno()
+        if fileno is None:
+            # No descriptor to wait on - fall back to a short poll
+            self.msleep(1)
+            return self.serial_connection.in_waiting > 0
+        
+        fds = [fileno] if self._wake_r is None else [fileno, self._wake_r]
+        readable, _, _ = select.select(fds, [], [], self._wait_timeout())
+        if self._wake_r is not None and self._wake_r in readable:
+            self._drain_wakeups()
+        return fileno in readable
     
     def send_data(self, data: str) -> bool:
-        """Send data via serial port - BIDIRECTIONAL COMMUNICATION"""
+        """
+        Send data via serial port - BIDIRECTIONAL COMMUNICATION
+        
+        Never blocks the caller: while the serial thread is running, data from other
+        threads is queued and written on the thread's next wakeup together with
+        anything else pending. Returns False only if the port is known to be closed.
+        """
+        if self._thread_ident is not None and threading.get_ident() != self._thread_ident:
+            if not self.connected:
+                logger.warning("️  Cannot send data: serial connection not open")
+                return False
+            self._outbox.append(data)
+            self._wake()
+            return True
+        return self._write_now([data])
+    
+    def _write_now(self, messages: list) -> bool:
+        """Write messages to the port with one write() and one flush() (serial thread, or before it starts)"""
         if not self.serial_connection or not self.serial_connection.is_open:
             logger.warning("️  Cannot send data: serial connection not open")
             return False
         
         try:
             # BIDIRECTIONAL: Send data while still able to receive
-            # logger.info()
-            # self.serial_connection.write(data.encode("utf-8"))
-            data_bytes = bytearray(data, 'utf-8')
-            self.serial_connection.write(data_bytes)
+            payload = "".join(messages)
+            self.serial_connection.write(bytearray(payload, 'utf-8'))
             self.serial_connection.flush()  # Ensure data is sent immediately
+            recorder = self._recorder
+            if recorder:
+                sent_at = time.monotonic_ns()
+                for message in messages:
+                    recorder.record(DIRECTION_TX, message.rstrip("\r\n"), sent_at)
             
-            logger.debug(f"📤 [BIDIRECTIONAL] SENT: {data.strip()}")
+            logger.debug(f"📤 [BIDIRECTIONAL] SENT: {payload.strip()!r}")
             return True
             
         except Exception as e:
             logger.error(f" Error sending serial data: {e}")
             return False
     
-    def start_monitoring(self):
-        """Start monitoring serial data and send start signal - WAIT FOR OK RESPONSE"""
-        self.is_monitoring = True
+    def _flush_writes(self):
+        """Write everything queued since the last wakeup in one go (serial thread only)"""
+        messages = []
+        # Only the latest score update goes out, however many were requested
+        score_version = self._score_version
+        if score_version != self._score_sent_version:
+            messages.append(f"Sc{self._score_to_send}")
+            self._score_sent_version = score_version
+        while True:
+            try:
+                messages.append(self._outbox.popleft())
+            except IndexError:
+                break
+        if not messages:
+            return
+        if not self.connected:
+            logger.debug(f" Dropping {len(messages)} outbound serial message(s): not connected")
+            return
+        self._write_now(messages)
+    
+    def _submit_handshake(self, command: str, payload: str) -> Future:
+        """Queue a Start/Stop handshake for the serial thread and return its acknowledgement future"""
+        future = Future()
+        if not self.isRunning():
+            # No serial thread to wait on the reply - send and report no acknowledgement
+            self.send_data(payload)
+            future.set_result(False)
+            return future
+        if not self.connected:
+            logger.warning(f"️❌ Cannot send '{command}': serial not connected")
+            future.set_result(False)
+            return future
+        self._commands.put((command, payload, future))
+        self._wake()
+        return future
+    
+    def _process_commands(self):
+        """Run queued handshakes and expire an unanswered one (serial thread only)"""
+        while True:
+            try:
+                command, payload, future = self._commands.get_nowait()
+            except queue.Empty:
+                break
+            if self._pending_handshake is not None:
+                logger.warning(f"⚠️ '{self._pending_handshake[0]}' superseded by '{command}' before 'OK' arrived")
+                self._finish_handshake(False)
+            if command == "Start" and self.capture_enabled:
+                self._start_capture()
+            if self._write_now([payload]):
+                deadline = time.monotonic_ns() + self.handshake_timeout_ms * 1_000_000
+                self._pending_handshake = (command, future, deadline)
+                self._awaiting_ack = self._handshake_ports()
+                logger.info(f"📤 Sent '{command}' signal, waiting for 'OK' response...")
+            else:
+                logger.warning(f"️❌ Failed to send '{command}' signal")
+                future.set_result(False)
+                self.handshake_completed.emit(command, False)
         
-        # BIDIRECTIONAL: Send "Start" signal via serial and wait for OK response
-        if self.send_data("Start\n"):
-            logger.info("📤 Serial monitoring started - sent 'Start' signal, waiting for 'OK' response...")
-            
-            # Wait for OK response for up to 5 seconds
-            import time
-            start_time = time.time()
-            ok_received = False
-            
-            
-            if self.serial_connection and self.serial_connection.in_waiting > 0:
-                try:
-                    response = self.serial_connection.readline().strip()
-                    if response:
-                        logger.info(f"📥 Received response: '{response}'")
-                        if response.upper() == "OK":
-                            ok_received = True
-                            logger.info("✅ Received 'OK' - serial communication confirmed!")
-                            
-                        else:
-                            logger.warning(f"⚠️ Expected 'OK' but received: '{response}'")
-                except Exception as e:
-                    logger.error(f"❌ Error reading OK response: {e}")
-                        
-                
-            
-            if not ok_received:
-                logger.warning("⚠️ Did not receive 'OK' response within 5 seconds - continuing anyway")
-        else:
-            logger.warning("️❌ Serial monitoring started but failed to send start signal")
+        if self._pending_handshake is not None and time.monotonic_ns() >= self._pending_handshake[2]:
+            logger.warning(f"⚠️ Did not receive 'OK' for '{self._pending_handshake[0]}' within {self.handshake_timeout_ms}ms - continuing anyway")
+            self._finish_handshake(False)
+    
+    def _handshake_ports(self) -> set:
+        """Port ids expected to answer a Start/Stop with an OK"""
+        return {0}
+    
+    def _finish_handshake(self, acknowledged: bool):
+        command, future, _ = self._pending_handshake
+        self._pending_handshake = None
+        self._awaiting_ack = set()
+        if acknowledged:
+            logger.info(f"✅ Received 'OK' - '{command}' confirmed!")
+        if not future.done():
+            future.set_result(acknowledged)
+        self.handshake_completed.emit(command, acknowledged)
+        if command == "Stop":
+            self._stop_capture()
+    
+    def _start_capture(self):
+        """Begin a new per-game session log (serial thread only)"""
+        self._stop_capture()
+        try:
+            self._recorder = SerialSessionRecorder.for_game(self.capture_dir)
+        except Exception as e:
+            logger.warning(f"️  Could not start serial session capture: {e}")
+            self._recorder = None
+    
+    def _stop_capture(self):
+        recorder, self._recorder = self._recorder, None
+        if recorder:
+            recorder.close()
+    
+    def start_monitoring(self) -> Future:
+        """
+        Start monitoring serial data and send the start signal.
         
+        Returns immediately; the serial thread sends "Start" and waits for "OK" for up to
+        handshake_timeout_ms. The returned Future resolves to True when acknowledged, and
+        handshake_completed is emitted either way.
+        """
+        self.is_monitoring = True
+        future = self._submit_handshake("Start", "Start\n")
         logger.info("🚀 Serial monitoring started (BIDIRECTIONAL) - ready to receive scores and events")
+        return future
     
-    def stop_monitoring(self):
-        """Stop monitoring serial data and send stop signal - WAIT FOR OK RESPONSE"""
+    def stop_monitoring(self) -> Future:
+        """Stop monitoring serial data and send the stop signal (non-blocking, see start_monitoring)"""
         self.is_monitoring = False
-        
-        # BIDIRECTIONAL: Send "Stop" signal via serial and wait for OK response
-        if self.send_data("Stop\n\n"):
-            logger.info("📤 Serial monitoring stopped - sent 'Stop' signal, waiting for 'OK' response...")
-            
-            # Wait for OK response for up to 3 seconds
-            import time
-            start_time = time.time()
-            ok_received = False
-            
-            while time.time() - start_time < .1 and not ok_received:
-                if self.serial_connection and self.serial_connection.in_waiting > 0:
-                    try:
-                        response = self.serial_connection.readline().decode('utf-8', errors='ignore').strip()
-                        if response:
-                            logger.info(f"📥 Received response: '{response}'")
-                            if response.upper() == "OK":
-                                ok_received = True
-                                logger.info("✅ Received 'OK' - stop confirmed!")
-                                break
-                            else:
-                                logger.warning(f"⚠️ Expected 'OK' but received: '{response}'")
-                    except Exception as e:
-                        logger.error(f"❌ Error reading OK response: {e}")
-                        break
-                time.sleep(0.1)
-            
-            if not ok_received:
-                logger.warning("⚠️ Did not receive 'OK' response for stop within 3 seconds")
-        else:
-            logger.warning("️❌ Serial monitoring stopped but failed to send stop signal")
-        
+        future = self._submit_handshake("Stop", "Stop\n\n")
         logger.info("🛑 Serial monitoring stopped (BIDIRECTIONAL)")
+        return future
+    
+    def drain_events(self) -> list:
+        """
+        Read the lines that are already buffered on the port and parse them into events.
+        
+        In batch mode this drains up to max_batch_size lines per wakeup; otherwise it
+        reads a single line like the original loop did.
+        """
+        events = []
+        self._drain_port(0, self.serial_connection, events)
+        if events:
+            # Publish the whole batch to the counter store in one step
+            game_counters.apply_batch(events)
+        return events
+    
+    def _drain_port(self, port_id: int, connection, events: list):
+        """Append events for the lines buffered on one port, up to the batch limit"""
+        limit = self.max_batch_size if self.batch_events else 1
+        while len(events) < limit:
+            try:
+                next_message = self._next_message(connection, port_id)
+            except Exception as e:
+                logger.warning(f"️  Error reading serial data: {e}")
+                break
+            # messages expected (see utils/panel_protocol.py):
+            # Sc{score}, Mstk, Ok, Crct, Miss
+            if next_message is None:
+                break
+            message, received_at = next_message
+            data = message.text
+            if self._pending_handshake is not None and port_id in self._awaiting_ack and message.kind == SerialEventKind.OK:
+                self._awaiting_ack.discard(port_id)
+                if not self._awaiting_ack:
+                    self._finish_handshake(True)
+                continue
+            if not self.is_monitoring:
+                # Only reading to catch a Stop acknowledgement
+                logger.debug(f" Ignoring serial data while not monitoring: {data}")
+                continue
+            # Stamp once here so the UI thread never re-parses
+            event = SerialEvent(message.kind, message.value, received_at, self._next_event_seq(), data, port_id)
+            logger.debug(f" Serial data received on port {port_id}: {data}")
+            events.append(event)
+            self.data_received.emit(data)
     
     def run(self):
         """Main thread loop for reading serial data with automatic reconnection"""
         logger.info(" SimpleSerial thread started")
+        self._thread_ident = threading.get_ident()
         
         # Try initial connection
         if not self.connect():
@@ -319,45 +643,38 @@ class SimpleSerialThread(QThread):
         
         while not self.should_stop:
             try:
-                if self.connected and self.is_monitoring:
-                    data = self.read_line()
-                    # data expected:
-                    # Sc{score}\n
-                    # Mstk\n
-                    # Ok\n
-                    # Crct\n
-                    # Miss\n
-                    if data:
-                        logger.info(f" Serial data received: {data}")
-                        if data.lower().startswith("mstk"):
-                            
-                            global wrong_count
-                            wrong_count += 1
-                           
-                                
-                        elif data.lower().startswith("crct"):
-                            
-                            global correct_count
-                            correct_count += 1
-                            
-                        elif data.lower().startswith("miss"):
-                           
-                            global miss_count
-                            miss_count += 1        
-                        
-                        self.data_received.emit(data)
+                self._flush_writes()
+                self._process_commands()
+                if self.connected and (self.is_monitoring or self._pending_handshake is not None):
+                    if self.read_mode == "select" and not self.wait_for_data():
+                        continue
+                    events = self.drain_events()
+                    if events:
+                        metrics.increment("serial.events", len(events))
+                        metrics.increment("serial.batches")
+                        if self.batch_events:
+                            # One queued signal per wakeup keeps the UI event queue flat
+                            self.events_batch_received.emit(events)
+                        else:
+                            for event in events:
+                                self.event_received.emit(event)
                 elif not self.connected and self.auto_reconnect:
-                    # Attempt reconnection
-                    logger.debug(f" Connection lost, waiting {self.reconnect_interval}s before reconnection attempt")
-                    self.msleep(self.reconnect_interval * 1000)  # Convert to milliseconds
+                    # Attempt reconnection once the device is (back) in place
+                    self._wait_for_reconnect()
                     
                     if not self.should_stop:  # Check again after sleep
-                        if not self.reconnect():
+                        if not device_present(self.port):
+                            # Don't spend reconnect attempts while the device is unplugged
+                            logger.debug(f" {self.port} not present, waiting for it to reappear")
+                        elif not self.reconnect():
                             # If reconnect failed and we've exceeded max attempts, stop trying
                             if (self.max_reconnect_attempts > 0 and 
                                 self.reconnect_attempts >= self.max_reconnect_attempts):
                                 logger.error(" Giving up on reconnection attempts")
                                 break
+                elif self.read_mode == "select":
+                    # Idle (connected but not monitoring) - nothing to read, don't spin
+                    self._wait_idle()
                 
                 # Adaptive delay to prevent excessive CPU usage while maintaining responsiveness
                 # Reduce delay when actively receiving data to minimize sound latency
@@ -373,15 +690,16 @@ class SimpleSerialThread(QThread):
             except Exception as e:
                 logger.error(f" Error in serial thread loop: {e}")
                 # self.error_occurred.emit(str(e))
-                self.connected = False
-                # self.connection_status_changed.emit(False)
+                self._set_connected(False)
                 
                 # If auto-reconnect is disabled, break the loop
                 if not self.auto_reconnect:
                     break
         
         # Cleanup
+        self._stop_capture()
         self.disconnect()
+        self._thread_ident = None
         logger.info(" SimpleSerial thread stopped")
     
     def stop(self):
@@ -390,7 +708,8 @@ class SimpleSerialThread(QThread):
         
         self.should_stop = True
         self.is_monitoring = False
-        self.connected = False
+        self._set_connected(False)
+        self._wake()
         
         # Close serial connection
         self.disconnect()
@@ -402,11 +721,42 @@ class SimpleSerialThread(QThread):
                 self.terminate()
                 self.wait()
         
+        if self._device_watcher is not None:
+            self._device_watcher.close()
+        
+        # Release the wakeup pipe once nothing can select on it any more
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._wake_r = self._wake_w = None
+        
         logger.debug(" SimpleSerial thread stopped successfully")
     
     def send_score_update(self, score: int) -> bool:
-        """Send score update via serial - BIDIRECTIONAL"""
-        return self.send_data(f"Sc{score}")
+        """Send score update via serial - BIDIRECTIONAL
+        
+        Updates requested faster than the serial thread wakes are merged, so only the
+        latest Sc{score} is written.
+        """
+        if self._thread_ident is None or threading.get_ident() == self._thread_ident:
+            return self.send_data(f"Sc{score}")
+        # Score first, then version: the serial thread reads them in the opposite order,
+        # so it never sends a score older than the version it records as sent
+        self._score_to_send = score
+        self._score_version += 1
+        self._wake()
+        return True
+    
+    def queued_writes(self) -> int:
+        """Messages waiting in the write queue (safe from any thread)"""
+        return len(self._outbox)
+    
+    def pending_messages(self) -> int:
+        """Messages decoded from the ports but not yet turned into events"""
+        return sum(len(pending) for pending in list(self._pending_messages.values()))
     
     def send_game_event(self, event: str) -> bool:
         """Send game event (Miss, Ok, Crct, Mstk) via serial - BIDIRECTIONAL"""
@@ -422,140 +772,449 @@ class SimpleSerialThread(QThread):
             'auto_reconnect': self.auto_reconnect,
             'reconnect_attempts': self.reconnect_attempts,
             'max_reconnect_attempts': self.max_reconnect_attempts,
+            'read_mode': self.read_mode,
+            'framing': self.framing,
+            'max_wake_latency_ms': self.max_wake_latency_ms,
+            'batch_events': self.batch_events,
+            'pending_handshake': self._pending_handshake[0] if self._pending_handshake else None,
+            'max_batch_size': self.max_batch_size,
+            'queued_writes': len(self._outbox),
+            'pending_messages': self.pending_messages(),
             'should_stop': self.should_stop
         }
+
+
+class MultiPortSerialThread(SimpleSerialThread):
+    """
+    Serial reader for installations with several reaction panels
+    
+    Port 0 is SerialConfig.port and behaves exactly like SimpleSerialThread (connect(),
+    connected, reconnection). Ports 1..N come from SerialConfig.extra_ports. One thread
+    selects on all of them, and every SerialEvent carries the port_id it arrived on so
+    hits can be attributed per panel.
+    """
+    
+    def __init__(self, config):
+        super().__init__(config)
+        self.extra_ports = list(getattr(config, 'extra_ports', None) or [])
+        self.extra_connections = {}  # port_id -> open serial.Serial
+        self._ready_ports = []
+        self._drain_offset = 0
+        self._next_extra_retry_ns = 0
+        logger.info(f" MultiPortSerial extra panels: {', '.join(self.extra_ports) or 'none'}")
+    
+    def _port_name(self, port_id: int) -> str:
+        return self.port if port_id == 0 else self.extra_ports[port_id - 1]
+    
+    def connect(self) -> bool:
+        """Connect the main port (as SimpleSerialThread does) and any extra panel not yet open"""
+        connected = super().connect()
+        self._connect_extra_ports()
+        return connected
+    
+    def _connect_extra_ports(self):
+        import serial
+        
+        for port_id, port in enumerate(self.extra_ports, start=1):
+            if port_id in self.extra_connections:
+                continue
+            try:
+                self.extra_connections[port_id] = serial.Serial(port=port, baudrate=self.baudrate, timeout=self.timeout)
+                self._reset_decoder(port_id)
+                logger.info(f" Serial panel {port_id} connected to {port}")
+            except Exception as e:
+                logger.debug(f" Serial panel {port_id} ({port}) not available: {e}")
+        self._next_extra_retry_ns = time.monotonic_ns() + self.reconnect_interval * 1_000_000_000
+    
+    def _drop_extra_port(self, port_id: int, error):
+        connection = self.extra_connections.pop(port_id, None)
+        self._reset_decoder(port_id)
+        logger.warning(f"️  Serial panel {port_id} ({self._port_name(port_id)}) lost: {error}")
+        if connection:
+            try:
+                connection.close()
+            except Exception:
+                pass
+    
+    def disconnect(self):
+        super().disconnect()
+        for port_id in list(self.extra_connections):
+            connection = self.extra_connections.pop(port_id)
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Error disconnecting serial panel {port_id}: {e}")
+    
+    def _handshake_ports(self) -> set:
+        return {0} | set(self.extra_connections)
+    
+    def _write_now(self, messages: list) -> bool:
+        """Write to the main port and broadcast to every connected extra panel"""
+        sent = super()._write_now(messages)
+        payload = bytearray("".join(messages), 'utf-8')
+        for port_id, connection in list(self.extra_connections.items()):
+            try:
+                connection.write(payload)
+                connection.flush()
+                if self._recorder:
+                    sent_at = time.monotonic_ns()
+                    for message in messages:
+                        self._recorder.record(DIRECTION_TX, message.rstrip("\r\n"), sent_at, port_id)
+            except Exception as e:
+                self._drop_extra_port(port_id, e)
+        return sent
+    
+    def wait_for_data(self) -> bool:
+        """Select on every open panel at once; remembers which ports are readable"""
+        if self.extra_ports and len(self.extra_connections) < len(self.extra_ports) \
+                and time.monotonic_ns() >= self._next_extra_retry_ns:
+            self._connect_extra_ports()
+        
+        if not self.serial_connection or not self.serial_connection.is_open:
+            self.msleep(self.max_wake_latency_ms)
+            return False
+        
+        ready = []
+        fd_ports = {}
+        unselectable = []
+        for port_id, connection in [(0, self.serial_connection)] + list(self.extra_connections.items()):
+            try:
+                if self._pending_messages.get(port_id) or connection.in_waiting > 0:
+                    ready.append(port_id)
+                    continue
+            except Exception as e:
+                if port_id == 0:
+                    raise
+                self._drop_extra_port(port_id, e)
+                continue
+            fileno = self._serial_fileno(connection)
+            if fileno is None:
+                unselectable.append(port_id)
+            else:
+                fd_ports[fileno] = port_id
+        
+        if not ready:
+            timeout = self._wait_timeout() if not unselectable else min(self._wait_timeout(), 0.001)
+            fds = list(fd_ports) if self._wake_r is None else list(fd_ports) + [self._wake_r]
+            readable, _, _ = select.select(fds, [], [], timeout)
+            if self._wake_r is not None and self._wake_r in readable:
+                self._drain_wakeups()
+            ready = [fd_ports[fd] for fd in readable if fd in fd_ports]
+            ready += [port_id for port_id in unselectable if self.extra_connections[port_id].in_waiting > 0]
+        
+        self._ready_ports = ready
+        return bool(ready)
+    
+    def drain_events(self) -> list:
+        """Drain every readable panel, rotating the start so one busy panel cannot starve the rest"""
+        if self.read_mode == "select":
+            ports = self._ready_ports
+        else:
+            ports = [0] + list(self.extra_connections)
+        self._ready_ports = []
+        if ports:
+            self._drain_offset = (self._drain_offset + 1) % len(ports)
+            ports = ports[self._drain_offset:] + ports[:self._drain_offset]
+        
+        events = []
+        for port_id in ports:
+            connection = self.serial_connection if port_id == 0 else self.extra_connections.get(port_id)
+            if connection is not None:
+                self._drain_port(port_id, connection, events)
+        if events:
+            game_counters.apply_batch(events)
+        return events
+    
+    def get_status(self) -> dict:
+        status = super().get_status()
+        status['extra_ports'] = {
+            port: (port_id in self.extra_connections)
+            for port_id, port in enumerate(self.extra_ports, start=1)
+        }
+        return status
     
     
 
 class MqttThread(QThread):
+    """
+    The station's single, long-lived MQTT connection (owned by MainApp)
+    
+    Reconnects on its own with jittered exponential backoff and re-subscribes from a
+    cached topic set, so a broker restart never leaves the station deaf. Screens
+    connect to its signals while they are shown instead of creating their own threads.
+    """
     message_signal = pyqtSignal(str)
+    events_batch_received = pyqtSignal(list)  # Decoded data-topic events, one batch per flush
     start_signal = pyqtSignal()
     stop_signal = pyqtSignal()
     restart_signal = pyqtSignal()
     activate_signal = pyqtSignal()
     deactivate_signal = pyqtSignal()
 
-    def __init__(self, broker='localhost', port=1883):
+    def __init__(self, broker='localhost', port=1883, client_factory=None):
+        """
+        Args:
+            client_factory: Optional callable(client_id=..., clean_session=...) returning a
+                paho-compatible client, e.g. the in-process broker in scripts_helper/fake_mqtt.py
+        """
         super().__init__()
         mqtt_config = config.settings.mqtt
-        self.data_topics = mqtt_config.data_topics
-        self.control_topics = mqtt_config.control_topics
+        self.station_id = getattr(config.settings, 'station_id', '')
+        self.topic_prefix = getattr(mqtt_config, 'topic_prefix', '')
+        self.topics = TopicLayout.from_config(mqtt_config, self.station_id)
+        self.data_topics = self.topics.expand(mqtt_config.data_topics)
+        self.control_topics = self.topics.expand(mqtt_config.control_topics)
+        self.data_qos = getattr(mqtt_config, 'data_qos', 1)
         self.broker = mqtt_config.broker
         self.port = mqtt_config.port
-        # Fix MQTT deprecation warning by using callback_api_version
-        self.client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2)
-        self.subscribed = False
-
-    def run(self):
+        self.keepalive = getattr(mqtt_config, 'keepalive', 60)
+        self.reconnect_delay_min = getattr(mqtt_config, 'reconnect_delay_min', 1.0)
+        self.reconnect_delay_max = getattr(mqtt_config, 'reconnect_delay_max', 60.0)
+        clean_session = getattr(mqtt_config, 'clean_session', True)
+        client_id = getattr(mqtt_config, 'client_id', '') or ''
+        if not client_id and not clean_session:
+            # A persistent session is keyed by client id, so it must be stable across restarts
+            client_id = f"fast-reaction-{self.station_id or socket.gethostname()}"
+        if client_factory is not None:
+            self.client = client_factory(client_id=client_id, clean_session=clean_session)
+        else:
+            # Fix MQTT deprecation warning by using callback_api_version
+            self.client = mqtt.Client(callback_api_version=mqtt.CallbackAPIVersion.VERSION2,
+                                      client_id=client_id, clean_session=clean_session)
         self.client.on_connect = self.on_connect
+        self.client.on_disconnect = self.on_disconnect
         self.client.on_message = self.on_message
-        self.client.connect(self.broker, self.port)
-        self.client.loop_forever()
+        self.connected = False
+        self.subscribed = False
+        self._stop_requested = False
+        self._stop_event = threading.Event()
+        self._backoff_delay = self.reconnect_delay_min
+        # Topic -> QoS the broker should have for us; reconciled on every (re)connect
+        self._subscriptions = {}
+        # Topic -> QoS the broker holds in our session, as far as we know (None: unknown yet)
+        self._broker_subscriptions = None
+        self._subscriptions_lock = threading.Lock()
+        for topic in self.control_topics:
+            self._subscriptions[topic] = 0
+        self._data_ingest = MqttEventIngest(
+            mqtt_counters,
+            flush_interval_ms=getattr(mqtt_config, 'data_flush_interval_ms', 10),
+            max_batch_size=getattr(mqtt_config, 'data_max_batch_size', 256),
+            # One panel per data topic, so their Sc{score} values don't overwrite each other
+            panel_ids={topic: index for index, topic in enumerate(self.data_topics)},
+        )
+        
+        # Topic -> handler(payload); topics containing + or # are matched in registration order
+        self._handlers = {}
+        self._wildcard_handlers = []
+        self._register_default_handlers()
+
+    def topic(self, name: str) -> str:
+        """Topic that addresses this station for a logical name (see utils/mqtt_topics.py)"""
+        return self.topics.station_topic(name)
+
+    def register_handler(self, topic: str, handler):
+        """
+        Route messages on topic (already prefixed, may contain + / # wildcards) to handler(payload)
+        
+        Handlers run on the paho network thread, so they should only emit signals or
+        update in-memory state.
+        """
+        if '+' in topic or '#' in topic:
+            self._wildcard_handlers = [(sub, h) for sub, h in self._wildcard_handlers if sub != topic]
+            self._wildcard_handlers.append((topic, handler))
+        else:
+            self._handlers[topic] = handler
+
+    def unregister_handler(self, topic: str):
+        self._handlers.pop(topic, None)
+        self._wildcard_handlers = [(sub, h) for sub, h in self._wildcard_handlers if sub != topic]
+
+    def register_topic_handler(self, name: str, handler):
+        """Route a logical topic (station and, if listed, broadcast form) to handler(payload)"""
+        for topic in self.topics.subscriptions(name):
+            self.register_handler(topic, handler)
+
+    def _register_default_handlers(self):
+        self.register_topic_handler("FastReaction/game/start", lambda payload: self.handle_start())
+        self.register_topic_handler("FastReaction/game/Activate", lambda payload: self.handle_Activate())
+        self.register_topic_handler("FastReaction/game/Deactivate", lambda payload: self.deactivate_signal.emit())
+        self.register_topic_handler("FastReaction/game/stop", self.handle_stop_message)
+        self.register_topic_handler("FastReaction/game/restart", lambda payload: self.handle_restart())
+        self.register_topic_handler("FastReaction/game/timer", self.handle_timer)
+        self.register_topic_handler("FastReaction/game/timerfinal", self.handle_timer_final)
+        for topic in self.data_topics:
+            self.register_handler(topic, self.handle_data_message)
+
+    def _find_handler(self, topic: str):
+        handler = self._handlers.get(topic)
+        if handler is None:
+            for sub, candidate in self._wildcard_handlers:
+                if mqtt.topic_matches_sub(sub, topic):
+                    return candidate
+        return handler
+
+    def subscribe(self, topic: str, qos: int = 0):
+        """Add topic to the cached subscription set and subscribe now if connected"""
+        with self._subscriptions_lock:
+            if self._subscriptions.get(topic) == qos:
+                return
+            self._subscriptions[topic] = qos
+            # Under the lock, so on_connect's reconciliation can't interleave
+            if self.connected:
+                self.client.subscribe(topic, qos)
+                self._broker_subscriptions[topic] = qos
+
+    def unsubscribe(self, topic: str):
+        with self._subscriptions_lock:
+            if self._subscriptions.pop(topic, None) is None:
+                return
+            if self.connected:
+                self.client.unsubscribe(topic)
+                self._broker_subscriptions.pop(topic, None)
+
+    def publish(self, topic: str, payload: str, qos: int = 0, retain: bool = False) -> bool:
+        """Queue a message on the shared connection; False (message dropped) while disconnected"""
+        if not self.connected:
+            return False
+        info = self.client.publish(topic, payload, qos=qos, retain=retain)
+        return info.rc == mqtt.MQTT_ERR_SUCCESS
 
     def on_connect(self, client, userdata, flags, rc, properties=None):
-        for topic in self.control_topics:
-            client.subscribe(topic)
+        if getattr(rc, 'is_failure', rc != 0):
+            logger.warning(f"️  MQTT broker {self.broker}:{self.port} refused connection: {rc}")
+            return
+        self._backoff_delay = self.reconnect_delay_min
+        session_present = getattr(flags, 'session_present', False)
+        with self._subscriptions_lock:
+            # Bring the broker's subscriptions in line with the cached set: topics added or
+            # removed while disconnected were only recorded locally
+            if not session_present:
+                held = {}
+            elif self._broker_subscriptions is None:
+                # Session from a previous run: data topics may still be subscribed there
+                held = {topic: None for topic in self.data_topics}
+            else:
+                held = self._broker_subscriptions
+            to_subscribe = [(topic, qos) for topic, qos in self._subscriptions.items() if held.get(topic) != qos]
+            to_unsubscribe = [topic for topic in held if topic not in self._subscriptions]
+            if to_unsubscribe:
+                client.unsubscribe(to_unsubscribe)
+            if to_subscribe:
+                client.subscribe(to_subscribe)
+            self._broker_subscriptions = dict(self._subscriptions)
+            self.connected = True
+        logger.info(f" MQTT connected to {self.broker}:{self.port}"
+                    f"{' (session resumed)' if session_present else ''}: "
+                    f"{len(to_subscribe)} subscribed, {len(to_unsubscribe)} unsubscribed")
+
+    def on_disconnect(self, client, userdata, flags, rc, properties=None):
+        self.connected = False
+        if not self._stop_requested:
+            logger.warning(f"️  MQTT disconnected from {self.broker}:{self.port}: {rc}")
+
+    def _next_reconnect_delay(self) -> float:
+        """Jittered exponential backoff, so a floor of stations doesn't reconnect in lockstep"""
+        delay = random.uniform(self._backoff_delay / 2, self._backoff_delay)
+        self._backoff_delay = min(self._backoff_delay * 2, self.reconnect_delay_max)
+        return delay
 
     def on_message(self, client, userdata, msg, properties=None):
-        print(f"Received message '{msg.payload.decode()}' on topic '{msg.topic}'")
-
-        if msg.topic == "FastReaction/game/start":
-            self.handle_start()
-        elif msg.topic == "FastReaction/game/Activate":
-            self.handle_Activate()
-        elif msg.topic == "FastReaction/game/Deactivate":
-            self.deactivate_signal.emit()
-        elif msg.topic == "FastReaction/game/stop":
-            if msg.payload.decode() == "0":
-                self.handle_stop()
-            elif msg.payload.decode() == "1":
-                self.unsubscribe_from_data_topics()
-        elif msg.topic == "FastReaction/game/restart":
-            print("Game restarted")
-            self.handle_restart()
-        elif msg.topic == "FastReaction/game/timer":
-            global TimerValue
-            TimerValue = int(msg.payload.decode())*1000
-            print(TimerValue)
-            with open("file2.txt", "w") as file:
-                file.write(f"{TimerValue}\n")
-        elif msg.topic == "FastReaction/game/timerfinal":
-            global final_screen_timer_idle
-            final_screen_timer_idle = int(msg.payload.decode())*1000
-            print(final_screen_timer_idle)
-            with open("file.txt", "w") as file:
-                file.write(f"{final_screen_timer_idle}\n")
-        else:
-            if self.subscribed:
-                self.handle_data_message(msg)
+        handler = self._find_handler(msg.topic)
+        if handler is None:
+            logger.debug(f" Ignoring MQTT message on unhandled topic '{msg.topic}'")
+            return
+        
+        payload = msg.payload.decode('utf-8', errors='replace')
+        logger.debug(f" MQTT '{msg.topic}': {payload!r}")
+        try:
+            if handler == self.handle_data_message:
+                # Data topics also need the packet id to spot QoS 1 redeliveries
+                handler(payload, msg.topic, msg.mid if msg.qos else 0, msg.dup)
+                return
+            handler(payload)
+        except Exception as e:
+            logger.warning(f"️  Error handling MQTT message on '{msg.topic}': {e}")
+
+    def handle_stop_message(self, payload: str):
+        if payload == "0":
+            self.handle_stop()
+        elif payload == "1":
+            self.unsubscribe_from_data_topics()
+
+    def handle_timer(self, payload: str):
+        runtime_settings.set(TIMER_VALUE_MS, int(payload)*1000)
+
+    def handle_timer_final(self, payload: str):
+        runtime_settings.set(FINAL_SCREEN_TIMER_MS, int(payload)*1000)
+
+    def handle_data_message(self, payload: str, topic: str = "", mid: int = 0, dup: bool = False):
+        """Queue panel events from a data topic; they reach the UI as one batch per flush"""
+        if not self.subscribed:
+            return
+        self.message_signal.emit(payload)
+        self._data_ingest.add(topic, payload, mid, dup)
+        if self._data_ingest.flush_due():
+            self._flush_data_events()
+
+    def _flush_data_events(self):
+        events = self._data_ingest.flush()
+        if events:
+            metrics.increment("mqtt.events", len(events))
+            self.events_batch_received.emit(events)
 
-    def handle_data_message(self, msg):
-        data = msg.payload.decode()
-        self.message_signal.emit(data)
+    @property
+    def pending_events(self) -> int:
+        """Data-topic events waiting for the next flush"""
+        return self._data_ingest.pending
 
     def handle_restart(self):
-        print("Game restarted")
+        logger.debug(" Game restarted")
         self.subscribe_to_data_topics()
         self.restart_signal.emit()     
 
     def handle_start(self):
-        print("Game started")
+        logger.debug(" Game started")
         self.subscribe_to_data_topics()
         self.start_signal.emit()
 
     def handle_Activate(self):
-        print("Game Activated")
+        logger.debug(" Game Activated")
         self.activate_signal.emit()
 
     def handle_stop(self):
-        print("Game stopped")
+        logger.debug(" Game stopped")
         self.unsubscribe_from_data_topics()
         self.stop_signal.emit()
    
     def subscribe_to_data_topics(self):
         if not self.subscribed:
+            self._data_ingest.reset()
             for topic in self.data_topics:
-                self.client.subscribe(topic)
+                self.subscribe(topic, self.data_qos)
             self.subscribed = True
 
     def unsubscribe_from_data_topics(self):
         if self.subscribed:
             for topic in self.data_topics:
-                self.client.unsubscribe(topic)
+                self.unsubscribe(topic)
             self.subscribed = False
     
     def stop(self):
-        """Safely stop the MQTT thread and cleanup resources"""
+        """Safely stop the MQTT thread and cleanup resources (application shutdown)"""
         logger.debug(" Stopping MqttThread...")
+        self._stop_requested = True
+        self._stop_event.set()
         
         try:
-            # Unsubscribe from all topics first
-            if hasattr(self, 'client') and self.client:
+            if self.client:
                 try:
-                    # Unsubscribe from data topics
-                    if self.subscribed:
-                        for topic in self.data_topics:
-                            self.client.unsubscribe(topic)
-                        self.subscribed = False
-                    
-                    # Unsubscribe from control topics
-                    for topic in self.control_topics:
-                        self.client.unsubscribe(topic)
-                    
-                    logger.debug(" Unsubscribed from all MQTT topics")
-                except Exception as e:
-                    logger.warning(f"️  Error unsubscribing from topics: {e}")
-                
-                try:
-                    # Disconnect the MQTT client gracefully
-                    self.client.loop_stop()  # Stop the network loop
-                    self.client.disconnect()  # Disconnect from broker
+                    # Disconnect the MQTT client gracefully; the broker drops our subscriptions
+                    # with a clean session, and keeps them for the next start otherwise
+                    self.client.disconnect()
                     logger.debug(" MQTT client disconnected")
                 except Exception as e:
                     logger.warning(f"️  Error disconnecting MQTT client: {e}")
-                
-                self.client = None
-        
         except Exception as e:
             logger.warning(f"️  Error in MQTT cleanup: {e}")
         
@@ -566,20 +1225,41 @@ class MqttThread(QThread):
                 # Only terminate as last resort
                 self.terminate()
                 self.wait()
+        self.connected = False
         
         logger.debug(" MqttThread stopped successfully")
     
     def run(self):
-        """Run MQTT client with proper error handling and cleanup support"""
-        try:
-            self.client.on_connect = self.on_connect
-            self.client.on_message = self.on_message
-            self.client.connect(self.broker, self.port)
-            self.client.loop_forever()  # This will run until loop_stop() is called
-        except Exception as e:
-            logger.error(f" MQTT thread error: {e}")
-        finally:
-            logger.debug(" MQTT thread run() method exiting")
+        """Keep the connection up until stop(), flushing data-topic batches as they come due"""
+        client = self.client
+        needs_connect = True
+        while not self._stop_requested:
+            try:
+                if needs_connect:
+                    client.connect(self.broker, self.port, keepalive=self.keepalive)
+                    needs_connect = False
+                # Drive the network loop ourselves so data-topic events can be flushed in
+                # batches: block only until the pending batch is due
+                rc = client.loop(timeout=self._data_ingest.seconds_until_flush())
+                if self._data_ingest.flush_due():
+                    self._flush_data_events()
+                if rc == mqtt.MQTT_ERR_SUCCESS:
+                    continue
+                if self._stop_requested:
+                    break
+                logger.warning(f"️  MQTT connection lost (rc={rc})")
+            except Exception as e:
+                if self._stop_requested:
+                    break
+                logger.warning(f"️  MQTT connection to {self.broker}:{self.port} failed: {e}")
+            
+            self.connected = False
+            needs_connect = True
+            delay = self._next_reconnect_delay()
+            logger.info(f" Reconnecting to MQTT broker in {delay:.1f}s")
+            self._stop_event.wait(delay)
+        
+        logger.debug(" MQTT thread run() method exiting")
 
 
 class GameManager(QThread):
@@ -608,6 +1288,25 @@ class GameManager(QThread):
             logger.error(f" Failed to initialize GameAPI: {e}")
             raise
             
+        # Finished games go to a local outbox; the sender submits them in the background
+        self.outbox = None
+        self.score_sender = None
+        try:
+            self.outbox = ScoreOutbox(game_config.score_outbox_path)
+            self.score_sender = ScoreSender(
+                self.outbox,
+                lambda game_result_id, scores, key: self.api.submit_final_scores_status(game_result_id, scores, idempotency_key=key),
+                retry_interval=game_config.score_retry_interval,
+                retry_interval_max=game_config.score_retry_interval_max,
+                max_attempts=game_config.score_max_attempts,
+            )
+            # Refresh the leaderboard once the server has the new scores
+            self.score_sender.submitted.connect(lambda _: self._update_leaderboard())
+            self.score_sender.start()
+            metrics.register_gauge("scores.pending", self.outbox.pending_count)
+        except Exception as e:
+            logger.error(f" Score outbox unavailable, scores will be submitted directly: {e}")
+            
         # Game state
         self.game_result_id = None
         self.submit_score_flag = False
@@ -657,7 +1356,8 @@ class GameManager(QThread):
                 continue
     
     def _poll_initialization(self) -> bool:
-        """Poll for game initialization"""
+        """Poll for game initialization (adaptive, jittered interval - see api/poll_scheduler.py)"""
+        scheduler = self.api.create_poll_scheduler() if getattr(self, 'api', None) is not None else None
         while self.playStatus:
             try:
                 if not hasattr(self, 'api') or self.api is None:
@@ -691,11 +1391,16 @@ class GameManager(QThread):
                     else:
                         logger.info("⏳ Waiting for home screen to be ready...")
                 
-                time.sleep(3)  # Poll every 3 seconds
+                scheduler.record_unchanged()
+                scheduler.wait(lambda: not self.playStatus)
                 
             except Exception as e:
                 logger.error(f" Error polling initialization: {e}")
-                time.sleep(5)
+                if scheduler is not None:
+                    scheduler.record_error()
+                    scheduler.wait(lambda: not self.playStatus)
+                else:
+                    time.sleep(5)
                 
         return False
     
@@ -846,47 +1551,21 @@ class GameManager(QThread):
             return False
     
     def _wait_and_submit_scores(self) -> bool:
-        """Wait for game completion and submit scores"""
+        """Wait for game completion, then queue the scores and move on to the next team"""
         while self.playStatus and not self.cancel_flag:
             if self.submit_score_flag:
                 try:
                     # Prepare individual scores
-                    global scored, list_players_id
+                    global scored, list_players_id, teamName
                     individual_scores = self._prepare_individual_scores(scored, list_players_id)
                     
-                    #  SAVE PLAYER DATA TO CSV FIRST (before API submission)
-                    logger.info(" Saving FastReaction player data to CSV before API submission...")
-                    self._save_individual_players_csv(self.game_result_id, individual_scores, None)  # None = pre-submission
-                    self._save_pre_submission_log(self.game_result_id, individual_scores)
-                    logger.info(" FastReaction player data saved locally before submission")
-                     # SAVE TEAM DATA AND BACKEND PAYLOAD TO JSON (before API submission)
-                    global teamName
-                    logger.info("Saving team data and backend payload to JSON...")
-                    self.save_team_and_payload_to_json(teamName, individual_scores, self.game_result_id)
-                    logger.info(" Team data and backend payload saved to JSON")
-                    
-                    # Submit scores with API safety check
-                    if not hasattr(self, 'api') or self.api is None:
-                        logger.error(" GameAPI not available for score submission")
-                        return False
-                    
-                    # Submit scores using original method (keep as main submitter)
-                    logger.info(" Now submitting FastReaction scores to API...")
-                    success = self.api.submit_final_scores(self.game_result_id, individual_scores)
-                    
-                    # Save player CSV with final submission status (after API submission)
-                    self._save_individual_players_csv(self.game_result_id, individual_scores, success)
-                    
-                    if success:
-                        logger.info(" Scores submitted successfully")
-                        # Get updated leaderboard
-                        self._update_leaderboard()
-                        self.submit_signal.emit()
-                        self._reset_game_state()
-                        return True
-                    else:
-                        logger.error(" Failed to submit scores")
+                    if not self._queue_scores(self.game_result_id, individual_scores, teamName):
                         time.sleep(5)
+                        continue
+                    
+                    self.submit_signal.emit()
+                    self._reset_game_state()
+                    return True
                         
                 except Exception as e:
                     logger.error(f" Error submitting scores: {e}")
@@ -895,51 +1574,30 @@ class GameManager(QThread):
                 time.sleep(1)  # Check every second for score submission flag
                 
         return False
-    def save_team_and_payload_to_json(self, team_name, individual_scores, game_result_id):
-        """Save team data and backend payload in one JSON file"""
-        try:
-            # Create teams directory if it doesn't exist
-            teams_dir = "teams"
-            if not os.path.exists(teams_dir):
-                os.makedirs(teams_dir)
-            
-            # Generate timestamp for filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # Create safe filename from team name
-            safe_team_name = "".join(c for c in team_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-            safe_team_name = safe_team_name.replace(' ', '_')
-            
-            # Create JSON filename
-            json_filename = f"{timestamp}_{safe_team_name}.json"
-            json_file_path = os.path.join(teams_dir, json_filename)
-            
-            # Prepare the exact backend payload structure
-            backend_payload = {
-                "gameResultID": game_result_id,
-                "individualScore": individual_scores
-            }
-            
-            # Combine team data and backend payload in one JSON
-            combined_data = {
-                "team_name": team_name,
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "total_score": sum(score_data.get('score', 0) for score_data in individual_scores),
-                "backend_payload": backend_payload
-                
-            }
-            
-            # Save to JSON file
-            with open(json_file_path, 'w', encoding='utf-8') as json_file:
-                json.dump(combined_data, json_file, indent=2, ensure_ascii=False)
-            
-            print(f"Team data and backend payload saved to JSON: {json_file_path}")
-            logger.info(f"Team data and backend payload saved to JSON: {json_file_path}")
-            
-        except Exception as e:
-            print(f"An error occurred while saving team data and payload to JSON: {e}")
-            logger.error(f"Error saving team data and payload to JSON: {e}")
-   
+    
+    def _queue_scores(self, game_result_id: str, individual_scores: list, team_name: str) -> bool:
+        """
+        Store the scores in the outbox (one SQLite transaction) and wake the sender
+        
+        Without an outbox the scores are submitted directly, once.
+        """
+        if self.outbox is not None:
+            if self.outbox.enqueue(game_result_id, individual_scores, team_name):
+                logger.info(f" Scores for {game_result_id} queued ({self.outbox.pending_count()} pending)")
+                self.score_sender.wake()
+            else:
+                logger.warning(f"️  Scores for {game_result_id} were already submitted, not queued again")
+            return True
+        
+        if not hasattr(self, 'api') or self.api is None:
+            logger.error(" GameAPI not available for score submission")
+            return False
+        logger.info(" Submitting FastReaction scores to API...")
+        success = self.api.submit_final_scores(game_result_id, individual_scores, idempotency_key=game_result_id)
+        if success:
+            self._update_leaderboard()
+        return success
+    
     def _prepare_individual_scores(self, total_score: int, player_ids: list) -> list:
         """Prepare individual scores in the required format"""
         if not player_ids:
@@ -962,122 +1620,13 @@ class GameManager(QThread):
         logger.info(f" Prepared scores for {len(individual_scores)} players")
         return individual_scores
     
-    def _save_individual_players_csv(self, game_result_id: str, individual_scores: list, success: bool):
-        """Save individual player scores for database revision"""
-        try:
-            csv_filename = "FastReaction_Individual_Players_Log.csv"
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Check if file exists to determine if we need headers
-            file_exists = os.path.exists(csv_filename)
-            
-            with open(csv_filename, 'a', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'timestamp', 'game_result_id', 'user_id', 'node_id', 
-                    'individual_score', 'submission_success', 'status'
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                # Write header if file is new
-                if not file_exists:
-                    writer.writeheader()
-                    logger.info(f" Created new individual players log file: {csv_filename}")
-                
-                # Determine status based on success parameter
-                if success is None:
-                    status = "pre_submission"
-                elif success:
-                    status = "submitted_success"
-                else:
-                    status = "submitted_failed"
-                
-                # Write one row per player
-                for score_data in individual_scores:
-                    writer.writerow({
-                        'timestamp': timestamp,
-                        'game_result_id': game_result_id,
-                        'user_id': score_data.get('userID', 'Unknown'),
-                        'node_id': score_data.get('nodeID', 'N/A'),
-                        'individual_score': score_data.get('score', 0),
-                        'submission_success': success,
-                        'status': status
-                    })
-                
-            if success is None:
-                logger.info(f" Player data saved to {csv_filename} BEFORE API submission")
-            else:
-                logger.info(f" Player data status updated in {csv_filename} AFTER API submission")
-            
-        except Exception as e:
-            logger.error(f" Error saving individual players log to CSV: {e}")
-            # Don't let CSV errors break the game flow
-    
-    def _save_pre_submission_log(self, game_result_id: str, individual_scores: list):
-        """Save a pre-submission log entry for safety"""
-        try:
-            csv_filename = "FastReaction_Pre_Submission_Backup.csv"
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Check if file exists to determine if we need headers
-            file_exists = os.path.exists(csv_filename)
-            
-            with open(csv_filename, 'a', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'timestamp', 'game_result_id', 'total_players', 'total_score', 
-                    'player_ids', 'individual_scores_json', 'status'
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                # Write header if file is new
-                if not file_exists:
-                    writer.writeheader()
-                    logger.info(f" Created new pre-submission backup file: {csv_filename}")
-                
-                # Calculate totals
-                total_players = len(individual_scores)
-                total_score = sum(score_data.get('score', 0) for score_data in individual_scores)
-                
-                # Create player IDs list
-                player_ids = [score_data.get('userID', 'Unknown') for score_data in individual_scores]
-                player_ids_str = " | ".join(player_ids)
-                
-                # Convert individual scores to JSON string for complete backup
-                individual_scores_json = json.dumps(individual_scores)
-                
-                writer.writerow({
-                    'timestamp': timestamp,
-                    'game_result_id': game_result_id,
-                    'total_players': total_players,
-                    'total_score': total_score,
-                    'player_ids': player_ids_str,
-                    'individual_scores_json': individual_scores_json,
-                    'status': 'saved_before_submission'
-                })
-                
-            logger.info(f" Pre-submission backup saved to {csv_filename}")
-            logger.info(f"    Game ID: {game_result_id}")
-            logger.info(f"    Players: {total_players}")
-            logger.info(f"    Total Score: {total_score}")
-            
-        except Exception as e:
-            logger.error(f" Error saving pre-submission backup: {e}")
-            # Don't let CSV errors break the game flow
-    
     def _update_leaderboard(self):
-        """Update the leaderboard data"""
-        try:
-            global list_top5_FastReaction ,lastplayed_score,lastplayed_weighted_points,lastplayed_rank
-            leaderboard , lastplayed = self.api.get_leaderboard()
-            if lastplayed is not None:
-                lastplayed_score = lastplayed.get('total_score', 0)
-                lastplayed_weighted_points = lastplayed.get('weighted_points', 0)
-                lastplayed_rank = lastplayed.get('rank', 0)
-            list_top5_FastReaction.clear()
-            list_top5_FastReaction.extend(leaderboard)
-
-            logger.info(f" Leaderboard updated with {len(leaderboard)} entries")
-        except Exception as e:
-            logger.error(f" Error updating leaderboard: {e}")
+        """Have the leaderboard cache refetch in the background so the new scores show up"""
+        if leaderboard_cache is None:
+            logger.warning("️  Leaderboard cache not available, leaderboard not refreshed")
+            return
+        leaderboard_cache.invalidate()
+        logger.info(" Leaderboard refresh requested")
     
     def _reset_game_state(self):
         """Reset game state for next round"""
@@ -1115,6 +1664,15 @@ class GameManager(QThread):
             except Exception as e:
                 logger.warning(f"️  Error disconnecting signals: {e}")
             
+            # Stop the score sender; anything still pending stays in the outbox for the next start
+            if getattr(self, 'score_sender', None) is not None:
+                try:
+                    self.score_sender.stop()
+                    metrics.unregister_gauge("scores.pending")
+                    logger.debug(" Score sender stopped")
+                except Exception as e:
+                    logger.warning(f"️  Error stopping score sender: {e}")
+            
             # Clean up API object
             if hasattr(self, 'api') and self.api:
                 try:
@@ -1445,27 +2003,33 @@ class Active_screen(QWidget):
     ok_signal = pyqtSignal()
     crct_signal = pyqtSignal()
     mstk_signal = pyqtSignal()
-    def __init__(self, serial_thread=None):
+    # New game duration in ms; emitted from the settings listener, delivered on the UI thread
+    timer_value_changed = pyqtSignal(int)
+    def __init__(self, serial_thread=None, mqtt_thread=None):
         super().__init__()
         
+        # Show a timer pushed over MQTT right away instead of on the next setupUi
+        self.timer_value_changed.connect(self.apply_timer_value)
+        self._runtime_settings_attached = False
+        self.attach_runtime_settings()
+        
         # Audio signal debouncing to prevent rapid-fire sound issues
         self.last_audio_signal_time = {}
         self.audio_debounce_interval = 100  # Minimum 100ms between same audio signals
         
-        # Initialize MQTT thread
-        self.mqtt_thread = MqttThread('localhost')
-        self.mqtt_thread.start_signal.connect(self.start_game)
-        self.mqtt_thread.stop_signal.connect(self.stop_game)
-        self.mqtt_thread.restart_signal.connect(self.restart_game)
-        self.mqtt_thread.start()
+        # Shared MQTT connection (managed by MainApp); this screen only attaches its handlers
+        self._mqtt_service = mqtt_thread
+        self.mqtt_thread = None
+        self.init_mqtt_thread()
         
         # Store reference to serial thread (managed by MainApp)
         self.serial_thread = serial_thread
         if self.serial_thread:
             # Connect to serial signals
             try:
-                self.serial_thread.data_received.connect(self.on_serial_data_received)
-                # self.serial_thread.connection_status_changed.connect(self.on_serial_connection_status_changed)
+                self.serial_thread.event_received.connect(self.on_serial_event_received)
+                self.serial_thread.events_batch_received.connect(self.on_serial_events_batch)
+                self.serial_thread.connection_status_changed.connect(self.on_serial_connection_status_changed)
                 # self.serial_thread.error_occurred.connect(self.on_serial_error)
                 logger.info(" Serial signals connected to Active_screen")
             except Exception as e:
@@ -1486,12 +2050,18 @@ class Active_screen(QWidget):
         # Initialize reconnection timer for serial connection
         self.reconnection_timer = None
         self.reconnection_attempts = 0
+        self.reconnection_pending = False  # Game is waiting for the serial device to come back
         self.warning_blink_timer = None
         
-    def _should_emit_audio_signal(self, signal_type: str) -> bool:
-        """Check if enough time has passed since last audio signal to prevent rapid-fire sounds"""
-        import time
-        current_time = time.time() * 1000  # Convert to milliseconds
+    def _should_emit_audio_signal(self, signal_type: str, timestamp_ns: Optional[int] = None) -> bool:
+        """Check if enough time has passed since last audio signal to prevent rapid-fire sounds
+        
+        timestamp_ns is the serial arrival time of the event (time.monotonic_ns()), so the
+        debounce measures the gap between hits rather than when the UI got to them.
+        """
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        current_time = timestamp_ns / 1_000_000  # Convert to milliseconds
         
         if signal_type not in self.last_audio_signal_time:
             self.last_audio_signal_time[signal_type] = 0
@@ -1547,13 +2117,14 @@ class Active_screen(QWidget):
             if hasattr(self, 'fastreaction_backend') and self.fastreaction_backend:
                 logger.info("Performing manual QML refresh...")
                 # Re-emit all signals by calling the setter methods
-                global teamName, scored, correct_count, wrong_count, miss_count
+                global teamName, scored
+                counters = current_game_counters()
                 
                 self.fastreaction_backend.set_team_name(teamName)
                 self.fastreaction_backend.set_score_value(str(scored))
-                self.fastreaction_backend.set_correct_count(str(correct_count))
-                self.fastreaction_backend.set_wrong_count(str(wrong_count))
-                self.fastreaction_backend.set_miss_count(str(miss_count))
+                self.fastreaction_backend.set_correct_count(str(counters.correct))
+                self.fastreaction_backend.set_wrong_count(str(counters.wrong))
+                self.fastreaction_backend.set_miss_count(str(counters.miss))
                 
                 # Update timer display
                 minutes = self.countdown_time // 60
@@ -1623,25 +2194,40 @@ class Active_screen(QWidget):
         except Exception as e:
             logger.error(f"Error connecting backend signals directly: {e}")
         
+    def _mqtt_handlers(self):
+        mqtt_thread = self.mqtt_thread
+        return ((mqtt_thread.start_signal, self.start_game),
+                (mqtt_thread.events_batch_received, self.on_serial_events_batch),
+                (mqtt_thread.stop_signal, self.stop_game),
+                (mqtt_thread.restart_signal, self.restart_game))
+    
     def init_mqtt_thread(self):
-        """Initialize or reinitialize MQTT thread if needed"""
+        """Attach this screen's handlers to the shared MQTT connection (no-op if already attached)"""
         try:
-            if not hasattr(self, 'mqtt_thread') or self.mqtt_thread is None:
-                logger.info(" Initializing MQTT thread...")
-                self.mqtt_thread = MqttThread('localhost')
-                self.mqtt_thread.start_signal.connect(self.start_game)
-                self.mqtt_thread.stop_signal.connect(self.stop_game)
-                self.mqtt_thread.restart_signal.connect(self.restart_game)
-                self.mqtt_thread.start()
-                logger.info(" MQTT thread initialized successfully")
-            elif not self.mqtt_thread.isRunning():
-                logger.info(" Starting existing MQTT thread...")
-                self.mqtt_thread.start()
-                logger.info(" MQTT thread started successfully")
-            else:
-                logger.debug(" MQTT thread already running")
+            if self.mqtt_thread is not None:
+                logger.debug(" MQTT handlers already attached")
+                return
+            if self._mqtt_service is None:
+                logger.warning("️  No MQTT service available for Active screen")
+                return
+            self.mqtt_thread = self._mqtt_service
+            for signal, slot in self._mqtt_handlers():
+                signal.connect(slot)
+            logger.info(" Active screen attached to MQTT service")
         except Exception as e:
-            logger.error(f" Error initializing MQTT thread: {e}")
+            logger.error(f" Error attaching MQTT handlers: {e}")
+    
+    def detach_mqtt_thread(self):
+        """Disconnect this screen's handlers; the connection itself stays up"""
+        if self.mqtt_thread is None:
+            return
+        for signal, slot in self._mqtt_handlers():
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+        self.mqtt_thread = None
+        logger.debug(" Active screen detached from MQTT service")
     
     def setup_qml_import_paths(self):
         """Setup QML import paths for better compatibility."""
@@ -1891,155 +2477,85 @@ class Active_screen(QWidget):
     
     @pyqtSlot(str)
     def on_serial_data_received(self, data):
-        """Handle serial data received from device"""
+        """Handle a raw serial line (legacy path) by parsing it and applying the event"""
+        self.on_serial_event_received(parse_serial_line(data))
+    
+    @pyqtSlot(object)
+    def on_serial_event_received(self, event: SerialEvent):
+        """Handle a single parsed serial event from the device"""
+        self.on_serial_events_batch([event])
+    
+    @pyqtSlot(list)
+    def on_serial_events_batch(self, events: list):
+        """
+        Apply a batch of parsed serial events with a single backend update.
+        
+        Score events coalesce to the last value, counters are pushed once, and each
+        audio signal fires at most once per batch (still subject to debouncing).
+        """
         try:
-            logger.debug(f" Serial data received: {data}")
+            if not events:
+                return
             
             # Ensure QML backend is properly connected before processing updates
             if not self._ensure_backend_connection():
                 logger.warning("Backend connection lost, skipping update")
                 return
-            
-            # Process the serial data based on your game logic
-            # Example: if data contains score information
-             # data expected:
-                    # Sc{score}\n
-                    # Mstk\n
-                    # Ok\n
-                    # Crct\n
-                    # Miss\n
 
             global scored, serial_scoring_active, gameStarted
             
-            # Debug logging for edge device troubleshooting
-            logger.info(f"QML widget initialized: {getattr(self, 'qml_widget_initialized', False)}")
-            logger.info(f"Backend exists: {hasattr(self, 'fastreaction_backend') and self.fastreaction_backend is not None}")
-            logger.info(f"Game started: {gameStarted}")
+            if not gameStarted:  # Only update score if game is active
+                logger.debug(f" Serial data received but game not active: {[event.raw for event in events]}")
+                return
             
-            if gameStarted:  # Only update score if game is active
-                if data.lower().startswith("sc"):
-                    scored = int(data.split("Sc")[1])
-                    serial_scoring_active = True
-                    logger.info(f"Score updated via serial: +{data} (total: {scored})")
-                    
-                    # Update the score display if the label exists
-                    # if hasattr(self, 'label_Score'):
-                    # self.label_Score.setText(f"Score: {scored}")
-                    logger.info(f"Updating backend score: {scored}")
-                    self.fastreaction_backend.set_score_value(str(scored))
-                    # Force QML refresh to ensure immediate update
-                    self.fastreaction_backend.force_qml_refresh()
-                    logger.info(f"Backend score updated successfully")
-
-                    # BIDIRECTIONAL: Send acknowledgment back
-                    # if self.serial_thread:
-                    #     self.serial_thread.send_data("ScoreReceived")
-                        
-                elif data.lower().startswith("mstk"):
-                    serial_scoring_active = True
-                    logger.info(f"Mstk updated via serial")
-                    # Use debouncing to prevent rapid-fire audio signals
-                    if self._should_emit_audio_signal("mstk"):
-                        logger.info("Emitting mstk_signal")
-                        global wrong_count
-                        # wrong_count += 1
-                        logger.info(f"Updating backend wrong count: {wrong_count}")
-                        self.fastreaction_backend.set_wrong_count(str(wrong_count))
-                        # Force QML refresh to ensure immediate update
-                        self.fastreaction_backend.force_qml_refresh()
-                        logger.info(f"Backend wrong count updated successfully")
-                        self.mstk_signal.emit()
-                    else:
-                        logger.debug("Mstk signal debounced (too soon)")
-                    # BIDIRECTIONAL: Send acknowledgment back
-                    # if self.serial_thread:
-                    #     self.serial_thread.send_data("MstkReceived")
-                        
-                elif data.lower().startswith("ok"):
-                    serial_scoring_active = True
-                    logger.info(f"Ok updated via serial")
-                    # Use debouncing to prevent rapid-fire audio signals
-                    if self._should_emit_audio_signal("ok"):
-                        self.ok_signal.emit()
-                    # BIDIRECTIONAL: Send acknowledgment back
-                    # if self.serial_thread:
-                    #     self.serial_thread.send_data("OkReceived")
-                        
-                elif data.lower().startswith("crct"):
-                    serial_scoring_active = True
-                    logger.info(f"Crct updated via serial")
-                    # Use debouncing to prevent rapid-fire audio signals
-                    if self._should_emit_audio_signal("crct"):
-                        logger.info("Emitting crct_signal")
-                        global correct_count
-                        # correct_count += 1
-                        logger.info(f"Updating backend correct count: {correct_count}")
-                        self.fastreaction_backend.set_correct_count(str(correct_count))
-                        # Force QML refresh to ensure immediate update
-                        self.fastreaction_backend.force_qml_refresh()
-                        logger.info(f"Backend correct count updated successfully")
-                        self.crct_signal.emit()
-                        
-                    else:
-                        logger.debug("Crct signal debounced (too soon)")
-                    # BIDIRECTIONAL: Send acknowledgment back
-                    # if self.serial_thread:
-                    #     self.serial_thread.send_data("CrctReceived")
-                        
-                elif data.lower().startswith("miss"):
-                    serial_scoring_active = True
-                    logger.info(f"Miss updated via serial")
-                    # Use debouncing to prevent rapid-fire audio signals
-                    if self._should_emit_audio_signal("miss"):
-                        global miss_count
-                        # miss_count += 1
-                        logger.info(f"Updating backend miss count: {miss_count}")
-                        self.fastreaction_backend.set_miss_count(str(miss_count))
-                        # Force QML refresh to ensure immediate update
-                        self.fastreaction_backend.force_qml_refresh()
-                        logger.info(f"Backend miss count updated successfully")
-                        self.miss_signal.emit()
-                    # BIDIRECTIONAL: Send acknowledgment back
-                    # if self.serial_thread:
-                    #     self.serial_thread.send_data("MissReceived")
-                        
+            latest_score = None
+            counts_changed = False
+            audio_signals = {}  # signal type -> (Qt signal, triggering event timestamp), in arrival order
+            
+            for event in events:
+                if event.kind == SerialEventKind.SCORE:
+                    latest_score = event.value
+                elif event.kind == SerialEventKind.MISTAKE:
+                    counts_changed = True
+                    if "mstk" not in audio_signals and self._should_emit_audio_signal("mstk", event.timestamp_ns):
+                        audio_signals["mstk"] = (self.mstk_signal, event.timestamp_ns)
+                elif event.kind == SerialEventKind.OK:
+                    if "ok" not in audio_signals and self._should_emit_audio_signal("ok", event.timestamp_ns):
+                        audio_signals["ok"] = (self.ok_signal, event.timestamp_ns)
+                elif event.kind == SerialEventKind.CORRECT:
+                    counts_changed = True
+                    if "crct" not in audio_signals and self._should_emit_audio_signal("crct", event.timestamp_ns):
+                        audio_signals["crct"] = (self.crct_signal, event.timestamp_ns)
+                elif event.kind == SerialEventKind.MISS:
+                    counts_changed = True
+                    if "miss" not in audio_signals and self._should_emit_audio_signal("miss", event.timestamp_ns):
+                        audio_signals["miss"] = (self.miss_signal, event.timestamp_ns)
                 else:
-                    logger.debug(f"📥 Custom serial data: {data}")
-                    # BIDIRECTIONAL: Send acknowledgment for unknown data
-                    # if self.serial_thread:
-                    #     self.serial_thread.send_data(f"DataReceived:{data}")
-                # if data.isdigit():
-                #     # Simple numeric data - could be score increment
-                    
-                #     scored = int(data)
-                #     serial_scoring_active = True
-                #     logger.info(f" Score updated via serial: +{data} (total: {scored})")
-                    
-                #     # Update the score display if the label exists
-                #     if hasattr(self, 'label_Score'):
-                #         self.label_Score.setText(f"Score: {scored}")
-                
-                # elif data.lower() == "win":
-                #     # Game win condition received via serial
-                #     global gamefinished
-                #     gamefinished = True
-                #     serial_scoring_active = True
-                #     logger.info(" Win condition received via serial")
-                    
-                # elif data.lower() == "hit" or data.lower() == "point":
-                #     # Hit/point detected
-                #     scored += 1
-                #     serial_scoring_active = True
-                #     logger.info(f" Hit detected via serial! Score: {scored}")
-                    
-                #     # Update the score display
-                #     if hasattr(self, 'label_Score'):
-                #         self.label_Score.setText(f"Score: {scored}")
-                # else:
-                #     # Custom data processing - you can extend this based on your needs
-                #     logger.debug(f" Custom serial data: {data}")
-            else:
-                logger.debug(f" Serial data received but game not active: {data}")
+                    logger.debug(f"📥 Custom serial data: {event.raw}")
+                    continue
+                serial_scoring_active = True
+            
+            # Single backend update for the whole batch, from one coherent snapshot
+            counters = current_game_counters()
+            if latest_score is not None:
+                # Sum of the latest score from each panel (just the panel score with one port)
+                scored = counters.score
+                self.fastreaction_backend.set_score_value(str(scored))
+            if counts_changed:
+                self.fastreaction_backend.set_correct_count(str(counters.correct))
+                self.fastreaction_backend.set_wrong_count(str(counters.wrong))
+                self.fastreaction_backend.set_miss_count(str(counters.miss))
+            if latest_score is not None or counts_changed:
+                self.fastreaction_backend.force_qml_refresh()
+                metrics.increment("ui.updates")
+            
+            for name, (signal, timestamp_ns) in audio_signals.items():
+                signal.emit()
+                # Event arrival on the port to the audio trigger leaving the UI thread
+                metrics.observe(f"audio.{name}", (time.monotonic_ns() - timestamp_ns) / 1e6)
+            
+            logger.info(f" Applied {len(events)} serial event(s) (seq {events[0].seq}-{events[-1].seq}): "
+                        f"score={scored}, correct={counters.correct}, wrong={counters.wrong}, miss={counters.miss}")
                 
         except Exception as e:
             logger.error(f" Error processing serial data: {e}")
@@ -2049,6 +2565,8 @@ class Active_screen(QWidget):
         """Handle serial connection status changes"""
         if connected:
             logger.info(" Serial device connected")
+            if self.reconnection_pending:
+                self._on_serial_reconnected()
         else:
             logger.warning("️  Serial device disconnected")
     
@@ -2085,6 +2603,14 @@ class Active_screen(QWidget):
             self.reconnection_timer.stop()
             self.reconnection_timer = None
         
+        self.reconnection_pending = True
+        
+        if self.serial_thread and self.serial_thread.isRunning() and self.serial_thread.auto_reconnect:
+            # The serial thread reconnects by itself (as soon as the device reappears) and
+            # reports it through connection_status_changed
+            logger.info("🔄 Waiting for the serial thread to reconnect...")
+            return
+        
         # Create and start reconnection timer (try every 2 seconds)
         self.reconnection_timer = QtCore.QTimer()
         self.reconnection_timer.timeout.connect(self.attempt_reconnection)
@@ -2122,56 +2648,97 @@ class Active_screen(QWidget):
             success = self.serial_thread.connect()
             
             if success:
-                logger.info("✅ Serial reconnected successfully!")
-                # Stop reconnection timer
-                if self.reconnection_timer:
-                    self.reconnection_timer.stop()
-                    self.reconnection_timer = None
-                
-                # Stop blinking timer
-                if hasattr(self, 'warning_blink_timer') and self.warning_blink_timer:
-                    self.warning_blink_timer.stop()
-                    self.warning_blink_timer = None
-                
-                # Hide warning label
-                if hasattr(self, 'connection_warning_label') and self.connection_warning_label:
-                    try:
-                        self.connection_warning_label.hide()
-                    except Exception:
-                        pass
-                
-                # Start monitoring
-                self.serial_thread.start_monitoring()
-                
-                # Reset counter
-                self.reconnection_attempts = 0
-                
-                # Start the game if it was waiting for connection
-                global gameStarted
-                if gameStarted:
-                    logger.info("🎮 Starting game timers after successful reconnection...")
-                    # Start QML timer and sync state
-                    try:
-                        if hasattr(self, 'fastreaction_backend') and self.fastreaction_backend and self.qml_widget_initialized:
-                            # Ensure timer is properly initialized
-                            self.fastreaction_backend.set_timer_seconds(self.countdown_time)
-                            # Sync timer state before starting
-                            self.fastreaction_backend.sync_timer_state(self.countdown_time, True)
-                            self.fastreaction_backend.start_countdown()
-                            logger.info(f" QML timer started - Time: {self.countdown_time}s")
-                    except Exception as e:
-                        logger.error(f" Error starting QML timer: {e}")
-                    
-                    self.timer.start(1000)
-                    self.TimerGame.start(TimerValue)
+                self._on_serial_reconnected()
             else:
                 logger.warning(f"️ Reconnection attempt #{self.reconnection_attempts} failed")
                 
         except Exception as e:
             logger.error(f" Error during reconnection attempt #{self.reconnection_attempts}: {e}")
     
+    def _on_serial_reconnected(self):
+        """Resume the game once the serial device is back (runs once per reconnection)"""
+        if not self.reconnection_pending:
+            return
+        self.reconnection_pending = False
+        logger.info("✅ Serial reconnected successfully!")
+        # Stop reconnection timer
+        if self.reconnection_timer:
+            self.reconnection_timer.stop()
+            self.reconnection_timer = None
+        
+        # Stop blinking timer
+        if hasattr(self, 'warning_blink_timer') and self.warning_blink_timer:
+            self.warning_blink_timer.stop()
+            self.warning_blink_timer = None
+        
+        # Hide warning label
+        if hasattr(self, 'connection_warning_label') and self.connection_warning_label:
+            try:
+                self.connection_warning_label.hide()
+            except Exception:
+                pass
+        
+        # Start monitoring
+        self.serial_thread.start_monitoring()
+        
+        # Reset counter
+        self.reconnection_attempts = 0
+        
+        # Start the game if it was waiting for connection
+        global gameStarted
+        if gameStarted:
+            logger.info("🎮 Starting game timers after successful reconnection...")
+            # Start QML timer and sync state
+            try:
+                if hasattr(self, 'fastreaction_backend') and self.fastreaction_backend and self.qml_widget_initialized:
+                    # Ensure timer is properly initialized
+                    self.fastreaction_backend.set_timer_seconds(self.countdown_time)
+                    # Sync timer state before starting
+                    self.fastreaction_backend.sync_timer_state(self.countdown_time, True)
+                    self.fastreaction_backend.start_countdown()
+                    logger.info(f" QML timer started - Time: {self.countdown_time}s")
+            except Exception as e:
+                logger.error(f" Error starting QML timer: {e}")
+            
+            self.timer.start(1000)
+            self.TimerGame.start(TimerValue)
+    
+    def attach_runtime_settings(self):
+        """Follow timer changes pushed over MQTT (idempotent; called again when the screen is reused)"""
+        if not self._runtime_settings_attached:
+            runtime_settings.subscribe(self._on_runtime_setting_changed)
+            self._runtime_settings_attached = True
+
+    def detach_runtime_settings(self):
+        if self._runtime_settings_attached:
+            runtime_settings.unsubscribe(self._on_runtime_setting_changed)
+            self._runtime_settings_attached = False
+
+    def _on_runtime_setting_changed(self, key, value):
+        if key == TIMER_VALUE_MS:
+            self.timer_value_changed.emit(int(value))
+
+    def apply_timer_value(self, timer_value_ms: int):
+        """
+        Show a new game duration (UI thread)
+
+        A running game keeps the duration it started with: TimerValue is left alone and
+        setupUi picks the new value up from runtime_settings for the next game.
+        """
+        global TimerValue
+        if gameStarted:
+            logger.info(f" Game timer changed to {timer_value_ms // 1000}s, applies from the next game")
+            return
+        TimerValue = timer_value_ms
+        self.countdown_time = timer_value_ms // 1000
+        if getattr(self, 'fastreaction_backend', None) is not None:
+            self.fastreaction_backend.set_timer_seconds(self.countdown_time)
+            self.fastreaction_backend.force_timer_sync()
+        logger.info(f" Game timer changed to {self.countdown_time}s")
+
     def stop_reconnection_attempts(self):
         """Stop reconnection attempts and cleanup"""
+        self.reconnection_pending = False
         # Stop reconnection timer
         if hasattr(self, 'reconnection_timer') and self.reconnection_timer:
             self.reconnection_timer.stop()
@@ -2206,14 +2773,7 @@ class Active_screen(QWidget):
             self.scale = 1
         
         global TimerValue
-        try:
-            with open("file2.txt", "r") as file:
-                lines = file.readlines()
-                if lines:
-                    TimerValue = int(lines[-1].strip())
-        except FileNotFoundError:
-            print("file2.txt not found. Using default timer value.")
-            TimerValue = 30000
+        TimerValue = runtime_settings.get(TIMER_VALUE_MS, game_config.timer_value)
 
         self.centralwidget = QtWidgets.QWidget(MainWindow)
         
@@ -2349,10 +2909,11 @@ class Active_screen(QWidget):
                     logger.error(f"Error forcing QML refresh: {e}")
                     self._manual_qml_refresh()
                 # Update score
+                counters = current_game_counters()
                 self.fastreaction_backend.set_score_value(str(scored))
-                self.fastreaction_backend.set_correct_count(str(correct_count))
-                self.fastreaction_backend.set_miss_count(str(miss_count))
-                self.fastreaction_backend.set_wrong_count(str(wrong_count))
+                self.fastreaction_backend.set_correct_count(str(counters.correct))
+                self.fastreaction_backend.set_miss_count(str(counters.miss))
+                self.fastreaction_backend.set_wrong_count(str(counters.wrong))
                 
                 # Update timer display
                 minutes = self.countdown_time // 60
@@ -2380,10 +2941,14 @@ class Active_screen(QWidget):
         
         # Check serial connection and start game only if connected
         if self.serial_thread:
-            logger.info(" Serial thread connecting...")
-            # Try to connect immediately
-            if self.serial_thread.connect():
-                logger.info(" Serial thread connected successfully")
+            # A running serial thread owns the port: reopening it here would block the UI
+            # and race the reader, so only connect ourselves when nothing else will
+            connected = self.serial_thread.connected
+            if not connected and not (self.serial_thread.isRunning() and self.serial_thread.auto_reconnect):
+                logger.info(" Serial thread connecting...")
+                connected = self.serial_thread.connect()
+            if connected:
+                logger.info(" Serial connected, starting game")
                 self.serial_thread.start_monitoring()
                 
                 # Start QML timer and sync state
@@ -2459,8 +3024,9 @@ class Active_screen(QWidget):
         
         # Emit deactivate signal directly after 5 seconds to trigger score submission
         def emit_deactivate_signal():
-            if self.mqtt_thread and hasattr(self.mqtt_thread, 'deactivate_signal'):
-                self.mqtt_thread.deactivate_signal.emit()
+            # The shared service, not mqtt_thread: the screen may have detached by now
+            if self._mqtt_service and hasattr(self._mqtt_service, 'deactivate_signal'):
+                self._mqtt_service.deactivate_signal.emit()
                 print("deactivate signal emitted")
             else:
                 print("mqtt_thread is None, deactivate signal not emitted")
@@ -2641,36 +3207,26 @@ class Active_screen(QWidget):
     
     def _cleanup_threading_components(self):
         """Clean up MQTT and Serial threading components"""
-        # Clean up MQTT thread
-        if hasattr(self, 'mqtt_thread') and self.mqtt_thread:
-            try:
-                # Disconnect all signals first
-                signal_methods = ['start_signal', 'stop_signal', 'restart_signal', 
-                                'deactivate_signal', 'activate_signal', 'message_signal']
-                for signal_method in signal_methods:
-                    try:
-                        if hasattr(self.mqtt_thread, signal_method):
-                            signal = getattr(self.mqtt_thread, signal_method)
-                            signal.disconnect()
-                    except (AttributeError, TypeError, RuntimeError):
-                        pass
-                
-                # Stop the thread gracefully
-                self.mqtt_thread.stop()
-                self.mqtt_thread = None
-                logger.debug("MQTT thread cleaned up")
-            except Exception as e:
-                logger.warning(f"Error stopping MQTT thread: {e}")
+        self.detach_runtime_settings()
+        
+        # Detach from the MQTT service (but don't stop it - it's managed by MainApp)
+        try:
+            self.detach_mqtt_thread()
+        except Exception as e:
+            logger.warning(f"Error detaching MQTT handlers: {e}")
         
         # Disconnect serial signals (but don't stop the thread - it's managed by MainApp)
         if hasattr(self, 'serial_thread') and self.serial_thread:
             try:
                 # Disconnect signals only
-                try:
-                    self.serial_thread.data_received.disconnect(self.on_serial_data_received)
-                    logger.debug("Serial signals disconnected")
-                except (TypeError, RuntimeError):
-                    pass  # Signal not connected or already disconnected
+                for signal, slot in ((self.serial_thread.event_received, self.on_serial_event_received),
+                                     (self.serial_thread.events_batch_received, self.on_serial_events_batch),
+                                     (self.serial_thread.connection_status_changed, self.on_serial_connection_status_changed)):
+                    try:
+                        signal.disconnect(slot)
+                    except (TypeError, RuntimeError):
+                        pass  # Signal not connected or already disconnected
+                logger.debug("Serial signals disconnected")
                 # Don't set to None or stop - it's managed by MainApp
             except Exception as e:
                 logger.warning(f"Error disconnecting Serial signals: {e}")
@@ -2768,7 +3324,7 @@ class Active_screen(QWidget):
     def _final_cleanup(self):
         """Final cleanup of any remaining references"""
         # Clear any remaining object references
-        cleanup_attrs = ['qml_widget', 'fastreaction_backend', 'mqtt_thread', 
+        cleanup_attrs = ['qml_widget', 'fastreaction_backend',
                         'Background', 'centralwidget']
         for attr in cleanup_attrs:
             if hasattr(self, attr):
@@ -3213,14 +3769,8 @@ class Home_screen(QtWidgets.QMainWindow):
             except Exception:
                 pass
 
-            global lastplayed, lastplayed_score, lastplayed_weighted_points, lastplayed_rank
-            leaderboard , lastplayed = api.get_leaderboard()
-            if lastplayed is not None:
-                lastplayed_score = lastplayed.get('total_score', 0)
-                lastplayed_weighted_points = lastplayed.get('weighted_points', 0)
-                lastplayed_rank = lastplayed.get('rank', 0)
-            list_top5_FastReaction.clear()
-            list_top5_FastReaction.extend(leaderboard)
+            # Table is seeded below from the last known data and updated when the fetch returns
+            self.refresh_leaderboard()
             # Geometry full screen (1920x1080 base, scale adapt if needed)
             self.leaderboard_qml.setGeometry(QtCore.QRect(0, 0, self.centralwidget.width(), self.centralwidget.height()))
 
@@ -3315,6 +3865,31 @@ class Home_screen(QtWidgets.QMainWindow):
         except Exception as e:
             logger.error(f"Error hiding leaderboard: {e}")
     
+    def refresh_leaderboard(self):
+        """Show the cached leaderboard right away; the cache revalidates it in the background"""
+        if leaderboard_cache is None:
+            return
+        if not getattr(self, '_leaderboard_connected', False):
+            # Connect before reading, so a refresh finishing in between is not missed
+            leaderboard_cache.changed.connect(self._apply_leaderboard)
+            self._leaderboard_connected = True
+        self._apply_leaderboard(leaderboard_cache.get())
+    
+    def _apply_leaderboard(self, result):
+        """Store a (leaderboard, lastplayed) snapshot and push it to the table (UI thread)"""
+        global lastplayed, lastplayed_score, lastplayed_weighted_points, lastplayed_rank
+        leaderboard, latest = result
+        if not leaderboard:
+            return  # Nothing fetched yet
+        lastplayed = latest
+        if lastplayed is not None:
+            lastplayed_score = lastplayed.get('total_score', 0)
+            lastplayed_weighted_points = lastplayed.get('weighted_points', 0)
+            lastplayed_rank = lastplayed.get('rank', 0)
+        list_top5_FastReaction.clear()
+        list_top5_FastReaction.extend(leaderboard)
+        self.UpdateTable()
+    
     def UpdateTable(self):
         global list_top5_FastReaction
         # Update QML via backend signals
@@ -3419,14 +3994,7 @@ class Home_screen(QtWidgets.QMainWindow):
     def looping(self):
         """Enhanced looping function with improved safety (from game2)"""
         logger.debug("Starting looping cycle")
-        global lastplayed, lastplayed_score, lastplayed_weighted_points, lastplayed_rank
-        leaderboard , lastplayed = api.get_leaderboard()
-        if lastplayed is not None:
-            lastplayed_score = lastplayed.get('total_score', 0)
-            lastplayed_weighted_points = lastplayed.get('weighted_points', 0)
-            lastplayed_rank = lastplayed.get('rank', 0)
-        list_top5_FastReaction.clear()
-        list_top5_FastReaction.extend(leaderboard)
+        self.refresh_leaderboard()
         # Safe timer stop
         try:
             if hasattr(self, 'timer3') and self.timer3:
@@ -3655,7 +4223,11 @@ class MainApp(QtWidgets.QMainWindow):
         
         if serial_config.enabled:
             try:
-                self.serial_thread = SimpleSerialThread(serial_config)
+                if serial_config.extra_ports:
+                    # Several panels: one selector thread reads all of them
+                    self.serial_thread = MultiPortSerialThread(serial_config)
+                else:
+                    self.serial_thread = SimpleSerialThread(serial_config)
                 self.serial_thread.start()
                 logger.info(f" Serial thread initialized for port: {serial_config.port}")
                 logger.info(f" Serial config: baudrate={serial_config.baudrate}, auto_reconnect={serial_config.auto_reconnect}")
@@ -3665,11 +4237,21 @@ class MainApp(QtWidgets.QMainWindow):
         else:
             logger.info(" Serial communication disabled in config")
         
+        # One MQTT connection for the lifetime of the app; screens attach to it
+        self.mqtt_service = MqttThread()
+        self.mqtt_service.start()
+        
+        # Performance metrics: periodic reports while a game runs, a summary when it ends
+        self.metrics_publisher = None
+        self.metrics_timer = QTimer()
+        self.metrics_timer.timeout.connect(lambda: self._publish_metrics(WINDOW_INTERVAL))
+        self._setup_metrics()
+        
         # Setup mainWindow and screens
         self.sized = QtWidgets.QDesktopWidget().screenGeometry()
         self.ui_final = Final_Screen()
         self.ui_home = Home_screen()
-        self.ui_active = Active_screen(serial_thread=self.serial_thread)    
+        self.ui_active = Active_screen(serial_thread=self.serial_thread, mqtt_thread=self.mqtt_service)    
         self.ui_team_member = TeamMember_screen()
         
         self.mainWindow = QtWidgets.QMainWindow()
@@ -3697,6 +4279,7 @@ class MainApp(QtWidgets.QMainWindow):
             self.game_manager.init_signal.connect(self.start_TeamMember_screen)
             # 2. start_signal: Triggered when the game manager starts
             self.game_manager.start_signal.connect(lambda: (
+                self._start_metrics_reporting(),
                 self.start_Active_screen(),
                 self._safe_mqtt_subscribe(),
                 self.ui_active.start_game() if hasattr(self, 'ui_active') and self.ui_active else None
@@ -3707,19 +4290,12 @@ class MainApp(QtWidgets.QMainWindow):
             self.game_manager.submit_signal.connect(self.start_final_screen)
             logger.debug(" GameManager signals connected successfully")
             
-            # Connect deactivate signal to trigger score submission (with enhanced safety checks)
-            if (hasattr(self, 'ui_active') and self.ui_active and 
-                hasattr(self.ui_active, 'mqtt_thread') and self.ui_active.mqtt_thread and
-                hasattr(self.ui_active.mqtt_thread, 'deactivate_signal')):
-                try:
-                    self.ui_active.mqtt_thread.deactivate_signal.connect(
-                        self.game_manager.trigger_score_submission
-                    )
-                    logger.debug(" Deactivate signal connected to GameManager")
-                except Exception as e:
-                    logger.warning(f"️  Error connecting deactivate signal: {e}")
-            else:
-                logger.warning("️  MQTT thread or deactivate signal not properly initialized")
+            # Connect deactivate signal to trigger score submission (once - the MQTT service outlives every game)
+            try:
+                self.mqtt_service.deactivate_signal.connect(self.game_manager.trigger_score_submission)
+                logger.debug(" Deactivate signal connected to GameManager")
+            except Exception as e:
+                logger.warning(f"️  Error connecting deactivate signal: {e}")
         else:
             logger.error(" GameManager not available for signal connections")
         # ------------------------------
@@ -3796,14 +4372,12 @@ class MainApp(QtWidgets.QMainWindow):
         QTimer.singleShot(100, self._start_inactive_audio_for_home)
 
         # Reset global game state
-        global list_players_score, list_players_name, scored, serial_scoring_active ,correct_count, miss_count, wrong_count, last_player_name, last_player_score, last_player_weighted_points, last_player_rank
+        global list_players_score, list_players_name, scored, serial_scoring_active, last_player_name, last_player_score, last_player_weighted_points, last_player_rank
         list_players_score = [0,0,0,0,0]
         list_players_name.clear()
         scored = 0
         serial_scoring_active = False
-        correct_count = 0
-        miss_count = 0
-        wrong_count = 0
+        reset_game_counters()
         last_player_name = ""
         last_player_score = 0
         last_player_weighted_points = 0
@@ -3882,12 +4456,8 @@ class MainApp(QtWidgets.QMainWindow):
                     logger.warning(f"️  Error stopping timer: {e}")
                 
                 
-                try:
-                    if hasattr(self.ui_active, 'mqtt_thread') and self.ui_active.mqtt_thread:
-                        self.ui_active.mqtt_thread.unsubscribe_from_data_topics()
-                        logger.debug(" MQTT unsubscribed")
-                except Exception as e:
-                    logger.warning(f"️  Error unsubscribing MQTT: {e}")
+                self._safe_mqtt_unsubscribe()
+                self._finish_metrics_reporting("game_cancelled")
                 
                 try:
                     # Check if ui_active is still valid before closing
@@ -4027,10 +4597,7 @@ class MainApp(QtWidgets.QMainWindow):
             firstDetected = False
             scored = 0
             serial_scoring_active = False
-            global correct_count, miss_count, wrong_count
-            correct_count = 0
-            miss_count = 0
-            wrong_count = 0
+            reset_game_counters()
             
             # Reset score tracking
             list_players_score = [0,0,0,0,0]
@@ -4041,19 +4608,11 @@ class MainApp(QtWidgets.QMainWindow):
             # Reset MediaPlayer state (reuse existing player) - Fast Reaction doesn't use MediaPlayer
             # Skip MediaPlayer reset for Fast Reaction
             
-            # Reset MQTT thread state (reuse existing connection if available)
-            if hasattr(self.ui_active, 'mqtt_thread') and self.ui_active.mqtt_thread:
-                try:
-                    # Check if MQTT is still connected
-                    if (hasattr(self.ui_active.mqtt_thread, 'connected') and 
-                        self.ui_active.mqtt_thread.connected and
-                        hasattr(self.ui_active.mqtt_thread, 'client') and
-                        self.ui_active.mqtt_thread.client):
-                        logger.debug(" MQTT thread still connected, reusing existing connection")
-                    else:
-                        logger.debug(" MQTT thread disconnected, will reconnect on next game start")
-                except Exception as e:
-                    logger.warning(f"️  Error checking MQTT state: {e}")
+            # The MQTT service reconnects on its own; just report its state
+            if self.mqtt_service.connected:
+                logger.debug(" MQTT service connected, reusing existing connection")
+            else:
+                logger.debug(" MQTT service disconnected, reconnecting in the background")
             
             # Reset UI state if needed
             try:
@@ -4095,24 +4654,16 @@ class MainApp(QtWidgets.QMainWindow):
     def _safe_mqtt_subscribe(self):
         """Safely subscribe to MQTT data topics"""
         try:
-            if hasattr(self, 'ui_active') and self.ui_active:
-                if hasattr(self.ui_active, 'mqtt_thread') and self.ui_active.mqtt_thread:
-                    self.ui_active.mqtt_thread.subscribe_to_data_topics()
-                    logger.debug(" MQTT subscribed to data topics")
-                else:
-                    logger.warning("️  MQTT thread not available for subscription")
+            self.mqtt_service.subscribe_to_data_topics()
+            logger.debug(" MQTT subscribed to data topics")
         except Exception as e:
             logger.warning(f"️  Error subscribing to MQTT: {e}")
     
     def _safe_mqtt_unsubscribe(self):
         """Safely unsubscribe from MQTT data topics"""
         try:
-            if hasattr(self, 'ui_active') and self.ui_active:
-                if hasattr(self.ui_active, 'mqtt_thread') and self.ui_active.mqtt_thread:
-                    self.ui_active.mqtt_thread.unsubscribe_from_data_topics()
-                    logger.debug(" MQTT unsubscribed from data topics")
-                else:
-                    logger.warning("️  MQTT thread not available for unsubscription")
+            self.mqtt_service.unsubscribe_from_data_topics()
+            logger.debug(" MQTT unsubscribed from data topics")
         except Exception as e:
             logger.warning(f"️  Error unsubscribing from MQTT: {e}")
     
@@ -4466,7 +5017,6 @@ class MainApp(QtWidgets.QMainWindow):
         # Initialize active screen with error handling
         if hasattr(self, 'ui_active') and self.ui_active:
             try:
-                # Reinitialize mqtt thread
                 self.ui_active.setupUi(self.mainWindow)
 # Safely close home screen
                 
@@ -4475,7 +5025,9 @@ class MainApp(QtWidgets.QMainWindow):
                 QTimer.singleShot(50, self._start_active_audio_for_game)
                 
                 
+                # Re-attach to the shared MQTT connection and to timer changes
                 self.ui_active.init_mqtt_thread()
+                self.ui_active.attach_runtime_settings()
                 
                 # Ensure QML widget is properly initialized for new game
                 if hasattr(self.ui_active, 'centralwidget') and hasattr(self.ui_active, 'init_qml_widget'):
@@ -4488,18 +5040,6 @@ class MainApp(QtWidgets.QMainWindow):
                     except Exception as e:
                         logger.error(f" Error re-initializing QML widget: {e}")
                 
-                # Connect deactivate signal to trigger score submission
-                if (hasattr(self.ui_active, 'mqtt_thread') and self.ui_active.mqtt_thread and 
-                    hasattr(self.ui_active.mqtt_thread, 'deactivate_signal')):
-                    try:
-                        self.ui_active.mqtt_thread.deactivate_signal.connect(
-                            self.game_manager.trigger_score_submission
-                        )
-                        logger.debug(" Deactivate signal connected to GameManager")
-                    except Exception as e:
-                        logger.warning(f"️  Error connecting deactivate signal: {e}")
-                else:
-                    logger.warning("️  MQTT thread or deactivate signal not properly initialized")
                 # Ensure serial thread is properly set up
                 if hasattr(self, 'serial_thread') and self.serial_thread:
                     try:
@@ -4516,14 +5056,18 @@ class MainApp(QtWidgets.QMainWindow):
                         # Ensure signals are connected (disconnect first to avoid duplicates, then reconnect)
                         try:
                             # Safely disconnect existing serial connections
-                            self.serial_thread.data_received.disconnect(self.ui_active.on_serial_data_received)
+                            self.serial_thread.event_received.disconnect(self.ui_active.on_serial_event_received)
+                        except:
+                            pass  # Ignore if not connected
+                        try:
+                            self.serial_thread.events_batch_received.disconnect(self.ui_active.on_serial_events_batch)
                         except:
                             pass  # Ignore if not connected
                         
-                        # try:
-                        #     self.serial_thread.connection_status_changed.disconnect(self.ui_active.on_serial_connection_status_changed)
-                        # except:
-                        #     pass  # Ignore if not connected
+                        try:
+                            self.serial_thread.connection_status_changed.disconnect(self.ui_active.on_serial_connection_status_changed)
+                        except:
+                            pass  # Ignore if not connected
                         
                         # try:
                         #     self.serial_thread.error_occurred.disconnect(self.ui_active.on_serial_error)
@@ -4531,8 +5075,9 @@ class MainApp(QtWidgets.QMainWindow):
                         #     pass  # Ignore if not connected
                         
                         # Reconnect serial signals
-                        self.serial_thread.data_received.connect(self.ui_active.on_serial_data_received)
-                        # self.serial_thread.connection_status_changed.connect(self.ui_active.on_serial_connection_status_changed)
+                        self.serial_thread.event_received.connect(self.ui_active.on_serial_event_received)
+                        self.serial_thread.events_batch_received.connect(self.ui_active.on_serial_events_batch)
+                        self.serial_thread.connection_status_changed.connect(self.ui_active.on_serial_connection_status_changed)
                         # self.serial_thread.error_occurred.connect(self.ui_active.on_serial_error)
                         logger.debug(" Serial and audio signals ensured connected")
                         
@@ -4565,6 +5110,7 @@ class MainApp(QtWidgets.QMainWindow):
     def start_final_screen(self):
         """Start Final Screen with comprehensive error handling (improved from game2)"""
         logger.info(" Starting Final Screen")
+        self._finish_metrics_reporting("game_end")
         
         # Set background image immediately to prevent white screen flashes
         self._set_background_image("Assets/imgSeq_0.jpg")
@@ -4581,23 +5127,7 @@ class MainApp(QtWidgets.QMainWindow):
             self.mainWindow.show()
             logger.debug(" Final screen started successfully")
             
-            # Read timer value from file with fallback
-            try:
-                with open("file.txt", "r") as file:
-                    lines = file.readlines()
-                    if lines:
-                        final_screen_timer_idle = int(lines[-1].strip())
-                    else:
-                        final_screen_timer_idle = game_config.final_screen_timer
-            except FileNotFoundError:
-                logger.info("file.txt not found. Using default timer value.")
-                final_screen_timer_idle = game_config.final_screen_timer
-            except (ValueError, IndexError) as e:
-                logger.warning(f"️  Error reading timer value: {e}. Using default.")
-                final_screen_timer_idle = game_config.final_screen_timer
-            
-            # Override with default for consistency
-            final_screen_timer_idle = 15000
+            final_screen_timer_idle = runtime_settings.get(FINAL_SCREEN_TIMER_MS, game_config.final_screen_timer)
             
             # Set up automatic transition back to home screen after final_screen_timer_idle (improved from game2)
             logger.info(f"⏰ Setting final screen auto-transition timer: {final_screen_timer_idle}ms")
@@ -4612,6 +5142,43 @@ class MainApp(QtWidgets.QMainWindow):
         quit_shortcut = QtWidgets.QShortcut(QtGui.QKeySequence('q'), self.mainWindow)
         quit_shortcut.activated.connect(self.close_application)
 
+    def _setup_metrics(self):
+        """Create the metrics publisher and register the queue-depth gauges"""
+        mqtt_config = config.settings.mqtt
+        if not mqtt_config.metrics_enabled:
+            logger.info(" Performance metrics disabled in config")
+            return
+        station = config.settings.station_id or socket.gethostname()
+        topic = mqtt_config.metrics_topic.format(station=station)
+        self.metrics_publisher = MetricsPublisher(metrics, self.mqtt_service.publish, topic, station)
+        
+        if self.serial_thread:
+            metrics.register_gauge("serial.write_queue", self.serial_thread.queued_writes)
+            metrics.register_gauge("serial.pending_messages", self.serial_thread.pending_messages)
+        metrics.register_gauge("mqtt.pending_events", lambda: self.mqtt_service.pending_events if self.mqtt_service else 0)
+        logger.info(f" Performance metrics will be published to {topic}")
+    
+    def _start_metrics_reporting(self):
+        """New game: start both metric windows fresh and report periodically"""
+        if not self.metrics_publisher:
+            return
+        metrics.reset(WINDOW_INTERVAL)
+        metrics.reset(WINDOW_GAME)
+        self.metrics_timer.start(max(1, int(config.settings.mqtt.metrics_interval_s * 1000)))
+    
+    def _finish_metrics_reporting(self, kind: str):
+        """Game over: stop periodic reports and publish the whole-game summary"""
+        if not self.metrics_publisher or not self.metrics_timer.isActive():
+            return
+        self.metrics_timer.stop()
+        self._publish_metrics(WINDOW_GAME, kind)
+    
+    def _publish_metrics(self, window: str, kind: str = None):
+        try:
+            self.metrics_publisher.publish(window, kind)
+        except Exception as e:
+            logger.warning(f"️  Error publishing metrics: {e}")
+
     def _close_current_screen(self):
         """Safely close any currently active screen (improved from game2)"""
         try:
@@ -4657,9 +5224,36 @@ class MainApp(QtWidgets.QMainWindow):
                 except Exception as e:
                     logger.warning(f"️  Error stopping Serial thread: {e}")
             
+            if hasattr(self, 'metrics_timer') and self.metrics_timer:
+                self.metrics_timer.stop()
+            
+            # Stop the leaderboard refresh before the API it uses
+            if leaderboard_cache is not None:
+                leaderboard_cache.stop()
+            
+            # Stop the async API loop
+            if async_api is not None:
+                try:
+                    async_api.close()
+                    logger.debug(" Async API stopped")
+                except Exception as e:
+                    logger.warning(f"️  Error stopping async API: {e}")
+            
+            # Stop the shared MQTT connection
+            if hasattr(self, 'mqtt_service') and self.mqtt_service:
+                try:
+                    self.mqtt_service.stop()
+                    self.mqtt_service = None
+                    logger.debug(" MQTT service stopped")
+                except Exception as e:
+                    logger.warning(f"️  Error stopping MQTT service: {e}")
+            
             # Clean up all UI screens
             self._cleanup_all_screens()
             
+            # Persist any timer change still waiting for its debounced save
+            runtime_settings.flush()
+            
             # Close main window
             if hasattr(self, 'mainWindow') and self.mainWindow:
                 try:
@@ -4789,22 +5383,28 @@ if __name__ == "__main__":
 
     app = QtWidgets.QApplication(sys.argv)
     
-    # Initialize leaderboard
+    # Initialize API clients and the leaderboard cache
+    try:
+        async_api = AsyncGameAPI()
+    except Exception as e:
+        logger.warning(f"️  Async API unavailable, the leaderboard will be fetched with GameAPI: {e}")
+        async_api = None
     try:
         api = GameAPI()
         if api.authenticate():
             logger.info(" API authentication successful")
-            # TODO: Uncomment when leaderboard is needed
-            leaderboard , lastplayed = api.get_leaderboard()
-            if lastplayed is not None:
-                lastplayed_score = lastplayed.get('total_score', 0)
-                lastplayed_weighted_points = lastplayed.get('weighted_points', 0)
-                lastplayed_rank = lastplayed.get('rank', 0)
-            list_top5_FastReaction.extend(leaderboard)
-            # print(list_top5_FastReaction)
-            logger.info(f" Initial leaderboard loaded: {len(leaderboard)} entries")
         else:
             logger.warning("️  Failed to authenticate for initial leaderboard")
+        
+        def fetch_leaderboard():
+            """Runs on the leaderboard cache's worker thread"""
+            if async_api is not None:
+                return async_api.submit(async_api.get_leaderboard()).result(config.settings.api.leaderboard_timeout + 5)
+            return api.get_leaderboard()
+        
+        # First fetch starts now; the home screen shows it as soon as it arrives
+        leaderboard_cache = LeaderboardCache(fetch_leaderboard, ttl=config.settings.api.leaderboard_ttl)
+        leaderboard_cache.start()
     except Exception as e:
         logger.error(f" Error loading initial leaderboard: {e}")
     
@@ -0,0 +1,222 @@
+"""
+Asynchronous Game API Client for Fast Reaction Game
+Requests made on behalf of the UI (leaderboard) on aiohttp, running on one background
+asyncio event loop
+
+Every public coroutine runs on the client's own loop thread. Callers hand a coroutine
+to submit() (concurrent.futures.Future, for worker threads) or to call_qt() (QtFuture,
+whose finished/failed signals are delivered on the Qt thread), so nothing ever blocks
+the UI. The game flow itself (status polling, score submission) stays on GameAPI in
+GameManager's thread and the score outbox sender.
+
+Usage (UI thread):
+    async_api = AsyncGameAPI()
+    async_api.call_qt(async_api.get_leaderboard(), on_result=self._apply_leaderboard)
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+
+import aiohttp
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from api.token_manager import shared_token_manager
+from config import config
+from utils.logger import get_logger
+from utils.metrics import api_metric_name, metrics
+
+logger = get_logger(__name__)
+
+
+class QtFuture(QObject):
+    """
+    Qt view of a coroutine running on the AsyncGameAPI loop
+
+    finished(result) or failed(message) is emitted exactly once from the loop thread;
+    receivers living on the UI thread get it as a queued call.
+    """
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, future: Future, on_result: Optional[Callable[[Any], None]] = None,
+                 on_error: Optional[Callable[[str], None]] = None):
+        super().__init__()
+        self.future = future
+        # Connect before watching the future, so a result that is already there is not missed
+        if on_result is not None:
+            self.finished.connect(on_result)
+        if on_error is not None:
+            self.failed.connect(on_error)
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: Future):
+        if future.cancelled():
+            self.failed.emit("cancelled")
+            return
+        error = future.exception()
+        if error is not None:
+            self.failed.emit(f"{type(error).__name__}: {error}")
+        else:
+            self.finished.emit(future.result())
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def cancel(self) -> bool:
+        return self.future.cancel()
+
+
+class AsyncGameAPI:
+    """Game server client for UI-side requests (login, leaderboard) on one event loop"""
+
+    def __init__(self, api_config=None):
+        self.config = api_config or config.settings.api
+        self.base_url = self.config.base_url.rstrip('/')
+        self.game_id = self.config.game_id
+        self.game_name = self.config.game_name or "Fast Reaction"
+        self.tokens = shared_token_manager(self.config)  # Same token as GameAPI, renewed in the background
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._qt_futures = set()  # Kept alive until their signal has been delivered
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="AsyncGameAPI", daemon=True)
+        self._thread.start()
+        logger.info(f" AsyncGameAPI event loop started for {self.base_url}")
+
+    # ------------------------------------------------------------------
+    # Loop plumbing
+    # ------------------------------------------------------------------
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the API loop (any thread)"""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def call_qt(self, coro: Coroutine, on_result: Optional[Callable[[Any], None]] = None,
+                on_error: Optional[Callable[[str], None]] = None) -> QtFuture:
+        """Schedule a coroutine and get its outcome as Qt signals (call from the UI thread)"""
+        qt_future = QtFuture(self.submit(coro), on_result, on_error)
+        self._qt_futures.add(qt_future)
+        qt_future.finished.connect(lambda _: self._qt_futures.discard(qt_future))
+        qt_future.failed.connect(lambda _: self._qt_futures.discard(qt_future))
+        return qt_future
+
+    def close(self, timeout: float = 5.0):
+        """Close the HTTP session and stop the loop thread"""
+        if not self._thread.is_alive():
+            return
+        try:
+            self.submit(self._close_session()).result(timeout)
+        except Exception as e:
+            logger.warning(f"️  Error closing AsyncGameAPI session: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        logger.debug(" AsyncGameAPI event loop stopped")
+
+    async def _close_session(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=8))
+        return self._session
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    async def _request(self, method: str, path: str, *, params: Optional[Dict] = None, json: Any = None,
+                       timeout: float = 8, authenticated: bool = True) -> Tuple[int, Any]:
+        """
+        Send one request and return (status, parsed JSON or None)
+
+        Authenticated requests log in first if needed and retry once after a 401.
+        """
+        url = f"{self.base_url}/{path.lstrip('/')}"
+        for attempt in range(2):
+            headers = {}
+            if authenticated:
+                if not self.tokens.is_valid():
+                    if not await self.authenticate():
+                        return 401, None
+                token = self.tokens.token
+                headers["Authorization"] = f"Bearer {token}"
+
+            session = await self._get_session()
+            started = time.monotonic()
+            async with session.request(method, url, params=params, json=json, headers=headers,
+                                       timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                metrics.observe(api_metric_name(method, url), (time.monotonic() - started) * 1000)
+                if response.status >= 400:
+                    metrics.increment("api.errors")
+                if response.status == 401 and authenticated and attempt == 0:
+                    logger.warning("️  Token rejected (401), logging in again")
+                    self.tokens.invalidate(token)
+                    continue
+                data = None
+                if response.status == 200:
+                    data = await response.json(content_type=None)
+                else:
+                    logger.warning(f"️  {method} {path}: HTTP {response.status}")
+                return response.status, data
+        return 401, None
+
+    @property
+    def token(self) -> Optional[str]:
+        return self.tokens.token
+
+    async def authenticate(self, force: bool = False) -> bool:
+        """
+        Make sure the shared token is valid
+
+        The login itself runs on the default executor through the TokenManager, so it
+        is shared with GameAPI and with any concurrent caller (single flight).
+        """
+        if not force and self.tokens.is_valid():
+            return True
+        loop = asyncio.get_running_loop()
+        token = await loop.run_in_executor(None, self.tokens.refresh if force else self.tokens.get_token)
+        if not token:
+            logger.error(" Async authentication failed")
+            return False
+        return True
+
+    async def get_leaderboard(self, game_name: Optional[str] = None) -> Tuple[List[Tuple[str, int, int]], Optional[Dict]]:
+        """
+        GET /leaderboard/dashboard/based
+
+        Returns:
+            (top 5 as (team_name, total_score, weighted_points), lastplayed dict or None),
+            ([], None) on any failure - same shape as GameAPI.get_leaderboard
+        """
+        params = {"source": "game", "nameGame": game_name or self.game_name}
+        try:
+            status, data = await self._request("GET", "/leaderboard/dashboard/based", params=params,
+                                               timeout=self.config.leaderboard_timeout)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f" Leaderboard request failed: {type(e).__name__}: {e}")
+            return [], None
+        if status != 200 or not isinstance(data, dict):
+            return [], None
+        games = data.get('data')
+        if not isinstance(games, list) or not games:
+            logger.warning("️  Unexpected leaderboard response structure")
+            return [], None
+
+        game_data = games[0]
+        teams = [
+            (team.get('name', f'Team {i}')[:20], team.get('total_score', 0), team.get('weighted_points', 0))
+            for i, team in enumerate(game_data.get('list', []), 1)
+        ]
+        if not teams:
+            return [], None
+        logger.info(f" Leaderboard fetched: {len(teams)} teams")
+        return teams[:5], game_data.get('lastplayed', {})
@@ -21,6 +21,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import config
 from utils.logger import get_logger
+from utils.metrics import record_api_latency
+from api.poll_scheduler import ConditionalCache, PollScheduler
+from api.token_manager import shared_token_manager
 
 logger = get_logger(__name__)
 
@@ -45,8 +48,8 @@ class GameAPI:
             
             # Step 3: Initialize authentication state
             logger.info(" Step 3: Initializing authentication state...")
-            self.token = None
-            self.headers = {}
+            self.tokens = shared_token_manager(self.config)  # Shared with AsyncGameAPI, renewed in the background
+            self._conditional = ConditionalCache()  # ETag / Last-Modified of the status polls
             logger.info(" Authentication state initialized")
             
             # Step 4: Setup HTTP session
@@ -100,6 +103,9 @@ class GameAPI:
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
+        # Per-endpoint latency for the metrics published over MQTT
+        session.hooks['response'].append(record_api_latency)
+        
         logger.debug(" HTTP session configured with:")
         logger.debug(f"   • Max retries: {retry_strategy.total}")
         logger.debug(f"   • Status codes for retry: {retry_strategy.status_forcelist}")
@@ -228,139 +234,52 @@ class GameAPI:
         logger.error(" Full Stack Trace:")
         logger.error(traceback.format_exc())
     
-    def authenticate(self) -> bool:
-        """Authenticate with the API and get token - waits until server responds"""
-        url = f"{self.base_url}/login2"
-        data = {
-            "email": self.email,
-            "password": self.password
-        }
-        
-        max_retries = 3
-        retry_delay = 2  # seconds
+    @property
+    def token(self) -> Optional[str]:
+        """Current bearer token (from the shared TokenManager)"""
+        return self.tokens.token
+    
+    @property
+    def headers(self) -> Dict[str, str]:
+        """Authorization header for the current token (empty when not logged in)"""
+        token = self.tokens.token
+        return {"Authorization": f"Bearer {token}"} if token else {}
+    
+    def authenticate(self, force: bool = False) -> bool:
+        """
+        Make sure a valid token is held
         
-        for attempt in range(max_retries):
-            try:
-                logger.info("" + "=" * 50)
-                logger.info(f" AUTHENTICATION ATTEMPT {attempt + 1}/{max_retries}")
-                logger.info("" + "=" * 50)
-                logger.info(f" POST {url}")
-                logger.debug(f" Request data: {{'email': '{self.email[:10]}...', 'password': '***'}}")
-                
-                start_time = time.time()
-                
-                # Increase timeout to wait for server response
-                response = self.session.post(
-                    url, 
-                    json=data, 
-                    timeout=30  # Wait up to 30 seconds for authentication
-                )
-                
-                elapsed_time = time.time() - start_time
-                logger.info(f"️  Response received in {elapsed_time:.2f} seconds")
-                logger.info(f" Status Code: {response.status_code}")
-                
-                response.raise_for_status()
-                
-                token_data = response.json()
-                logger.debug(f" Authentication response structure: {list(token_data.keys())}")
-                
-                # Extract token from response
-                if 'data' in token_data and 'token' in token_data['data']:
-                    self.token = token_data['data']['token']
-                    logger.debug(" Token found in response.data.token")
-                elif 'token' in token_data:
-                    self.token = token_data['token']
-                    logger.debug(" Token found in response.token")
-                else:
-                    logger.error(f" No token found in response structure: {list(token_data.keys())}")
-                    logger.debug(f"Full response: {token_data}")
-                    self.token = None
-                
-                if self.token:
-                    self.headers = {"Authorization": f"Bearer {self.token}"}
-                    logger.info("" + "=" * 50)
-                    logger.info(" AUTHENTICATION SUCCESSFUL!")
-                    logger.info("" + "=" * 50)
-                    logger.info(f" Token length: {len(self.token)} characters")
-                    logger.info(f" Token preview: {self.token[:20]}...")
-                    logger.info(f" Headers configured with Bearer token")
-                    logger.info("" + "=" * 50)
-                    return True
-                else:
-                    logger.error(" Authentication failed - no token in response")
-                    if attempt < max_retries - 1:
-                        logger.warning(f" Retrying authentication in {retry_delay} seconds...")
-                        time.sleep(retry_delay)
-                        continue
-                    return False
-                    
-            except Timeout as e:
-                elapsed_time = time.time() - start_time
-                logger.error("" + "=" * 50)
-                logger.error(f" AUTHENTICATION TIMEOUT (attempt {attempt + 1})")
-                logger.error("" + "=" * 50)
-                logger.error(f"️  Elapsed time: {elapsed_time:.2f} seconds")
-                logger.error(f" Error details: {str(e)}")
-                if attempt < max_retries - 1:
-                    logger.warning(f" Retrying authentication in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    continue
-                logger.error(" All timeout retries exhausted")
-                return False
-            except (ConnectionError, RequestException) as e:
-                elapsed_time = time.time() - start_time
-                logger.error("" + "=" * 50)
-                logger.error(f" AUTHENTICATION CONNECTION ERROR (attempt {attempt + 1})")
-                logger.error("" + "=" * 50)
-                logger.error(f"️  Elapsed time: {elapsed_time:.2f} seconds")
-                logger.error(f" Error type: {type(e).__name__}")
-                logger.error(f" Error details: {str(e)}")
-                if attempt < max_retries - 1:
-                    logger.warning(f" Retrying authentication in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    continue
-                logger.error(" All connection retries exhausted")
-                return False
-            except Exception as e:
-                elapsed_time = time.time() - start_time
-                logger.error("" + "=" * 50)
-                logger.error(f" UNEXPECTED AUTHENTICATION ERROR (attempt {attempt + 1})")
-                logger.error("" + "=" * 50)
-                logger.error(f"️  Elapsed time: {elapsed_time:.2f} seconds")
-                logger.error(f" Error type: {type(e).__name__}")
-                logger.error(f" Error details: {str(e)}")
-                logger.error("" + "=" * 50)
-                import traceback
-                logger.debug(f" Stack trace: {traceback.format_exc()}")
-                return False
+        Logs in (POST /login2) only when no token is held, it has expired or force is set.
+        The TokenManager renews the token in the background before it expires and lets
+        concurrent callers share one login, so this is normally just a check.
+        """
+        if not force and self.tokens.is_valid():
+            logger.debug(f" Token valid for another {self.tokens.expires_in():.0f}s")
+            return True
         
-        logger.error("" + "=" * 50)
-        logger.error(" AUTHENTICATION COMPLETELY FAILED")
-        logger.error("" + "=" * 50)
-        logger.error(f" Attempted {max_retries} times with {retry_delay}s delays")
-        logger.error("" + "=" * 50)
+        logger.info(" Logging in to the game server...")
+        token = self.tokens.refresh() if force else self.tokens.get_token()
+        if token:
+            logger.info(f" AUTHENTICATION SUCCESSFUL - token valid for {self.tokens.expires_in():.0f}s")
+            return True
+        logger.error(" AUTHENTICATION FAILED")
         return False
     
     def _ensure_authenticated(self) -> bool:
-        """Ensure we have a valid authentication token and proper headers"""
-        if not self.token:
-            logger.warning("" + "=" * 30)
-            logger.warning("️  NO AUTHENTICATION TOKEN FOUND")
-            logger.warning("" + "=" * 30)
-            logger.info(" Attempting automatic authentication...")
-            return self.authenticate()
-        else:
-            logger.debug(f" Authentication token available (length: {len(self.token)})")
-            
-            # Verify authorization header is properly configured
-            if not self.verify_authorization_header():
-                logger.warning("️  Authorization header verification failed")
-                # Try to recreate headers
-                self.headers = {"Authorization": f"Bearer {self.token}"}
-                logger.info(" Recreated Authorization header")
-                
+        """Ensure we hold an unexpired token; only logs in when there is none"""
+        if self.tokens.is_valid():
+            logger.debug(f" Authentication token available (expires in {self.tokens.expires_in():.0f}s)")
             return True
+        logger.warning("️  No valid authentication token, logging in...")
+        return self.authenticate()
+    
+    def _handle_unauthorized(self, response: requests.Response, token: Optional[str]) -> bool:
+        """On a 401, drop the rejected token and log in again; returns True if the request should be retried"""
+        if response.status_code != 401:
+            return False
+        logger.warning("️  Token rejected (401), logging in again")
+        self.tokens.invalidate(token)
+        return self.tokens.get_token() is not None
     
     def get_game_status(self, game_result_id: str) -> Optional[Dict]:
         """Get current game status"""
@@ -388,6 +307,46 @@ class GameAPI:
             logger.error(f"Game status error: {e}")
             return None
     
+    def _conditional_get(self, url: str, params: Optional[Dict] = None,
+                         timeout: Optional[float] = None) -> Tuple[requests.Response, Optional[Dict], bool]:
+        """
+        GET that revalidates the previous 200 for the same request (If-None-Match / If-Modified-Since)
+        
+        Returns:
+            (response, data, changed): data is the parsed JSON of a 200, or the cached body
+            of a 304 (not downloaded or parsed again), None otherwise; changed is True only
+            when a 200 body differs from the previous one
+        
+        Raises:
+            ValueError: a 200 response that is not valid JSON
+        """
+        key = ConditionalCache.key(url, params)
+        for attempt in range(2):
+            token = self.token
+            headers = self.headers
+            if getattr(self.config, 'conditional_requests', True):
+                headers.update(self._conditional.request_headers(key))
+            
+            response = self.session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=timeout or self.config.game_status_timeout
+            )
+            if attempt or not self._handle_unauthorized(response, token):
+                break
+        
+        if response.status_code == 304:
+            return response, self._conditional.body(key), False
+        if response.status_code == 200:
+            data = response.json()
+            return response, data, self._conditional.store(key, response, data)
+        return response, None, False
+    
+    def create_poll_scheduler(self) -> PollScheduler:
+        """Adaptive poll interval from the poll_* settings in APIConfig"""
+        return PollScheduler.from_config(self.config)
+    
     def poll_game_initialization(self) -> Optional[Dict]:
         """
         Step 1: Poll for game initialization
@@ -419,22 +378,21 @@ class GameAPI:
         start_time = time.time()
         
         try:
-            # Using GET as per API specification
-            response = self.session.get(
-                url,
-                params=params,
-                headers=self.headers,
-                timeout=self.config.game_status_timeout
-            )
+            # Using GET as per API specification; a 304 reuses the previous result unparsed
+            try:
+                response, data, changed = self._conditional_get(url, params=params)
+            except ValueError as e:
+                logger.error(f" Failed to parse JSON response: {e}")
+                return None
             
             elapsed_time = time.time() - start_time
             logger.info(f"️  Response received in {elapsed_time:.2f} seconds")
             logger.info(f" Status Code: {response.status_code}")
             
-            if response.status_code == 200:
+            if response.status_code in (200, 304) and data is not None:
                 try:
-                    data = response.json()
-                    logger.info(f" Response data: {data}")
+                    if changed:
+                        logger.info(f" Response data: {data}")
                     games = data.get('data', [])
                     
                     logger.info(f" Response contains {len(games)} games")
@@ -456,10 +414,6 @@ class GameAPI:
                         logger.info(" No initiated games found - waiting for game admin")
                         return None
                         
-                except ValueError as e:
-                    logger.error(f" Failed to parse JSON response: {e}")
-                    logger.debug(f" Raw response content: {response.text[:200]}...")
-                    return None
                 except Exception as e:
                     logger.error(f" Unexpected error processing response: {e}")
                     return None
@@ -585,6 +539,9 @@ class GameAPI:
         Step 2: Continuously poll for game start signal like
         This method polls continuously until game starts, gets cancelled, or score submission is triggered
         
+        Polls fast right after initialization and after every status change, relaxes while the
+        status stays the same, and revalidates with ETag / If-Modified-Since (see api/poll_scheduler.py).
+        
         Args:
             game_result_id: The game result ID to poll
             submit_score_flag_ref: Reference to submit_score_flag for external control
@@ -608,6 +565,18 @@ class GameAPI:
         logger.info(f" Polling URL: {url}")
         logger.info(f" Using Bearer token: {self.token[:20] if self.token else 'None'}...")
         
+        def submit_requested() -> bool:
+            if submit_score_flag_ref and hasattr(submit_score_flag_ref, '__call__'):
+                return bool(submit_score_flag_ref())
+            return bool(hasattr(submit_score_flag_ref, 'value') and submit_score_flag_ref.value)
+        
+        def should_wake() -> bool:
+            # Cut a relaxed wait short so a submit / stop is acted on at once
+            return submit_requested() or bool(game_stopped_check and callable(game_stopped_check) and game_stopped_check())
+        
+        # Tight polling right after initialization, relaxing while the status stays the same
+        scheduler = self.create_poll_scheduler()
+        last_status = None
         poll_count = 0
         while True:
             if max_polls and poll_count >= max_polls:
@@ -619,33 +588,35 @@ class GameAPI:
                 logger.info(" Game stopped check triggered - exiting polling loop")
                 return {'status': 'game_stopped', 'message': 'Game timers stopped'}
             
+            if submit_requested():
+                logger.info(" Score submission flag detected - exiting polling")
+                return {"status": "submit_triggered"}
+            
             poll_count += 1
             try:
                 response = None
                 start_time = time.time()
                 
-                response = self.session.get(
-                    url, 
-                    headers=self.headers,
-                    timeout=8
-                )
+                response, data, changed = self._conditional_get(url, timeout=8)
                 
                 elapsed_time = time.time() - start_time
-                logger.debug(f"️  Response received in {elapsed_time:.2f} seconds")
+                logger.debug(f"️  Response received in {elapsed_time:.2f} seconds (HTTP {response.status_code})")
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    logger.debug(f" Response data: {data}")
+                if data is not None:
+                    if changed:
+                        logger.debug(f" Response data: {data}")
                     
                     if data.get('data') and len(data.get('data')) > 0:
                         status = data.get('data').get('status')
-                        logger.info(f" Status Received: {status}")
+                        if status != last_status:
+                            logger.info(f" Status Received: {status}")
+                            scheduler.record_change()
+                            last_status = status
+                        else:
+                            scheduler.record_unchanged()
                         
                         # Check if score submission was triggered externally
-                        if submit_score_flag_ref and hasattr(submit_score_flag_ref, '__call__') and submit_score_flag_ref():
-                            logger.info(" Score submission flag detected - exiting polling")
-                            return {"status": "submit_triggered"}
-                        elif hasattr(submit_score_flag_ref, 'value') and submit_score_flag_ref.value:
+                        if submit_requested():
                             logger.info(" Score submission flag detected - exiting polling")
                             return {"status": "submit_triggered"}
                         
@@ -657,8 +628,6 @@ class GameAPI:
                             elif hasattr(started_flag_ref, 'value'):
                                 started_flag_value = started_flag_ref.value
                             
-                            logger.info(f" Status 'playing' received, started_flag: {started_flag_value}")
-                            
                             if not started_flag_value:
                                 # First time receiving playing status - emit start signal
                                 logger.info("" + "=" * 50)
@@ -671,8 +640,7 @@ class GameAPI:
                                 return data.get('data')
                             else:
                                 # Game already started - continue monitoring without emitting
-                                logger.info(" Game already started, continuing to monitor for cancel/submit...")
-                                continue
+                                logger.debug(" Game already started, continuing to monitor for cancel/submit...")
                                 
                         elif status == "cancel":
                             logger.warning("️" + "=" * 50)
@@ -690,8 +658,10 @@ class GameAPI:
                             logger.debug(f" Current status: {status} - continuing to poll...")
                     else:
                         logger.debug(" No game data in response")
+                        scheduler.record_unchanged()
                 else:
                     logger.warning(f"️  HTTP {response.status_code}: {response.text[:200] if response.text else 'No response text'}")
+                    scheduler.record_error()
                     
             except (ConnectionError, Timeout, RequestException) as e:
                 logger.error(f" Network error during polling: {type(e).__name__}: {str(e)}")
@@ -700,8 +670,7 @@ class GameAPI:
                         logger.debug(f" Response content: {response.text[:200]}")
                     except:
                         pass
-                time.sleep(3)  # Wait before retry on network error
-                continue
+                scheduler.record_error()
             except Exception as e:
                 logger.error(f" Unexpected error during polling: {type(e).__name__}: {str(e)}")
                 if response is not None:
@@ -709,11 +678,10 @@ class GameAPI:
                         logger.debug(f" Response content: {response.text[:200]}")
                     except:
                         pass
-                time.sleep(2)  # Wait before retry on unexpected error
-                continue
+                scheduler.record_error()
             
-            # Small delay between polls
-            time.sleep(2)
+            # Adaptive, jittered delay between polls
+            scheduler.wait(should_wake)
         
         return None
     
@@ -740,11 +708,25 @@ class GameAPI:
         
         return False
     
-    def submit_final_scores(self, game_result_id: str, individual_scores: List[Dict]) -> bool:
+    def submit_final_scores(self, game_result_id: str, individual_scores: List[Dict],
+                            idempotency_key: Optional[str] = None) -> bool:
         """
         Step 3: Submit final game scores
         Endpoint: POST /game-result/scoring
         
+        Returns True if the server accepted them; see submit_final_scores_status() for
+        the HTTP status
+        """
+        return self.submit_final_scores_status(game_result_id, individual_scores, idempotency_key) == 200
+    
+    def submit_final_scores_status(self, game_result_id: str, individual_scores: List[Dict],
+                                   idempotency_key: Optional[str] = None) -> Optional[int]:
+        """
+        Submit final game scores and return the HTTP status (None if no response arrived)
+        
+        idempotency_key is sent as the Idempotency-Key header, identical on every retry
+        of the same game (the score outbox uses the gameResultID)
+        
         Expected format for individual_scores:
         [
             { "userID": "6kKS8O07T9ePXhxW18LC", "nodeID": 1, "score": 1 },
@@ -758,7 +740,7 @@ class GameAPI:
         
         if not self._ensure_authenticated():
             logger.error(" Authentication required for score submission")
-            return False
+            return None
         # url endpoint for submit final scores
         #  "https://dev-eaa25-api-hpfyfcbshkabezeh.uaenorth-01.azurewebsites.net/game-result/scoring"
         url = f"{self.base_url}/game-result/scoring"
@@ -784,13 +766,27 @@ class GameAPI:
         
         start_time = time.time()
         
+        def request_headers() -> Dict[str, str]:
+            headers = self.headers
+            if idempotency_key:
+                headers["Idempotency-Key"] = idempotency_key
+            return headers
+        
         try:
+            token = self.token
             response = self.session.post(
                 url,
                 json=data,
-                headers=self.headers,
+                headers=request_headers(),
                 timeout=self.config.submit_score_timeout
             )
+            if self._handle_unauthorized(response, token):
+                response = self.session.post(
+                    url,
+                    json=data,
+                    headers=request_headers(),
+                    timeout=self.config.submit_score_timeout
+                )
             
             elapsed_time = time.time() - start_time
             logger.info(f"️  Response received in {elapsed_time:.2f} seconds")
@@ -804,7 +800,7 @@ class GameAPI:
                 logger.info(f" {len(individual_scores)} player scores recorded")
                 logger.info(" Ready for next game cycle")
                 logger.info("" + "=" * 50)
-                return True
+                return response.status_code
             else:
                 logger.error("" + "=" * 50)
                 logger.error(" FINAL SCORE SUBMISSION FAILED")
@@ -812,7 +808,7 @@ class GameAPI:
                 logger.error(f" HTTP Status: {response.status_code}")
                 logger.error(f" Response: {response.text[:300]}...")
                 logger.error("" + "=" * 50)
-                return False
+                return response.status_code
                 
         except (ConnectionError, Timeout, RequestException) as e:
             elapsed_time = time.time() - start_time
@@ -823,7 +819,7 @@ class GameAPI:
             logger.error(f" Error type: {type(e).__name__}")
             logger.error(f" Error details: {str(e)}")
             logger.error("" + "=" * 50)
-            return False
+            return None
     
     def get_leaderboard(self, game_name: str = None) -> List[Tuple[str, int]]:
         """
@@ -1030,8 +1026,7 @@ class GameAPI:
         logger.warning(" CLEARING AUTHENTICATION")
         logger.warning("" + "=" * 30)
         logger.info(f" Clearing token (length: {len(self.token) if self.token else 0})")
-        self.token = None
-        self.headers = {}
+        self.tokens.invalidate()
         logger.info(" Authentication state cleared")
         logger.warning("" + "=" * 30)
     
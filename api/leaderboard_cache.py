@@ -0,0 +1,115 @@
+"""
+Leaderboard Cache for Fast Reaction Game
+Serves the last good leaderboard from memory and revalidates it on a background thread
+
+- get() returns the cached (teams, lastplayed) immediately; when it is older than the
+  TTL a refresh is started behind it (stale-while-revalidate)
+- The worker also refreshes on its own every TTL, and at once after invalidate()
+  (e.g. when a game's scores were submitted)
+- changed(snapshot) is emitted only when the ranking or the last-played entry differs
+  from the previous snapshot; failed or empty responses keep the last good one
+
+changed is emitted from the worker thread, so slots on UI objects run as queued calls.
+
+Usage (UI thread):
+    leaderboard_cache.changed.connect(self._apply_leaderboard)
+    self._apply_leaderboard(leaderboard_cache.get())
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# (top teams as (team_name, total_score, weighted_points), lastplayed dict or None)
+LeaderboardSnapshot = Tuple[List[Tuple[str, int, int]], Optional[Dict]]
+
+
+class LeaderboardCache(QObject):
+    """
+    Background-refreshed leaderboard shared by every screen
+
+    Args:
+        fetch: Blocking call returning a LeaderboardSnapshot (GameAPI.get_leaderboard
+            shape); runs on the cache's worker thread only
+        ttl: Seconds a snapshot is served before it is revalidated
+    """
+    changed = pyqtSignal(object)
+
+    def __init__(self, fetch: Callable[[], LeaderboardSnapshot], ttl: float = 30.0, parent=None):
+        super().__init__(parent)
+        self._fetch = fetch
+        self.ttl = max(1.0, ttl)
+        self._lock = threading.Lock()
+        self._snapshot: LeaderboardSnapshot = ([], None)
+        self._fetched_at = 0.0  # monotonic time of the last good response, 0 = never
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the worker; the first fetch begins immediately"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._wake.set()
+        self._thread = threading.Thread(target=self._run, name="LeaderboardCache", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def get(self) -> LeaderboardSnapshot:
+        """Last good snapshot, without waiting; schedules a refresh if it is stale"""
+        with self._lock:
+            snapshot = self._snapshot
+        if self.is_stale():
+            self._wake.set()
+        return snapshot
+
+    def is_stale(self) -> bool:
+        return not self._fetched_at or time.monotonic() - self._fetched_at >= self.ttl
+
+    def invalidate(self):
+        """Revalidate now (any thread), e.g. after scores were submitted"""
+        self._fetched_at = 0.0
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.ttl)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self._refresh()
+
+    def _refresh(self):
+        try:
+            result = self._fetch()
+        except Exception as e:
+            logger.warning(f"️  Leaderboard refresh failed: {type(e).__name__}: {e}")
+            return
+        # GameAPI.get_leaderboard returns [] and AsyncGameAPI ([], None) on errors
+        if not isinstance(result, tuple) or len(result) != 2 or not result[0]:
+            logger.debug(" Leaderboard refresh returned nothing, keeping the cached snapshot")
+            return
+
+        teams, lastplayed = result
+        snapshot = ([tuple(team) for team in teams], lastplayed)
+        with self._lock:
+            unchanged = snapshot == self._snapshot
+            self._snapshot = snapshot
+            self._fetched_at = time.monotonic()
+        if unchanged:
+            logger.debug(" Leaderboard unchanged")
+            return
+        logger.info(f" Leaderboard changed: {len(teams)} teams")
+        self.changed.emit(snapshot)
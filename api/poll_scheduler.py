@@ -0,0 +1,153 @@
+"""
+Adaptive Polling for Fast Reaction Game API
+Decides how long to wait between status polls, and remembers validators so repeated
+polls can be answered with 304 Not Modified
+
+PollScheduler:
+    - polls every fast_interval for fast_period seconds after reset() (a game was just
+      initialised, or the status changed) - that is when the start signal is expected
+    - then relaxes by backoff_factor per unchanged poll, up to idle_interval
+    - backs off from error_interval to error_interval_max while requests fail
+    - spreads every delay by +/- jitter so a floor of stations never polls in lockstep
+
+ConditionalCache:
+    Keeps the ETag / Last-Modified and the parsed body of the last 200 per request, so
+    the next request carries If-None-Match / If-Modified-Since and a 304 reuses the
+    cached body without downloading or parsing JSON again.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+
+class PollScheduler:
+    """Interval policy for one polling loop (not thread-safe; one loop owns it)"""
+
+    def __init__(self, fast_interval: float = 0.5, fast_period: float = 15.0, idle_interval: float = 3.0,
+                 backoff_factor: float = 1.5, error_interval: float = 3.0, error_interval_max: float = 30.0,
+                 jitter: float = 0.2):
+        self.fast_interval = max(0.05, fast_interval)
+        self.fast_period = max(0.0, fast_period)
+        self.idle_interval = max(self.fast_interval, idle_interval)
+        self.backoff_factor = max(1.0, backoff_factor)
+        self.error_interval = max(0.05, error_interval)
+        self.error_interval_max = max(self.error_interval, error_interval_max)
+        self.jitter = min(max(0.0, jitter), 0.9)
+        self._interval = self.fast_interval
+        self._error_interval = self.error_interval
+        self._failing = False
+        self._fast_until = 0.0
+        self.reset()
+
+    @classmethod
+    def from_config(cls, api_config) -> "PollScheduler":
+        """Build from the poll_* fields of APIConfig (defaults for any that are missing)"""
+        return cls(
+            fast_interval=getattr(api_config, 'poll_fast_interval', 0.5),
+            fast_period=getattr(api_config, 'poll_fast_period', 15.0),
+            idle_interval=getattr(api_config, 'poll_idle_interval', 3.0),
+            backoff_factor=getattr(api_config, 'poll_backoff_factor', 1.5),
+            error_interval=getattr(api_config, 'poll_error_interval', 3.0),
+            error_interval_max=getattr(api_config, 'poll_error_interval_max', 30.0),
+            jitter=getattr(api_config, 'poll_jitter', 0.2),
+        )
+
+    @property
+    def interval(self) -> float:
+        """Current delay before jitter"""
+        return self._error_interval if self._failing else self._interval
+
+    def reset(self):
+        """Poll fast again for fast_period (new game, status change)"""
+        self._interval = self.fast_interval
+        self._fast_until = time.monotonic() + self.fast_period
+        self._failing = False
+        self._error_interval = self.error_interval
+
+    def record_change(self):
+        self.reset()
+
+    def record_unchanged(self):
+        self._failing = False
+        self._error_interval = self.error_interval
+        if time.monotonic() >= self._fast_until:
+            self._interval = min(self._interval * self.backoff_factor, self.idle_interval)
+
+    def record_error(self):
+        if self._failing:
+            self._error_interval = min(self._error_interval * 2, self.error_interval_max)
+        self._failing = True
+
+    def next_delay(self) -> float:
+        interval = self.interval
+        if not self.jitter:
+            return interval
+        return interval * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+    def wait(self, should_stop: Optional[Callable[[], bool]] = None, slice_seconds: float = 0.1) -> bool:
+        """
+        Sleep for next_delay(), returning early (True) as soon as should_stop() is true
+
+        Returns:
+            True if woken by should_stop, False after the full delay
+        """
+        deadline = time.monotonic() + self.next_delay()
+        while True:
+            if should_stop is not None and should_stop():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(slice_seconds, remaining) if should_stop is not None else remaining)
+
+
+class ConditionalCache:
+    """Validators and parsed bodies of the last successful response per request key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[Optional[str], Optional[str], object]] = {}
+
+    @staticmethod
+    def key(url: str, params: Optional[Dict] = None) -> str:
+        if not params:
+            return url
+        return url + "?" + "&".join(f"{name}={params[name]}" for name in sorted(params))
+
+    def request_headers(self, key: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since for the cached response, if any"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        etag, last_modified, _ = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def store(self, key: str, response, data) -> bool:
+        """Remember a 200 response; returns True if its body differs from the cached one"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self._lock:
+            previous = self._entries.get(key)
+            # Without validators the body is still kept, for change detection
+            self._entries[key] = (etag, last_modified, data)
+        return previous is None or previous[2] != data
+
+    def body(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[2] if entry else None
+
+    def clear(self, key: Optional[str] = None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -0,0 +1,244 @@
+"""
+Token Lifecycle for Fast Reaction Game API
+One bearer token per account, shared by GameAPI and AsyncGameAPI and renewed before it expires
+
+- Expiry comes from the JWT "exp" claim, or APIConfig.token_ttl when the token is opaque
+- A background thread logs in again token_refresh_margin seconds before expiry, so
+  polls and score submissions find a valid token instead of paying for a login
+- Callers that need a login at the same time share one request (single flight)
+"""
+
+import base64
+import binascii
+import json
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+from utils.logger import get_logger
+from utils.metrics import record_api_latency
+
+logger = get_logger(__name__)
+
+_RETRY_INTERVAL = 5.0       # First retry after a failed background refresh
+_RETRY_INTERVAL_MAX = 60.0  # Longest retry delay
+_IDLE_WAKEUP = 60.0         # Background thread check interval while no token is held
+_LOGIN_ATTEMPTS = 3         # POSTs per login_request() for network errors, 429 and 5xx
+_LOGIN_RETRY_DELAY = 2.0    # Pause between those attempts
+
+
+def jwt_expiry(token: str) -> Optional[float]:
+    """Unix time from the token's "exp" claim, or None if it is not a JWT with one"""
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1] + "=" * (-len(parts[1]) % 4)
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+    exp = claims.get("exp") if isinstance(claims, dict) else None
+    return float(exp) if isinstance(exp, (int, float)) else None
+
+
+class TokenManager:
+    """
+    Holds the current token, knows when it expires and renews it
+
+    Args:
+        login: Performs one login and returns the token, or None on failure
+        ttl_seconds: Assumed lifetime of tokens without an "exp" claim
+        refresh_margin: Renew this long before expiry (at most half the token's lifetime)
+    """
+
+    def __init__(self, login: Callable[[], Optional[str]], ttl_seconds: float = 3600.0, refresh_margin: float = 300.0):
+        self._login = login
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._refreshed = threading.Condition(self._lock)
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._refreshing = False
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def token(self) -> Optional[str]:
+        """Latest token (may be close to expiry; use get_token() to be sure)"""
+        return self._token
+
+    def expires_in(self) -> float:
+        return max(0.0, self._expires_at - time.time()) if self._token else 0.0
+
+    def is_fresh(self) -> bool:
+        """True while a token is held and not yet due for renewal"""
+        return self._token is not None and time.time() < self._refresh_at
+
+    def is_valid(self) -> bool:
+        """True while a token is held and not expired (it may already be due for renewal)"""
+        return self._token is not None and time.time() < self._expires_at
+
+    def get_token(self) -> Optional[str]:
+        """
+        A usable token, logging in first only if none is held or it has expired
+
+        A token that is due for renewal but not expired is returned as is and the
+        renewal is left to the background thread, so requests never wait for it.
+        """
+        if self.is_valid():
+            if not self.is_fresh():
+                self._wake.set()
+            return self._token
+        return self.refresh()
+
+    def refresh(self) -> Optional[str]:
+        """Log in now; concurrent callers wait for the login already in flight instead of starting another"""
+        with self._lock:
+            if self._refreshing:
+                while self._refreshing:
+                    self._refreshed.wait()
+                return self._token
+            self._refreshing = True
+
+        token = None
+        try:
+            token = self._login()
+        except Exception as e:
+            logger.error(f" Login failed: {type(e).__name__}: {e}")
+        finally:
+            with self._lock:
+                if token:
+                    self._set_token_locked(token)
+                self._refreshing = False
+                self._refreshed.notify_all()
+            self._wake.set()  # Reschedule the background refresh
+
+        if token:
+            logger.info(f" Token renewed, valid for {self.expires_in():.0f}s")
+        return token
+
+    def invalidate(self, token: Optional[str] = None):
+        """Forget the token (e.g. after a 401); with token given, only if it is still the current one"""
+        with self._lock:
+            if token is None or token == self._token:
+                self._token = None
+                self._expires_at = self._refresh_at = 0.0
+
+    def start(self):
+        """Start the background renewal thread (idempotent)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TokenRefresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def _set_token_locked(self, token: str):
+        now = time.time()
+        expires_at = jwt_expiry(token) or now + self.ttl_seconds
+        lifetime = max(0.0, expires_at - now)
+        self._token = token
+        self._expires_at = expires_at
+        self._refresh_at = expires_at - min(self.refresh_margin, lifetime / 2)
+
+    def _run(self):
+        retry_interval = _RETRY_INTERVAL
+        while not self._stop.is_set():
+            if self._token is None:
+                # Nothing to renew until someone logs in
+                delay = _IDLE_WAKEUP
+            else:
+                delay = self._refresh_at - time.time()
+            if delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+                continue
+            token = self.refresh()
+            if token and self.is_fresh():
+                retry_interval = _RETRY_INTERVAL
+                continue
+            if not token:
+                logger.warning(f"️  Background token refresh failed, retrying in {retry_interval:.0f}s")
+            # Also reached when the new token is already due (very short-lived tokens): don't spin
+            self._stop.wait(retry_interval)
+            retry_interval = min(retry_interval * 2, _RETRY_INTERVAL_MAX)
+
+
+def extract_token(response_data: Dict) -> Optional[str]:
+    """Token from a /login2 response ({"data": {"token": ...}} or {"token": ...})"""
+    if not isinstance(response_data, dict):
+        return None
+    data = response_data.get('data')
+    if isinstance(data, dict) and data.get('token'):
+        return data['token']
+    return response_data.get('token')
+
+
+def login_request(api_config, session: Optional[requests.Session] = None) -> Optional[str]:
+    """
+    POST /login2 with the configured account; returns the token or None
+
+    Network errors, 429 and 5xx are retried up to _LOGIN_ATTEMPTS times, _LOGIN_RETRY_DELAY
+    apart, so a foreground authenticate() survives a brief outage. Other rejections (e.g.
+    wrong credentials) return None at once.
+    """
+    url = f"{api_config.base_url.rstrip('/')}/login2"
+    body = {"email": api_config.email, "password": api_config.password}
+    response = None
+    for attempt in range(1, _LOGIN_ATTEMPTS + 1):
+        started = time.time()
+        try:
+            response = (session or requests).post(url, json=body, timeout=api_config.auth_timeout)
+        except requests.RequestException as e:
+            logger.warning(f"️  Login attempt {attempt}/{_LOGIN_ATTEMPTS} failed: {type(e).__name__}: {e}")
+            response = None
+        else:
+            logger.info(f" POST {url}: HTTP {response.status_code} in {time.time() - started:.2f}s")
+            if response.status_code != 429 and response.status_code < 500:
+                break
+            logger.warning(f"️  Login attempt {attempt}/{_LOGIN_ATTEMPTS} failed: HTTP {response.status_code}")
+        if attempt < _LOGIN_ATTEMPTS:
+            time.sleep(_LOGIN_RETRY_DELAY)
+
+    if response is None:
+        logger.error(f" Login failed after {_LOGIN_ATTEMPTS} attempts")
+        return None
+    if response.status_code != 200:
+        logger.error(f" Login rejected: HTTP {response.status_code}: {response.text[:200]}")
+        return None
+    token = extract_token(response.json())
+    if not token:
+        logger.error(" No token in login response")
+    return token
+
+
+_shared_managers: Dict[Tuple[str, str], TokenManager] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_token_manager(api_config) -> TokenManager:
+    """The process-wide TokenManager for an account, started on first use"""
+    key = (api_config.base_url.rstrip('/'), api_config.email)
+    with _shared_lock:
+        manager = _shared_managers.get(key)
+        if manager is None:
+            session = requests.Session()
+            session.hooks['response'].append(record_api_latency)
+            manager = TokenManager(
+                lambda: login_request(api_config, session),
+                ttl_seconds=getattr(api_config, 'token_ttl', 3600.0),
+                refresh_margin=getattr(api_config, 'token_refresh_margin', 300.0),
+            )
+            manager.start()
+            _shared_managers[key] = manager
+        return manager
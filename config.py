@@ -52,6 +52,21 @@ class APIConfig:
     game_status_timeout: int = 8
     submit_score_timeout: int = 20
     leaderboard_timeout: int = 12
+    leaderboard_ttl: float = 30.0  # Seconds the cached leaderboard is shown before it is refetched (api/leaderboard_cache.py)
+    
+    # Status polling (api/poll_scheduler.py), in seconds
+    poll_fast_interval: float = 0.5  # Interval right after initialization / a status change
+    poll_fast_period: float = 15.0  # How long the fast interval is kept
+    poll_idle_interval: float = 3.0  # Longest interval while the status stays the same
+    poll_backoff_factor: float = 1.5  # Growth per unchanged poll after the fast period
+    poll_error_interval: float = 3.0  # First retry delay after a failed poll (doubles per failure)
+    poll_error_interval_max: float = 30.0  # Longest retry delay
+    poll_jitter: float = 0.2  # +/- fraction applied to every delay so stations don't poll in lockstep
+    conditional_requests: bool = True  # Send If-None-Match / If-Modified-Since; 304s skip JSON parsing
+    
+    # Token lifecycle (api/token_manager.py), in seconds
+    token_ttl: float = 3600.0  # Assumed token lifetime when the token carries no JWT "exp" claim
+    token_refresh_margin: float = 300.0  # Renew in the background this long before the token expires
 
 
 @dataclass
@@ -59,6 +74,11 @@ class GameConfig:
     """Game configuration settings"""
     timer_value: int = 90150  # Default timer value in milliseconds
     final_screen_timer: int = 15000  # Final screen display time
+    runtime_settings_path: str = "runtime_settings.json"  # Timers changed over MQTT, kept across restarts
+    score_outbox_path: str = "score_outbox.db"  # SQLite queue of score submissions (utils/score_outbox.py)
+    score_retry_interval: float = 5.0  # First retry delay for a failed submission (doubles per failure)
+    score_retry_interval_max: float = 300.0  # Longest retry delay
+    score_max_attempts: int = 50  # Mark a submission failed after this many attempts (0 = retry forever)
     
 
     time_bonus_multiplier: int = 10
@@ -84,6 +104,18 @@ class SerialConfig:
     auto_reconnect: bool = True  # Enable automatic reconnection
     reconnect_interval: int = 5  # Seconds between reconnection attempts
     max_reconnect_attempts: int = 10  # Maximum reconnection attempts (-1 for infinite)
+    read_mode: str = "select"  # "select" (wake only when bytes arrive) or "poll" (legacy in_waiting loop)
+    framing: str = "line"  # "line" (Sc120, Crct, ...) or "binary" (CRC-checked multi-event frames, see utils/panel_protocol.py)
+    max_wake_latency_ms: int = 50  # Longest the reader sleeps before re-checking stop/monitoring state
+    batch_events: bool = True  # Drain all buffered lines per wakeup and deliver them as one batch signal
+    max_batch_size: int = 64  # Upper bound on lines drained per wakeup
+    handshake_timeout_ms: int = 1000  # How long the serial thread waits for "OK" after Start/Stop
+    capture_enabled: bool = False  # Record every received/sent line to a binary session log per game
+    capture_dir: str = "serial_sessions"  # Directory for session logs (replay with scripts_helper/serial_session_replayer.py)
+    extra_ports: list = None  # Additional reaction panel ports, read by the same thread as `port`
+    hotplug_detection: bool = True  # Reconnect as soon as the port reappears in /dev (Linux inotify)
+    reconnect_backoff_max: int = 30  # Max seconds between attempts when no device notifications are available
+    write_queue_size: int = 256  # Outbound messages held for the serial thread; oldest dropped when full
 
 
 @dataclass
@@ -93,6 +125,20 @@ class MQTTConfig:
     port: int = 1883
     data_topics: list = None
     control_topics: list = None
+    topic_prefix: str = ""  # Prepended to every topic, e.g. "station7/" on a broker shared with other games
+    topic_template: str = "{root}/{station}/{path}"  # Station form of a topic when Settings.station_id is set
+    broadcast_topics: list = None  # Topics also received in their global form (fleet-wide commands)
+    data_flush_interval_ms: int = 10  # Max delay before data-topic events are handed to the UI as one batch
+    data_max_batch_size: int = 256  # Flush early once this many data-topic events are pending
+    data_qos: int = 1  # Subscription QoS for data topics; 1 lets redeliveries (DUP) be dropped by packet id
+    client_id: str = ""  # Empty = broker-assigned (required for clean_session=False; defaults to the host name)
+    clean_session: bool = True  # False keeps subscriptions and QoS 1 messages on the broker across reconnects
+    keepalive: int = 60  # Seconds between pings; a dead broker is noticed after ~1.5x this
+    reconnect_delay_min: float = 1.0  # First reconnect delay in seconds (jittered, doubles per failure)
+    reconnect_delay_max: float = 60.0  # Upper bound on the reconnect delay
+    metrics_enabled: bool = True  # Publish performance metrics during and after each game
+    metrics_topic: str = "FastReaction/{station}/metrics"  # {station} = Settings.station_id, else the host name
+    metrics_interval_s: float = 10.0  # Seconds between reports while a game is running
     
     def __post_init__(self):
         if self.data_topics is None:
@@ -110,6 +156,12 @@ class MQTTConfig:
                 "FastReaction/game/Deactivate",
                 "FastReaction/game/timerfinal"
             ]
+        
+        if self.broadcast_topics is None:
+            self.broadcast_topics = [
+                "FastReaction/game/timer",
+                "FastReaction/game/timerfinal",
+            ]
 
 
 @dataclass
@@ -120,6 +172,7 @@ class Settings:
     ui: UIConfig
     serial: SerialConfig
     mqtt: MQTTConfig
+    station_id: str = ""  # This station's id on a shared broker; empty = global (unsharded) topics
     
     @classmethod
     def load(cls, config_file: Optional[str] = None) -> 'Settings':
@@ -132,12 +185,24 @@ class Settings:
             password=os.getenv('FAST_REACTION_API_PASSWORD', APIConfig.password),
             game_id=os.getenv('FAST_REACTION_GAME_ID', APIConfig.game_id),
             game_name=os.getenv('FAST_REACTION_GAME_NAME', APIConfig.game_name),
+            poll_fast_interval=float(os.getenv('FAST_REACTION_API_POLL_FAST_INTERVAL', APIConfig.poll_fast_interval)),
+            poll_idle_interval=float(os.getenv('FAST_REACTION_API_POLL_IDLE_INTERVAL', APIConfig.poll_idle_interval)),
+            poll_jitter=float(os.getenv('FAST_REACTION_API_POLL_JITTER', APIConfig.poll_jitter)),
+            conditional_requests=os.getenv('FAST_REACTION_API_CONDITIONAL_REQUESTS', 'true').lower() == 'true',
+            leaderboard_ttl=float(os.getenv('FAST_REACTION_API_LEADERBOARD_TTL', APIConfig.leaderboard_ttl)),
+            token_ttl=float(os.getenv('FAST_REACTION_API_TOKEN_TTL', APIConfig.token_ttl)),
+            token_refresh_margin=float(os.getenv('FAST_REACTION_API_TOKEN_REFRESH_MARGIN', APIConfig.token_refresh_margin)),
         )
         
         # Load game settings
         game_config = GameConfig(
             timer_value=int(os.getenv('FAST_REACTION_TIMER_VALUE', GameConfig.timer_value)),
             final_screen_timer=int(os.getenv('FAST_REACTION_FINAL_TIMER', GameConfig.final_screen_timer)),
+            runtime_settings_path=os.getenv('FAST_REACTION_RUNTIME_SETTINGS', GameConfig.runtime_settings_path),
+            score_outbox_path=os.getenv('FAST_REACTION_SCORE_OUTBOX', GameConfig.score_outbox_path),
+            score_retry_interval=float(os.getenv('FAST_REACTION_SCORE_RETRY_INTERVAL', GameConfig.score_retry_interval)),
+            score_retry_interval_max=float(os.getenv('FAST_REACTION_SCORE_RETRY_INTERVAL_MAX', GameConfig.score_retry_interval_max)),
+            score_max_attempts=int(os.getenv('FAST_REACTION_SCORE_MAX_ATTEMPTS', GameConfig.score_max_attempts)),
         )
         
         # Load UI settings
@@ -156,12 +221,36 @@ class Settings:
             auto_reconnect=os.getenv('FAST_REACTION_SERIAL_AUTO_RECONNECT', 'true').lower() == 'true',
             reconnect_interval=int(os.getenv('FAST_REACTION_SERIAL_RECONNECT_INTERVAL', SerialConfig.reconnect_interval)),
             max_reconnect_attempts=int(os.getenv('FAST_REACTION_SERIAL_MAX_RECONNECT_ATTEMPTS', SerialConfig.max_reconnect_attempts)),
+            read_mode=os.getenv('FAST_REACTION_SERIAL_READ_MODE', SerialConfig.read_mode).lower(),
+            framing=os.getenv('FAST_REACTION_SERIAL_FRAMING', SerialConfig.framing).lower(),
+            max_wake_latency_ms=int(os.getenv('FAST_REACTION_SERIAL_MAX_WAKE_LATENCY_MS', SerialConfig.max_wake_latency_ms)),
+            batch_events=os.getenv('FAST_REACTION_SERIAL_BATCH_EVENTS', 'true').lower() == 'true',
+            max_batch_size=int(os.getenv('FAST_REACTION_SERIAL_MAX_BATCH_SIZE', SerialConfig.max_batch_size)),
+            handshake_timeout_ms=int(os.getenv('FAST_REACTION_SERIAL_HANDSHAKE_TIMEOUT_MS', SerialConfig.handshake_timeout_ms)),
+            capture_enabled=os.getenv('FAST_REACTION_SERIAL_CAPTURE', 'false').lower() == 'true',
+            capture_dir=os.getenv('FAST_REACTION_SERIAL_CAPTURE_DIR', SerialConfig.capture_dir),
+            hotplug_detection=os.getenv('FAST_REACTION_SERIAL_HOTPLUG', 'true').lower() == 'true',
+            reconnect_backoff_max=int(os.getenv('FAST_REACTION_SERIAL_RECONNECT_BACKOFF_MAX', SerialConfig.reconnect_backoff_max)),
+            write_queue_size=int(os.getenv('FAST_REACTION_SERIAL_WRITE_QUEUE_SIZE', SerialConfig.write_queue_size)),
+            extra_ports=[p.strip() for p in os.getenv('FAST_REACTION_SERIAL_EXTRA_PORTS', '').split(',') if p.strip()],
         )
 
         # Load MQTT settings
         mqtt_config = MQTTConfig(
             broker=os.getenv('FAST_REACTION_MQTT_BROKER', MQTTConfig.broker),
             port=int(os.getenv('FAST_REACTION_MQTT_PORT', MQTTConfig.port)),
+            topic_prefix=os.getenv('FAST_REACTION_MQTT_TOPIC_PREFIX', MQTTConfig.topic_prefix),
+            topic_template=os.getenv('FAST_REACTION_MQTT_TOPIC_TEMPLATE', MQTTConfig.topic_template),
+            broadcast_topics=[t.strip() for t in os.getenv('FAST_REACTION_MQTT_BROADCAST_TOPICS', '').split(',') if t.strip()] or None,
+            data_flush_interval_ms=int(os.getenv('FAST_REACTION_MQTT_DATA_FLUSH_MS', MQTTConfig.data_flush_interval_ms)),
+            data_qos=int(os.getenv('FAST_REACTION_MQTT_DATA_QOS', MQTTConfig.data_qos)),
+            client_id=os.getenv('FAST_REACTION_MQTT_CLIENT_ID', MQTTConfig.client_id),
+            clean_session=os.getenv('FAST_REACTION_MQTT_CLEAN_SESSION', 'true').lower() == 'true',
+            keepalive=int(os.getenv('FAST_REACTION_MQTT_KEEPALIVE', MQTTConfig.keepalive)),
+            reconnect_delay_max=float(os.getenv('FAST_REACTION_MQTT_RECONNECT_DELAY_MAX', MQTTConfig.reconnect_delay_max)),
+            metrics_enabled=os.getenv('FAST_REACTION_MQTT_METRICS_ENABLED', 'true').lower() == 'true',
+            metrics_topic=os.getenv('FAST_REACTION_MQTT_METRICS_TOPIC', MQTTConfig.metrics_topic),
+            metrics_interval_s=float(os.getenv('FAST_REACTION_MQTT_METRICS_INTERVAL', MQTTConfig.metrics_interval_s)),
         )
 
         return cls(
@@ -169,7 +258,8 @@ class Settings:
             game=game_config,
             ui=ui_config,
             serial=serial_config,
-            mqtt=mqtt_config
+            mqtt=mqtt_config,
+            station_id=os.getenv('FAST_REACTION_STATION_ID', '').strip(),
         )
 
 
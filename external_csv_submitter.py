@@ -1,21 +1,23 @@
 #!/usr/bin/env python3
 """
-External CSV Submitter Script for FastReaction Game
-
-This script reads data from the CSV log files and submits scores to the API.
-Useful for:
-- Backup submissions
-- Re-processing failed submissions  
-- Data verification
-- Manual score corrections
+External Score Submitter for FastReaction Game
+
+Queries the local score outbox (utils/score_outbox.py) that the game writes every
+finished game to, and resubmits entries by hand. Useful for:
+- Checking which games are pending, sent or given up on
+- Re-processing failed submissions (e.g. after a long outage)
+- Data verification before a resubmission (--dry-run)
+
+Submissions carry the gameResultID as idempotency key, exactly like the game's own
+background sender, so running this next to the game is safe.
 """
 
-import csv
 import sys
 import os
 import argparse
+import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Optional
 
 # Add the current directory to Python path to import the API
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -24,6 +26,7 @@ try:
     from api.game_api import GameAPI
     from config import config
     from utils.logger import get_logger
+    from utils.score_outbox import ScoreOutbox, OutboxEntry, STATUS_FAILED, STATUS_PENDING, STATUS_SENT, is_retryable
 except ImportError as e:
     print(f"❌ Error importing required modules: {e}")
     print("Make sure you're running this script from the game3 directory")
@@ -32,356 +35,156 @@ except ImportError as e:
 # Setup logging
 logger = get_logger(__name__)
 
-class FastReactionCSVSubmitter:
-    """External script to submit FastReaction scores from CSV files"""
-    
-    def __init__(self):
-        """Initialize the CSV submitter"""
-        try:
-            self.api = GameAPI()
+
+def _format_time(timestamp: Optional[float]) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") if timestamp else "-"
+
+
+class FastReactionOutboxSubmitter:
+    """Lists and resubmits FastReaction scores from the score outbox"""
+
+    def __init__(self, outbox_path: Optional[str] = None):
+        self.outbox_path = outbox_path or config.settings.game.score_outbox_path
+        if not os.path.exists(self.outbox_path):
+            logger.warning(f"⚠️  Score outbox not found, creating an empty one: {self.outbox_path}")
+        self.outbox = ScoreOutbox(self.outbox_path)
+        self._api = None
+
+    @property
+    def api(self) -> GameAPI:
+        """GameAPI, created on first submission (listing works offline)"""
+        if self._api is None:
+            self._api = GameAPI()
             logger.info("✅ GameAPI initialized successfully")
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize GameAPI: {e}")
-            raise
-    
-    def read_submissions_csv(self, filename: str = "FastReaction_Pre_Submission_Backup.csv") -> List[Dict]:
-        """Read the submissions log CSV file"""
-        submissions = []
-        
-        if not os.path.exists(filename):
-            logger.error(f"❌ CSV file not found: {filename}")
-            return submissions
-        
-        try:
-            with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
-                # Try to detect if there's a header
-                first_line = csvfile.readline().strip()
-                csvfile.seek(0)
-                
-                # Check if first line looks like a header
-                has_header = 'timestamp' in first_line.lower()
-                
-                if has_header:
-                    reader = csv.DictReader(csvfile)
-                else:
-                    # Define headers manually if CSV doesn't have them
-                    fieldnames = ['timestamp', 'game_result_id', 'total_players', 'total_score', 
-                                'player_ids', 'individual_scores_json', 'status']
-                    reader = csv.DictReader(csvfile, fieldnames=fieldnames)
-                
-                for row in reader:
-                    if row['game_result_id']:  # Skip empty rows
-                        submissions.append(row)
-                        
-            logger.info(f"📊 Read {len(submissions)} submissions from {filename}")
-            return submissions
-            
-        except Exception as e:
-            logger.error(f"❌ Error reading CSV file {filename}: {e}")
-            return []
-    
-    def read_individual_players_csv(self, filename: str = "FastReaction_Individual_Players_Log.csv") -> Dict[str, List[Dict]]:
-        """Read player data from backup CSV with JSON field or individual players CSV"""
-        players_by_game = {}
-        
-        # First try to read from pre-submission backup (which has JSON data)
-        backup_filename = "FastReaction_Pre_Submission_Backup.csv"
-        if os.path.exists(backup_filename):
-            logger.info(f"📊 Reading player data from {backup_filename} (JSON format)")
-            players_by_game = self._read_players_from_backup(backup_filename)
-            if players_by_game:
-                return players_by_game
-        
-        # Fallback to individual players CSV
-        if not os.path.exists(filename):
-            logger.error(f"❌ CSV file not found: {filename}")
-            return players_by_game
-        
-        try:
-            with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
-                # Try to detect if there's a header
-                first_line = csvfile.readline().strip()
-                csvfile.seek(0)
-                
-                # Check if first line looks like a header
-                has_header = 'timestamp' in first_line.lower()
-                
-                if has_header:
-                    reader = csv.DictReader(csvfile)
-                else:
-                    # Define headers manually if CSV doesn't have them
-                    fieldnames = ['timestamp', 'game_result_id', 'user_id', 'node_id', 
-                                'individual_score', 'submission_success', 'status']
-                    reader = csv.DictReader(csvfile, fieldnames=fieldnames)
-                
-                for row in reader:
-                    if row['game_result_id']:  # Skip empty rows
-                        game_id = row['game_result_id']
-                        if game_id not in players_by_game:
-                            players_by_game[game_id] = []
-                        
-                        players_by_game[game_id].append({
-                            'userID': row['user_id'],
-                            'nodeID': int(row['node_id']) if row['node_id'].isdigit() else 1,
-                            'score': int(row['individual_score']) if row['individual_score'].isdigit() else 0
-                        })
-            
-            total_games = len(players_by_game)
-            total_players = sum(len(players) for players in players_by_game.values())
-            logger.info(f"👥 Read {total_players} player records from {total_games} games")
-            return players_by_game
-            
-        except Exception as e:
-            logger.error(f"❌ Error reading CSV file {filename}: {e}")
-            return {}
-    
-    def _read_players_from_backup(self, filename: str) -> Dict[str, List[Dict]]:
-        """Extract player data from the JSON field in backup CSV"""
-        players_by_game = {}
-        
-        try:
-            import json
-            with open(filename, 'r', newline='', encoding='utf-8') as csvfile:
-                # Try to detect if there's a header
-                first_line = csvfile.readline().strip()
-                csvfile.seek(0)
-                
-                # Check if first line looks like a header
-                has_header = 'timestamp' in first_line.lower()
-                
-                if has_header:
-                    reader = csv.DictReader(csvfile)
-                else:
-                    # Define headers manually if CSV doesn't have them
-                    fieldnames = ['timestamp', 'game_result_id', 'total_players', 'total_score', 
-                                'player_ids', 'individual_scores_json', 'status']
-                    reader = csv.DictReader(csvfile, fieldnames=fieldnames)
-                
-                for row in reader:
-                    if row['game_result_id'] and row.get('individual_scores_json'):
-                        # Only process pre_submission entries
-                        status = row.get('status', '').lower().strip()
-                        if status != 'saved_before_submission':
-                            logger.debug(f"⏭️  Skipping row with status: {status}")
-                            continue
-                            
-                        game_id = row['game_result_id']
-                        
-                        # Skip if we already processed this game (avoid duplicates)
-                        if game_id in players_by_game:
-                            logger.debug(f"⏭️  Game {game_id} already processed, skipping duplicate")
-                            continue
-                            
-                        try:
-                            # Parse the JSON data
-                            json_data = row['individual_scores_json']
-                            # Handle double quotes in CSV
-                            json_data = json_data.replace('""', '"')
-                            individual_scores = json.loads(json_data)
-                            
-                            players_by_game[game_id] = individual_scores
-                            logger.debug(f"📊 Extracted {len(individual_scores)} players for game {game_id} (pre_submission)")
-                            
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"⚠️  Error parsing JSON for game {game_id}: {e}")
-                            continue
-            
-            total_games = len(players_by_game)
-            total_players = sum(len(players) for players in players_by_game.values())
-            logger.info(f"👥 Extracted {total_players} player records from {total_games} games (from JSON)")
-            return players_by_game
-            
-        except Exception as e:
-            logger.error(f"❌ Error reading backup CSV file {filename}: {e}")
-            return {}
-    
-    def submit_from_csv(self, game_result_id: str = None, dry_run: bool = False, 
-                       force_resubmit: bool = False) -> bool:
-        """Submit FastReaction scores from CSV files"""
-        
+        return self._api
+
+    def select(self, game_result_id: str = None, force_resubmit: bool = False) -> List[OutboxEntry]:
+        """Entries to submit: one game, or everything not yet sent (sent ones too with force)"""
+        if game_result_id:
+            entry = self.outbox.get(game_result_id)
+            if entry is None:
+                logger.error(f"❌ Game {game_result_id} not found in the outbox")
+                return []
+            if entry.status == STATUS_SENT and not force_resubmit:
+                logger.info(f"⏭️  Game {game_result_id} was already sent at {_format_time(entry.sent_at)} (use --force)")
+                return []
+            return [entry]
+
+        statuses = (STATUS_PENDING, STATUS_FAILED, STATUS_SENT) if force_resubmit else (STATUS_PENDING, STATUS_FAILED)
+        return [entry for status in statuses for entry in self.outbox.entries(status)]
+
+    def submit_from_outbox(self, game_result_id: str = None, dry_run: bool = False,
+                           force_resubmit: bool = False) -> bool:
+        """Submit outbox entries now and record the outcome in the outbox"""
+
         logger.info("⚡" + "=" * 60)
-        logger.info("⚡ EXTERNAL FASTREACTION CSV SUBMITTER STARTED")
+        logger.info("⚡ EXTERNAL FASTREACTION SUBMITTER STARTED")
         logger.info("⚡" + "=" * 60)
-        
-        # Read CSV files
-        submissions = self.read_submissions_csv()
-        players_by_game = self.read_individual_players_csv()
-        
-        if not submissions:
-            logger.error("❌ No submissions found in CSV")
-            return False
-        
-        if not players_by_game:
-            logger.error("❌ No player data found in CSV")
-            return False
-        
+
+        entries = self.select(game_result_id, force_resubmit)
+        if not entries:
+            logger.info("✅ Nothing to submit")
+            return game_result_id is None
+
         success_count = 0
-        total_count = 0
-        
-        for submission in submissions:
-            total_count += 1
-            current_game_id = submission['game_result_id']
-            
-            # Filter by specific game_result_id if provided
-            if game_result_id and current_game_id != game_result_id:
-                continue
-            
-            # Check if this is a pre-submission entry that needs to be submitted
-            status = submission.get('status', '').lower().strip()
-            if status != 'saved_before_submission':
-                logger.debug(f"⏭️  Skipping {current_game_id} - status: {status} (not pre_submission)")
-                continue
-            
-            # Get player data for this game
-            if current_game_id not in players_by_game:
-                logger.warning(f"⚠️  No player data found for game {current_game_id}")
-                continue
-            
-            individual_scores = players_by_game[current_game_id]
-            
+        for entry in entries:
             logger.info("⚡" + "=" * 50)
-            logger.info(f"🎯 Processing FastReaction Team: {current_game_id}")
-            logger.info(f"👥 Players: {len(individual_scores)}")
-            logger.info(f"🏆 Total Score: {sum(score['score'] for score in individual_scores)}")
-            logger.info(f"📅 Original Timestamp: {submission.get('timestamp', 'Unknown')}")
-            logger.info(f"📊 Status: {submission.get('status', 'Unknown')}")
-            
-            # Log player details for verification
-            for i, score_data in enumerate(individual_scores):
-                logger.debug(f"   Player {i+1}: UserID={score_data.get('userID', 'Unknown')[:15]}... | "
-                           f"NodeID={score_data.get('nodeID', 'N/A')} | Score={score_data.get('score', 0)}")
-            
+            logger.info(f"🎯 Processing FastReaction Team: {entry.team_name or '-'} ({entry.game_result_id})")
+            logger.info(f"👥 Players: {len(entry.individual_scores)}")
+            logger.info(f"🏆 Total Score: {entry.total_score}")
+            logger.info(f"📅 Queued: {_format_time(entry.created_at)}")
+            logger.info(f"📊 Status: {entry.status} after {entry.attempts} attempts"
+                        + (f" (last error: {entry.last_error})" if entry.last_error else ""))
+
             if dry_run:
                 logger.info("🔍 DRY RUN - Would submit:")
-                for i, score_data in enumerate(individual_scores):
-                    logger.info(f"   {i+1}. UserID: {score_data['userID'][:15]}... | "
-                               f"NodeID: {score_data['nodeID']} | "
-                               f"Score: {score_data['score']}")
-                logger.info("✅ DRY RUN - Submission would be attempted")
+                for i, score_data in enumerate(entry.individual_scores):
+                    logger.info(f"   {i+1}. UserID: {str(score_data.get('userID', 'Unknown'))[:15]}... | "
+                               f"NodeID: {score_data.get('nodeID', 'N/A')} | "
+                               f"Score: {score_data.get('score', 0)}")
                 success_count += 1
                 continue
-            
-            # Actual submission
+
+            status = None
             try:
                 logger.info("🚀 Submitting FastReaction scores to API...")
-                success = self.api.submit_final_scores(current_game_id, individual_scores)
-                
-                if success:
-                    logger.info("✅ External FastReaction submission successful!")
-                    success_count += 1
-                    
-                    # Update CSV to mark as successfully submitted externally
-                    self._update_csv_status(current_game_id, True, "external_resubmission")
-                else:
-                    logger.error("❌ External FastReaction submission failed")
-                    self._update_csv_status(current_game_id, False, "external_failed")
-                    
+                status = self.api.submit_final_scores_status(entry.game_result_id, entry.individual_scores,
+                                                             idempotency_key=entry.idempotency_key)
             except Exception as e:
                 logger.error(f"💥 Exception during FastReaction submission: {e}")
-                self._update_csv_status(current_game_id, False, f"external_error: {str(e)}")
-        
+
+            if status is not None and 200 <= status < 300:
+                self.outbox.mark_sent(entry.game_result_id)
+                logger.info("✅ External FastReaction submission successful!")
+                success_count += 1
+            elif is_retryable(status):
+                # Pending again, due now: the game's sender keeps retrying it
+                self.outbox.mark_attempt_failed(entry.game_result_id, f"external resubmission: HTTP {status}", time.time())
+                logger.error("❌ External FastReaction submission failed, left pending for the game to retry")
+            else:
+                self.outbox.mark_attempt_failed(entry.game_result_id, f"external resubmission: HTTP {status}", None)
+                logger.error(f"❌ External FastReaction submission rejected (HTTP {status})")
+
         # Summary
         logger.info("⚡" + "=" * 60)
         logger.info("⚡ EXTERNAL FASTREACTION SUBMISSION SUMMARY")
         logger.info("⚡" + "=" * 60)
         logger.info(f"✅ Successful: {success_count}")
-        logger.info(f"❌ Failed: {total_count - success_count}")
-        logger.info(f"📊 Total Processed: {total_count}")
+        logger.info(f"❌ Failed: {len(entries) - success_count}")
+        logger.info(f"📊 Total Processed: {len(entries)}")
         logger.info("⚡" + "=" * 60)
-        
-        return success_count > 0
-    
-    def _update_csv_status(self, game_result_id: str, success: bool, method: str):
-        """Update CSV file with external submission status"""
-        try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            status_filename = "FastReaction_External_Submissions_Status.csv"
-            
-            # Check if file exists
-            file_exists = os.path.exists(status_filename)
-            
-            with open(status_filename, 'a', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ['timestamp', 'game_result_id', 'external_submission_success', 'method', 'notes']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                
-                if not file_exists:
-                    writer.writeheader()
-                
-                writer.writerow({
-                    'timestamp': timestamp,
-                    'game_result_id': game_result_id,
-                    'external_submission_success': success,
-                    'method': method,
-                    'notes': f"External FastReaction resubmission via CSV script"
-                })
-                
-            logger.debug(f"📝 Updated external status for {game_result_id}")
-            
-        except Exception as e:
-            logger.warning(f"⚠️  Error updating external status CSV: {e}")
-    
-    def list_available_games(self):
-        """List all FastReaction games available in CSV for submission"""
-        submissions = self.read_submissions_csv()
-        players_by_game = self.read_individual_players_csv()
-        
-        if not submissions:
-            logger.info("❌ No FastReaction games found in CSV files")
+
+        return success_count == len(entries)
+
+    def list_games(self, status: Optional[str] = None):
+        """List the games in the outbox"""
+        entries = self.outbox.entries(status)
+        if not entries:
+            logger.info(f"❌ No FastReaction games in {self.outbox_path}" + (f" with status '{status}'" if status else ""))
             return
-        
+
         logger.info("⚡" + "=" * 60)
-        logger.info("⚡ AVAILABLE FASTREACTION TEAMS/GAMES IN CSV")
+        logger.info(f"⚡ FASTREACTION GAMES IN {self.outbox_path}")
         logger.info("⚡" + "=" * 60)
-        
-        for submission in submissions:
-            game_id = submission['game_result_id']
-            timestamp = submission.get('timestamp', 'Unknown')
-            status = submission.get('status', 'Unknown')
-            total_score = submission.get('total_score', '0')
-            
-            player_count = len(players_by_game.get(game_id, []))
-            
-            # Only show pre_submission entries
-            if status.lower().strip() == 'saved_before_submission':
-                logger.info(f"⚡ FastReaction Team/Game ID: {game_id}")
-                logger.info(f"   📅 Timestamp: {timestamp}")
-                logger.info(f"   📊 Status: {status} ✅")
-                logger.info(f"   👥 Players: {player_count}")
-                logger.info(f"   🏆 Total Score: {total_score}")
-                logger.info("   " + "-" * 40)
-            else:
-                logger.debug(f"🔍 Skipping {game_id} - Status: {status} (not pre_submission)")
+        for entry in entries:
+            logger.info(f"⚡ {entry.team_name or '-'} ({entry.game_result_id})")
+            logger.info(f"   📅 Queued: {_format_time(entry.created_at)} | Sent: {_format_time(entry.sent_at)}")
+            logger.info(f"   📊 Status: {entry.status} | Attempts: {entry.attempts}"
+                        + (f" | Last error: {entry.last_error}" if entry.last_error else ""))
+            logger.info(f"   👥 Players: {len(entry.individual_scores)} | 🏆 Total Score: {entry.total_score}")
+            logger.info("   " + "-" * 40)
 
 def main():
     """Main function with command line interface"""
-    parser = argparse.ArgumentParser(description='Submit FastReaction game scores from CSV files')
+    parser = argparse.ArgumentParser(description='List and resubmit FastReaction game scores from the score outbox')
+    parser.add_argument('--outbox', type=str, help='Outbox database (default: GameConfig.score_outbox_path)')
     parser.add_argument('--game-id', type=str, help='Specific game result ID to submit')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be submitted without actually submitting')
     parser.add_argument('--force', action='store_true', help='Force resubmit even if already successful')
-    parser.add_argument('--list', action='store_true', help='List all available games in CSV')
-    
+    parser.add_argument('--list', action='store_true', help='List the games in the outbox')
+    parser.add_argument('--status', choices=[STATUS_PENDING, STATUS_SENT, STATUS_FAILED], help='Only list games with this status')
+
     args = parser.parse_args()
-    
+
     try:
-        submitter = FastReactionCSVSubmitter()
-        
+        submitter = FastReactionOutboxSubmitter(args.outbox)
+
         if args.list:
-            submitter.list_available_games()
+            submitter.list_games(args.status)
             return
-        
-        # Submit from CSV
-        success = submitter.submit_from_csv(
+
+        success = submitter.submit_from_outbox(
             game_result_id=args.game_id,
             dry_run=args.dry_run,
             force_resubmit=args.force
         )
-        
+
         if success:
-            logger.info("🎉 External FastReaction CSV submission completed successfully!")
+            logger.info("🎉 External FastReaction submission completed successfully!")
         else:
-            logger.error("❌ External FastReaction CSV submission failed")
+            logger.error("❌ External FastReaction submission failed")
             sys.exit(1)
-            
+
     except KeyboardInterrupt:
         logger.info("⚠️  Script interrupted by user")
         sys.exit(1)
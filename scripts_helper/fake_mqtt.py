@@ -0,0 +1,239 @@
+"""
+In-Process MQTT Broker Stand-in
+
+A tiny broker plus paho-compatible clients that exchange messages through in-memory
+queues, so MqttThread can be exercised and benchmarked without a Mosquitto install.
+It covers the part of the paho 2.x API the app uses: VERSION2 callbacks, connect(),
+loop(timeout), subscribe()/unsubscribe() (with + and # wildcards), publish() and
+disconnect(), plus persistent sessions for clean_session=False clients.
+
+Not covered: retained messages, QoS 2 handshakes, wills and the network itself.
+
+Usage:
+    broker = FakeBroker()
+    thread = app.MqttThread(client_factory=broker.client_factory)
+    publisher = broker.client("load-generator")
+    publisher.connect("localhost")
+    publisher.publish("FastReaction/game/start", "1")
+"""
+
+import collections
+import itertools
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+# paho.mqtt.client return codes
+MQTT_ERR_SUCCESS = 0
+MQTT_ERR_NO_CONN = 4
+MQTT_ERR_CONN_LOST = 7
+
+
+class ConnectFlags(NamedTuple):
+    session_present: bool
+
+
+class PublishInfo(NamedTuple):
+    rc: int
+    mid: int
+
+
+class FakeMessage(NamedTuple):
+    """Same attributes as paho's MQTTMessage"""
+    topic: str
+    payload: bytes
+    qos: int = 0
+    retain: bool = False
+    mid: int = 0
+    dup: bool = False
+
+
+def topic_matches(subscription: str, topic: str) -> bool:
+    """MQTT filter matching (+ one level, # the rest), like paho's topic_matches_sub"""
+    sub_levels = subscription.split("/")
+    topic_levels = topic.split("/")
+    for index, level in enumerate(sub_levels):
+        if level == "#":
+            return True
+        if index >= len(topic_levels):
+            return False
+        if level != "+" and level != topic_levels[index]:
+            return False
+    return len(sub_levels) == len(topic_levels)
+
+
+class FakeBroker:
+    """Routes publishes to subscribed clients; all state lives in this object"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._clients: Dict[str, "FakeMqttClient"] = {}  # client id -> connected client
+        self._sessions: Dict[str, Dict[str, int]] = {}   # client id -> subscriptions kept across connects
+        self._anonymous_ids = itertools.count(1)
+        self.accepting = True  # False: connect() is refused, as if the broker were down
+        self.published = 0
+
+    def client(self, client_id: str = "", clean_session: bool = True) -> "FakeMqttClient":
+        return FakeMqttClient(self, client_id, clean_session)
+
+    def client_factory(self, client_id: str = "", clean_session: bool = True, **kwargs) -> "FakeMqttClient":
+        """Pass as MqttThread(client_factory=broker.client_factory)"""
+        return self.client(client_id, clean_session)
+
+    def drop_clients(self):
+        """Close every connection, as a broker restart would"""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client._connection_lost()
+
+    def _connect(self, client: "FakeMqttClient") -> Tuple[str, Dict[str, int], bool]:
+        if not self.accepting:
+            raise ConnectionRefusedError("Fake broker is not accepting connections")
+        with self._lock:
+            client_id = client.client_id or f"fake-{next(self._anonymous_ids)}"
+            previous = self._clients.get(client_id)
+            if client.clean_session:
+                self._sessions.pop(client_id, None)
+                subscriptions, session_present = {}, False
+            else:
+                session_present = client_id in self._sessions
+                subscriptions = self._sessions.setdefault(client_id, {})
+            self._clients[client_id] = client
+        if previous is not None and previous is not client:
+            previous._connection_lost()  # Same id takes over the session
+        return client_id, subscriptions, session_present
+
+    def _disconnect(self, client: "FakeMqttClient"):
+        with self._lock:
+            if self._clients.get(client._session_id) is client:
+                del self._clients[client._session_id]
+
+    def _route(self, topic: str, payload: bytes, qos: int, retain: bool):
+        with self._lock:
+            self.published += 1
+            targets = []
+            for client in self._clients.values():
+                granted = [sub_qos for sub, sub_qos in client._subscriptions.items() if topic_matches(sub, topic)]
+                if granted:
+                    targets.append((client, min(qos, max(granted))))
+        for client, delivered_qos in targets:
+            client._deliver(topic, payload, delivered_qos, retain)
+
+
+class FakeMqttClient:
+    """paho.mqtt.client.Client look-alike (VERSION2 callbacks) connected to a FakeBroker"""
+
+    def __init__(self, broker: FakeBroker, client_id: str = "", clean_session: bool = True):
+        self.broker = broker
+        self.client_id = client_id
+        self.clean_session = clean_session
+        self.on_connect = None
+        self.on_disconnect = None
+        self.on_message = None
+        self.userdata = None
+
+        self._session_id: Optional[str] = None
+        self._subscriptions: Dict[str, int] = {}
+        self._inbox = collections.deque()
+        self._events = []  # Callbacks (connect/disconnect) waiting to run on the loop thread
+        self._condition = threading.Condition()
+        self._connected = False
+        self._mids = itertools.count(1)
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def connect(self, host: str = "localhost", port: int = 1883, keepalive: int = 60, **kwargs) -> int:
+        session_id, subscriptions, session_present = self.broker._connect(self)
+        with self._condition:
+            self._session_id = session_id
+            self._subscriptions = subscriptions
+            self._connected = True
+            self._events.append(("connect", ConnectFlags(session_present)))
+            self._condition.notify_all()
+        return MQTT_ERR_SUCCESS
+
+    def disconnect(self, *args, **kwargs) -> int:
+        if not self._connected:
+            return MQTT_ERR_NO_CONN
+        self.broker._disconnect(self)
+        self._close("disconnect", MQTT_ERR_SUCCESS)
+        return MQTT_ERR_SUCCESS
+
+    def loop(self, timeout: float = 1.0) -> int:
+        """Run pending callbacks, waiting up to timeout for something to arrive"""
+        with self._condition:
+            if not self._inbox and not self._events:
+                if not self._connected:
+                    return MQTT_ERR_NO_CONN
+                self._condition.wait(timeout)
+            events, self._events = self._events, []
+            messages = list(self._inbox)
+            self._inbox.clear()
+
+        rc = MQTT_ERR_SUCCESS
+        for kind, value in events:
+            if kind == "connect" and self.on_connect:
+                self.on_connect(self, self.userdata, value, 0, None)
+        for message in messages:
+            if self.on_message:
+                self.on_message(self, self.userdata, message)
+        for kind, value in events:
+            if kind in ("disconnect", "lost"):
+                if self.on_disconnect:
+                    self.on_disconnect(self, self.userdata, None, value, None)
+                if kind == "lost":
+                    rc = MQTT_ERR_CONN_LOST
+        if rc == MQTT_ERR_SUCCESS and not self._connected:
+            rc = MQTT_ERR_NO_CONN
+        return rc
+
+    def loop_forever(self, *args, **kwargs):
+        while self.loop(1.0) == MQTT_ERR_SUCCESS:
+            pass
+
+    def subscribe(self, topic: Union[str, List[Tuple[str, int]]], qos: int = 0):
+        topics = topic if isinstance(topic, list) else [(topic, qos)]
+        with self.broker._lock:
+            for name, topic_qos in topics:
+                self._subscriptions[name] = topic_qos
+        return MQTT_ERR_SUCCESS if self._connected else MQTT_ERR_NO_CONN, next(self._mids)
+
+    def unsubscribe(self, topic: Union[str, List[str]]):
+        topics = topic if isinstance(topic, list) else [topic]
+        with self.broker._lock:
+            for name in topics:
+                self._subscriptions.pop(name, None)
+        return MQTT_ERR_SUCCESS if self._connected else MQTT_ERR_NO_CONN, next(self._mids)
+
+    def publish(self, topic: str, payload=None, qos: int = 0, retain: bool = False, **kwargs) -> PublishInfo:
+        mid = next(self._mids)
+        if not self._connected:
+            return PublishInfo(MQTT_ERR_NO_CONN, mid)
+        if payload is None:
+            payload = b""
+        elif isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        elif not isinstance(payload, (bytes, bytearray)):
+            payload = str(payload).encode("utf-8")
+        self.broker._route(topic, bytes(payload), qos, retain)
+        return PublishInfo(MQTT_ERR_SUCCESS, mid)
+
+    def _deliver(self, topic: str, payload: bytes, qos: int, retain: bool):
+        with self._condition:
+            if not self._connected:
+                return
+            self._inbox.append(FakeMessage(topic, payload, qos, retain, next(self._mids) if qos else 0))
+            self._condition.notify_all()
+
+    def _connection_lost(self):
+        self._close("lost", MQTT_ERR_CONN_LOST)
+
+    def _close(self, kind: str, rc: int):
+        with self._condition:
+            self._connected = False
+            if self.clean_session:
+                self._subscriptions = {}
+            self._events.append((kind, rc))
+            self._condition.notify_all()
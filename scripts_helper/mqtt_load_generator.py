@@ -0,0 +1,196 @@
+"""
+MQTT Control-Plane Load Generator (offline)
+
+Runs the app's MqttThread against the in-process broker from fake_mqtt.py and fires
+FastReaction/game/* control topics and panel data topics at configurable rates, then
+reports publish -> Qt slot latency for start_signal, stop_signal and deactivate_signal.
+No Mosquitto install or network is needed, so it runs the same on CI and dev machines.
+
+Control messages go out round-robin (start, stop, Deactivate); data messages are
+published continuously and only reach the app between a start and the next stop,
+like on a real station.
+
+Usage:
+    python scripts_helper/mqtt_load_generator.py --app Fast_Reaction_V2.1.5.py --control-rate 50 --data-rate 500 --duration 10
+"""
+
+import argparse
+import collections
+import itertools
+import os
+import sys
+import threading
+import time
+
+from fake_mqtt import FakeBroker
+# Also configures headless Qt / audio before PyQt5 is imported
+from serial_latency_benchmark import REPO_ROOT, load_app_module, percentiles_ms
+
+# (signal name, topic, payload) in the order they are published
+CONTROL_CYCLE = (
+    ('start_signal', "FastReaction/game/start", "1"),
+    ('stop_signal', "FastReaction/game/stop", "0"),
+    ('deactivate_signal', "FastReaction/game/Deactivate", "1"),
+)
+
+
+class LoadGenerator:
+    """Publishes control and data messages from its own thread, stamping each control publish"""
+
+    def __init__(self, publisher, mqtt_thread, control_rate: float, data_rate: float, data_lines: int):
+        self.publisher = publisher
+        self.control = [(name, mqtt_thread.topic(topic), payload) for name, topic, payload in CONTROL_CYCLE]
+        self.data_topics = list(mqtt_thread.data_topics)
+        self.control_rate = control_rate
+        self.data_rate = data_rate
+        self.data_lines = max(1, data_lines)
+        # Signal name -> publish times not yet matched by a delivery (messages arrive in order)
+        self.sent_ns = {name: collections.deque() for name, _, _ in CONTROL_CYCLE}
+        self.control_sent = 0
+        self.data_sent = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, duration: float):
+        self._thread = threading.Thread(target=self._run, args=(duration,), daemon=True)
+        self._thread.start()
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stop(self):
+        self._stop.set()
+
+    def take_sent(self, name: str):
+        """Publish time of the oldest unmatched message for a signal"""
+        with self._lock:
+            pending = self.sent_ns[name]
+            return pending.popleft() if pending else None
+
+    def _run(self, duration: float):
+        control_interval = 1.0 / self.control_rate if self.control_rate > 0 else None
+        data_interval = 1.0 / self.data_rate if self.data_rate > 0 else None
+        control_cycle = itertools.cycle(self.control)
+        seq = itertools.count(1)
+        now = time.monotonic()
+        end = now + duration
+        next_control = now if control_interval else float("inf")
+        next_data = now if data_interval and self.data_topics else float("inf")
+
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now >= end:
+                break
+            if now >= next_control:
+                name, topic, payload = next(control_cycle)
+                with self._lock:
+                    self.sent_ns[name].append(time.monotonic_ns())
+                self.publisher.publish(topic, payload, qos=1)
+                self.control_sent += 1
+                next_control += control_interval
+            if now >= next_data:
+                topic = self.data_topics[self.data_sent % len(self.data_topics)]
+                payload = "\n".join(f"{next(seq)}:Crct" for _ in range(self.data_lines))
+                self.publisher.publish(topic, payload, qos=1)
+                self.data_sent += 1
+                next_data += data_interval
+            delay = min(next_control, next_data, end) - time.monotonic()
+            if delay > 0:
+                self._stop.wait(delay)
+
+
+def run_load(app_file: str, control_rate: float, data_rate: float, data_lines: int,
+             duration: float, settle_ms: int) -> dict:
+    os.chdir(REPO_ROOT)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+
+    qt_app = QApplication.instance() or QApplication(sys.argv)
+    app = load_app_module(app_file)
+    broker = FakeBroker()
+
+    mqtt_thread = app.MqttThread(client_factory=broker.client_factory)
+    mqtt_thread.start()
+    deadline = time.monotonic() + 5
+    while not mqtt_thread.connected and time.monotonic() < deadline:
+        qt_app.processEvents()
+        time.sleep(0.01)
+    if not mqtt_thread.connected:
+        raise RuntimeError("MqttThread did not connect to the in-process broker")
+
+    publisher = broker.client("fast-reaction-load-generator")
+    publisher.connect("localhost")
+    generator = LoadGenerator(publisher, mqtt_thread, control_rate, data_rate, data_lines)
+
+    latency = {name: [] for name, _, _ in CONTROL_CYCLE}
+    data_events = [0]
+
+    def on_signal(name):
+        def slot():
+            received = time.monotonic_ns()
+            sent = generator.take_sent(name)
+            if sent is not None:
+                latency[name].append(received - sent)
+        return slot
+
+    # Slots live on the main thread, so every emission crosses into the Qt event loop like the UI's do
+    for name in latency:
+        getattr(mqtt_thread, name).connect(on_signal(name))
+    mqtt_thread.events_batch_received.connect(lambda events: data_events.__setitem__(0, data_events[0] + len(events)))
+
+    generator.start(duration)
+
+    def check_done():
+        if not generator.is_alive():
+            QTimer.singleShot(settle_ms, qt_app.quit)
+        else:
+            QTimer.singleShot(50, check_done)
+
+    QTimer.singleShot(0, check_done)
+    started = time.monotonic()
+    qt_app.exec_()
+    elapsed = time.monotonic() - started
+
+    generator.stop()
+    publisher.disconnect()
+    mqtt_thread.stop()
+
+    results = {f"publish -> {name}": percentiles_ms(samples) for name, samples in latency.items()}
+    summary = {
+        'elapsed_s': elapsed,
+        'control_sent': generator.control_sent,
+        'data_sent': generator.data_sent,
+        'data_events_received': data_events[0],
+        'broker_messages': broker.published,
+    }
+    return {'latency': results, 'summary': summary}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline MQTT control-plane load test against MqttThread")
+    parser.add_argument('--app', default='Fast_Reaction_V2.1.5.py', help='App file to load MqttThread from')
+    parser.add_argument('--control-rate', type=float, default=30.0, help='Control messages per second (round-robin)')
+    parser.add_argument('--data-rate', type=float, default=200.0, help='Data-topic messages per second (0 = none)')
+    parser.add_argument('--data-lines', type=int, default=1, help='Panel lines per data message')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds to generate load')
+    parser.add_argument('--settle-ms', type=int, default=500, help='Time to keep the event loop running afterwards')
+    args = parser.parse_args()
+
+    print(f"--- MQTT Load: {args.app} @ {args.control_rate:g} control/s + {args.data_rate:g} data/s "
+          f"x {args.duration:g}s ---")
+    results = run_load(args.app, args.control_rate, args.data_rate, args.data_lines, args.duration, args.settle_ms)
+
+    print(f"{'path':<32}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in results['latency'].items():
+        print(f"{name:<32}{stats['n']:>6}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}{stats['max']:>10.2f}")
+    summary = results['summary']
+    print(f"sent {summary['control_sent']} control / {summary['data_sent']} data messages in "
+          f"{summary['elapsed_s']:.1f}s; {summary['data_events_received']} data events reached the UI thread")
+
+
+if __name__ == "__main__":
+    main()
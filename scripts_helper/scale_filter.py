@@ -0,0 +1,242 @@
+"""
+Scale Stability Filter
+
+Keeps the most recent ST1 weights in a NumPy ring buffer and decides from the data
+itself whether the load has settled, instead of trusting only the ST/US flag.
+Consumers subscribe to a debounced "stable weight" event, which fires once per
+settled load rather than once per reading.
+
+Usage:
+    python scripts_helper/scale_filter.py /dev/ttyUSB0 --window 10 --tolerance 0.005
+"""
+
+import argparse
+import time
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class StableWeight(NamedTuple):
+    """Published when the load settles on a new value"""
+    value: float       # Mean of the stability window
+    std: float         # Standard deviation over the window
+    unit: Optional[str]
+    samples: int       # Readings in the window
+    timestamp: float   # time.monotonic() when the value settled
+
+
+class WeightRingBuffer:
+    """Fixed-size history of weights; all statistics are computed with NumPy, never per sample in Python"""
+
+    def __init__(self, capacity: int = 256):
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+        self._data = np.zeros(capacity, dtype=np.float64)
+        self._next = 0    # Slot the next value goes into
+        self._count = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._data.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
+
+    def push(self, value: float):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self._data.size
+        self._count = min(self._count + 1, self._data.size)
+
+    def extend(self, values: Iterable[float]):
+        """Append many values with one vectorized copy"""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        capacity = self._data.size
+        if values.size >= capacity:
+            values = values[-capacity:]
+        count = values.size
+        if not count:
+            return
+        end = self._next + count
+        if end <= capacity:
+            self._data[self._next:end] = values
+        else:
+            split = capacity - self._next
+            self._data[self._next:] = values[:split]
+            self._data[:count - split] = values[split:]
+        self._next = end % capacity
+        self._count = min(self._count + count, capacity)
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """Return the last n values (all by default), oldest first"""
+        n = self._count if n is None else min(n, self._count)
+        if n <= 0:
+            return self._data[:0]
+        start = self._next - n
+        if start >= 0:
+            return self._data[start:self._next]
+        return np.concatenate((self._data[start:], self._data[:self._next]))
+
+    def window_stats(self, n: int) -> Tuple[float, float, float]:
+        """Mean, variance and range (max - min) of the last n values"""
+        window = self.latest(n)
+        if not window.size:
+            return float("nan"), float("nan"), float("nan")
+        return float(window.mean()), float(window.var()), float(np.ptp(window))
+
+    def rolling_stats(self, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rolling mean and variance over the whole history, one entry per complete window
+
+        Uses cumulative sums, so the cost is O(history) regardless of the window size.
+        """
+        values = self.latest()
+        if window <= 0 or values.size < window:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty
+        # Centre on the mean first to keep the variance numerically stable
+        centred = values - values.mean()
+        sums = np.concatenate(([0.0], np.cumsum(centred)))
+        squares = np.concatenate(([0.0], np.cumsum(centred * centred)))
+        window_sums = sums[window:] - sums[:-window]
+        window_squares = squares[window:] - squares[:-window]
+        means = window_sums / window
+        variances = np.maximum(window_squares / window - means * means, 0.0)
+        return means + values.mean(), variances
+
+
+class StabilityFilter:
+    """
+    Turn a stream of raw weights into debounced stable-weight events
+
+    The load counts as stable when the last `window` readings have a standard
+    deviation of at most `tolerance` and span no more than `max_range` (defaults to
+    3 * tolerance). An event is published when the load becomes stable, and again
+    only if the settled value moves by more than `resolution` - a load that sits on
+    the scale produces exactly one event.
+
+    With `require_device_stable`, format 1 readings flagged US/OL by the scale are
+    also treated as unstable; by default the decision comes from the data alone.
+    """
+
+    def __init__(self, window: int = 10, tolerance: float = 0.005, max_range: Optional[float] = None,
+                 resolution: float = 0.01, capacity: int = 256, require_device_stable: bool = False):
+        if window < 2:
+            raise ValueError("window must be at least 2 readings")
+        self.window = window
+        self.tolerance = tolerance
+        self.max_range = 3 * tolerance if max_range is None else max_range
+        self.resolution = resolution
+        self.require_device_stable = require_device_stable
+        self.buffer = WeightRingBuffer(max(capacity, window))
+
+        self.unit: Optional[str] = None
+        self.is_stable = False
+        self.last_published: Optional[StableWeight] = None
+        self._device_unstable = False
+        self._subscribers: List[Callable[[StableWeight], None]] = []
+
+    def subscribe(self, callback: Callable[[StableWeight], None]):
+        """Call callback(StableWeight) for every published stable weight"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[StableWeight], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def reset(self):
+        """Forget the history, e.g. after the scale is tared"""
+        self.buffer.clear()
+        self.is_stable = False
+        self.last_published = None
+        self._device_unstable = False
+
+    def update(self, value: float, unit: Optional[str] = None, status: Optional[str] = None) -> Optional[StableWeight]:
+        """Add one reading; returns the event if this reading published one"""
+        self.buffer.push(value)
+        if unit:
+            self.unit = unit
+        if status is not None:
+            self._device_unstable = status != "ST"
+        return self._evaluate()
+
+    def update_many(self, values: Iterable[float], unit: Optional[str] = None,
+                    status: Optional[str] = None) -> Optional[StableWeight]:
+        """Add a burst of readings and evaluate once (status applies to the latest reading)"""
+        self.buffer.extend(values)
+        if unit:
+            self.unit = unit
+        if status is not None:
+            self._device_unstable = status != "ST"
+        return self._evaluate()
+
+    def update_from_reading(self, reading) -> Optional[StableWeight]:
+        """Add a WeightReading from ST1StreamParser / ST1Scale.stream()"""
+        return self.update(reading.value, reading.unit, reading.status)
+
+    def _evaluate(self) -> Optional[StableWeight]:
+        if len(self.buffer) < self.window:
+            return None
+        mean, variance, spread = self.buffer.window_stats(self.window)
+        std = variance ** 0.5
+        stable = std <= self.tolerance and spread <= self.max_range
+        if self.require_device_stable and self._device_unstable:
+            stable = False
+
+        self.is_stable = stable
+        if not stable:
+            return None
+
+        last = self.last_published
+        if last is not None and abs(mean - last.value) <= self.resolution:
+            # Still (or again, after a brief wobble) on the value already published
+            return None
+
+        event = StableWeight(mean, std, self.unit, self.window, time.monotonic())
+        self.last_published = event
+        for callback in list(self._subscribers):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Stable weight subscriber failed: {e}")
+        return event
+
+
+def main():
+    from serial_class_recieverFromScale import ST1Scale, WeightReading
+
+    parser = argparse.ArgumentParser(description="Print debounced stable weights from an ST1 scale")
+    parser.add_argument('port', help='Serial port of the scale')
+    parser.add_argument('--baudrate', type=int, default=9600)
+    parser.add_argument('--window', type=int, default=10, help='Readings that must agree')
+    parser.add_argument('--tolerance', type=float, default=0.005, help='Max standard deviation of a stable window')
+    parser.add_argument('--resolution', type=float, default=0.01, help='Min change that publishes a new value')
+    parser.add_argument('--require-device-stable', action='store_true', help='Also require the ST flag (format 1)')
+    args = parser.parse_args()
+
+    stability = StabilityFilter(window=args.window, tolerance=args.tolerance, resolution=args.resolution,
+                                require_device_stable=args.require_device_stable)
+    stability.subscribe(lambda event: print(f"Stable: {event.value:.3f}{event.unit or ''} (std {event.std:.4f})"))
+
+    scale = ST1Scale(port=args.port, baudrate=args.baudrate, timeout=1)
+    if not scale.connect():
+        return
+    readings = 0
+    try:
+        for record in scale.stream():
+            if isinstance(record, WeightReading):
+                readings += 1
+                stability.update_from_reading(record)
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        scale.disconnect()
+        print(f"{readings} readings processed")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,195 @@
 import serial
 import time
 import re
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+# --- Precompiled line patterns, one per line shape in the ST1 manual ---
+# Format 1: "ST, GS, + 1.000kg"
+_FORMAT1_LINE = re.compile(r'^(ST|US|OL)\s*,\s*(GS|NT)\s*,\s*([+\-])\s*(\d+(?:\.\d+)?)\s*([A-Za-z]+)$')
+# Format 2: "+ 1.000kg"
+_FORMAT2_LINE = re.compile(r'^([+\-])\s*(\d+(?:\.\d+)?)\s*([A-Za-z]+)$')
+# Format 3: "S/N   WT/kg", "0001  2.205", "TOTAL"
+_FORMAT3_HEADER = re.compile(r'^S/N\s+WT/?(\w*)$', re.IGNORECASE)
+_FORMAT3_ROW = re.compile(r'^(\d+)\s+(\d+(?:\.\d+)?)$')
+_FORMAT3_TOTAL = re.compile(r'^TOTAL$', re.IGNORECASE)
+# Format 4 (tickets): "TICKET NO. 0001", "G    5.000kg", "T    1.000kg", "N    4.000kg",
+# then totals: "TOTAL NUMBER", "OF TICKETS 12", "TOTAL NET", "48.000"
+_FORMAT4_TICKET = re.compile(r'^TICKET\s+NO\.?\s*(\d+)$', re.IGNORECASE)
+_FORMAT4_WEIGHT = re.compile(r'^([GTN])\s+(\d+(?:\.\d+)?)\s*([A-Za-z]+)$', re.IGNORECASE)
+_FORMAT4_COUNT_HEADER = re.compile(r'^TOTAL\s+NUMBER$', re.IGNORECASE)
+_FORMAT4_COUNT = re.compile(r'^OF\s+TICKETS\s+(\d+)$', re.IGNORECASE)
+_FORMAT4_NET_HEADER = re.compile(r'^TOTAL\s+NET$', re.IGNORECASE)
+_FORMAT4_NET_VALUE = re.compile(r'^(\d+\.\d+)$')
+
+# Used by the per-format _parse_formatN helpers
+_SIGNED_WEIGHT = re.compile(r'([+\-])\s*(\d+\.\d+)\s*(\w+)')
+_UNSIGNED_WEIGHT = re.compile(r'(\d+\.\d+)\s*(\w+)')
+_INTEGER = re.compile(r'\d+')
+_WHITESPACE = re.compile(r'\s+')
+_DECIMAL = re.compile(r'^\d+(\.\d+)?$')
+_FLOAT_ONLY = re.compile(r'^\s*\d+\.\d+\s*$')
+
+
+class WeightReading(NamedTuple):
+    """A single weight (formats 1 and 2)"""
+    format: int
+    value: float
+    unit: str
+    status: Optional[str] = None       # "ST" stable, "US" unstable, "OL" overload (format 1 only)
+    weight_type: Optional[str] = None  # "GS" gross, "NT" net (format 1 only)
+    raw: str = ""
+
+
+class WeighedItem(NamedTuple):
+    """One numbered row of a format 3 accumulation printout"""
+    serial_no: int
+    weight: float
+    unit: Optional[str]
+    raw: str = ""
+
+
+class Ticket(NamedTuple):
+    """A complete format 4 ticket, emitted once its net line arrives"""
+    ticket_no: Optional[int]
+    gross: Optional[float]
+    tare: Optional[float]
+    net: float
+    unit: str
+
+
+class Totals(NamedTuple):
+    """Totals block of a format 3 printout or format 4 ticket run"""
+    format: int
+    count: Optional[int]
+    weight: Optional[float]
+    raw: str = ""
+
+
+ScaleRecord = Union[WeightReading, WeighedItem, Ticket, Totals]
+
+
+class ST1StreamParser:
+    """
+    Incremental parser for everything the ST1 sends, whatever its UF-6 format setting.
+
+    Feed it raw bytes as they arrive; it splits CR LF lines itself, recognises the
+    format from each line's shape and keeps the state multi-line output needs
+    (the row after "TOTAL" in format 3, the G/T/N lines and totals of format 4).
+    Lines that belong to no known format are skipped.
+
+    `detected_format` holds the format of the last recognised line (None until then).
+    """
+
+    def __init__(self):
+        self._buffer = b""
+        self.detected_format: Optional[int] = None
+        self._unit = None             # Format 3 header unit ("S/N   WT/kg")
+        self._expect_total = False    # Format 3: next row is the total, not an item
+        self._ticket = [None, None, None, None]  # Format 4: ticket no., gross, tare, unit
+        self._ticket_count = None     # Format 4: "OF TICKETS n", until its net total arrives
+        self._expect_net_total = False
+
+    def feed(self, data: bytes) -> Iterator[ScaleRecord]:
+        """Yield the records completed by data; a partial line is kept for the next call"""
+        lines = (self._buffer + data).split(b"\n")
+        self._buffer = lines.pop()[-256:]
+        for raw in lines:
+            line = raw.decode('ascii', errors='ignore').strip()
+            if line:
+                record = self.parse_line(line)
+                if record is not None:
+                    yield record
+
+    def parse_lines(self, lines: Iterable[str]) -> Iterator[ScaleRecord]:
+        """Yield the records of already-split lines"""
+        for line in lines:
+            record = self.parse_line(line.strip())
+            if record is not None:
+                yield record
+
+    def parse_line(self, line: str) -> Optional[ScaleRecord]:
+        """Parse one stripped line; returns a record, or None for headers and unknown lines"""
+        match = _FORMAT1_LINE.match(line)
+        if match:
+            status, weight_type, sign, number, unit = match.groups()
+            self.detected_format = 1
+            return WeightReading(1, float(sign + number), unit, status, weight_type, line)
+
+        match = _FORMAT2_LINE.match(line)
+        if match:
+            sign, number, unit = match.groups()
+            self.detected_format = 2
+            return WeightReading(2, float(sign + number), unit, raw=line)
+
+        match = _FORMAT3_ROW.match(line)
+        if match:
+            self.detected_format = 3
+            first, second = int(match.group(1)), float(match.group(2))
+            if self._expect_total:
+                self._expect_total = False
+                return Totals(3, first, second, line)
+            return WeighedItem(first, second, self._unit, line)
+
+        match = _FORMAT4_WEIGHT.match(line)
+        if match:
+            return self._ticket_line(match.group(1).upper(), float(match.group(2)), match.group(3))
+
+        if _FORMAT3_TOTAL.match(line):
+            self.detected_format = 3
+            self._expect_total = True
+            return None
+
+        match = _FORMAT3_HEADER.match(line)
+        if match:
+            self.detected_format = 3
+            self._unit = match.group(1) or None
+            self._expect_total = False
+            return None
+
+        match = _FORMAT4_TICKET.match(line)
+        if match:
+            self.detected_format = 4
+            self._ticket = [int(match.group(1)), None, None, None]
+            return None
+
+        if _FORMAT4_COUNT_HEADER.match(line):
+            self.detected_format = 4
+            return None
+
+        match = _FORMAT4_COUNT.match(line)
+        if match:
+            self.detected_format = 4
+            self._ticket_count = int(match.group(1))
+            return None
+
+        if _FORMAT4_NET_HEADER.match(line):
+            self.detected_format = 4
+            self._expect_net_total = True
+            return None
+
+        match = _FORMAT4_NET_VALUE.match(line)
+        if match and self._expect_net_total:
+            totals = Totals(4, self._ticket_count, float(match.group(1)), line)
+            self._ticket_count = None
+            self._expect_net_total = False
+            return totals
+
+        return None
+
+    def _ticket_line(self, code: str, value: float, unit: str) -> Optional[Ticket]:
+        """Collect G/T lines of a ticket; the N (net) line completes it"""
+        self.detected_format = 4
+        ticket = self._ticket
+        ticket[3] = unit
+        if code == "G":
+            ticket[1] = value
+            return None
+        if code == "T":
+            ticket[2] = value
+            return None
+        self._ticket = [None, None, None, None]
+        return Ticket(ticket[0], ticket[1], ticket[2], value, unit)
+
 
 class ST1Scale:
     """
@@ -34,6 +223,7 @@ class ST1Scale:
         self.serial_connection.timeout = self.timeout
         
         self.is_connected = False
+        self.parser = ST1StreamParser()
 
     def connect(self) -> bool:
         """
@@ -85,6 +275,28 @@ class ST1Scale:
             self.disconnect()
             return None
 
+    def stream(self, chunk_size: int = 4096) -> Iterator[ScaleRecord]:
+        """
+        Yield parsed records for as long as the port stays open, detecting the format
+        automatically. Reads whatever is buffered in one call (at least one byte,
+        waiting up to `timeout`), so a continuous 115200 baud stream is parsed in one pass.
+
+        Example:
+            for record in scale.stream():
+                if isinstance(record, WeightReading) and record.status == "ST":
+                    print(record.value, record.unit)
+        """
+        while self.is_connected:
+            try:
+                waiting = self.serial_connection.in_waiting
+                chunk = self.serial_connection.read(min(max(waiting, 1), chunk_size))
+            except serial.SerialException as e:
+                print(f"Serial communication error: {e}")
+                self.disconnect()
+                return
+            if chunk:
+                yield from self.parser.feed(chunk)
+
     def _parse_format1(self, line: str) -> dict:
         """
         Parses Format 1 data. [cite: 185, 222]
@@ -100,7 +312,7 @@ class ST1Scale:
                 
                 # Use regex to find the numeric value and the unit
                 # Handle the space between sign and number: "+ 1.000kg" or "- 1.000kg"
-                match = re.search(r'([+\-])\s*(\d+\.\d+)\s*(\w+)', weight_info)
+                match = _SIGNED_WEIGHT.search(weight_info)
                 if match:
                     sign = match.group(1)
                     number = match.group(2)
@@ -129,7 +341,7 @@ class ST1Scale:
         data = {'format': 2, 'raw': line, 'parsed_data': None}
         try:
             # Handle the space between sign and number: "+ 1.000kg" or "- 1.000kg"
-            match = re.search(r'([+\-])\s*(\d+\.\d+)\s*(\w+)', line)
+            match = _SIGNED_WEIGHT.search(line)
             if match:
                 sign = match.group(1)
                 number = match.group(2)
@@ -157,11 +369,11 @@ class ST1Scale:
             elif "TOTAL" in line:
                 data['line_type'] = 'total_header'
             else:
-                parts = re.split(r'\s+', line)
+                parts = _WHITESPACE.split(line)
                 if len(parts) == 2:
                     # Heuristic: if the first part is all digits and the second can be a float,
                     # it could be a data line or a total value line.
-                    if parts[0].isdigit() and re.match(r'^\d+(\.\d+)?$', parts[1]):
+                    if parts[0].isdigit() and _DECIMAL.match(parts[1]):
                         # This could be a data line OR the total line
                         data['line_type'] = 'data_or_total_value'
                         data['parsed_data'] = {
@@ -182,29 +394,29 @@ class ST1Scale:
             line_upper = line.upper().strip()
             if line_upper.startswith("TICKET NO."):
                 data['line_type'] = 'ticket_number'
-                data['parsed_data'] = {'ticket_no': int(re.search(r'\d+', line).group())}
+                data['parsed_data'] = {'ticket_no': int(_INTEGER.search(line).group())}
             elif line_upper.startswith("G"):
                 data['line_type'] = 'gross_weight'
-                match = re.search(r'(\d+\.\d+)\s*(\w+)', line)
+                match = _UNSIGNED_WEIGHT.search(line)
                 data['parsed_data'] = {'value': float(match.group(1)), 'unit': match.group(2)} if match else {}
             elif line_upper.startswith("T"):
                  # Distinguish between Tare weight and TOTAL
                 if "TOTAL" not in line_upper:
                     data['line_type'] = 'tare_weight'
-                    match = re.search(r'(\d+\.\d+)\s*(\w+)', line)
+                    match = _UNSIGNED_WEIGHT.search(line)
                     data['parsed_data'] = {'value': float(match.group(1)), 'unit': match.group(2)} if match else {}
             elif line_upper.startswith("N"):
                 data['line_type'] = 'net_weight'
-                match = re.search(r'(\d+\.\d+)\s*(\w+)', line)
+                match = _UNSIGNED_WEIGHT.search(line)
                 data['parsed_data'] = {'value': float(match.group(1)), 'unit': match.group(2)} if match else {}
             elif "TOTAL NUMBER" in line_upper:
                 data['line_type'] = 'total_ticket_count_header'
             elif "OF TICKETS" in line_upper:
                 data['line_type'] = 'total_ticket_count_value'
-                data['parsed_data'] = {'count': int(re.search(r'\d+', line).group())}
+                data['parsed_data'] = {'count': int(_INTEGER.search(line).group())}
             elif "TOTAL" in line_upper and "NET" in line_upper:
                 data['line_type'] = 'total_net_header'
-            elif re.match(r'^\s*\d+\.\d+\s*$', line): # Line with just a float value
+            elif _FLOAT_ONLY.match(line): # Line with just a float value
                 data['line_type'] = 'total_net_value'
                 data['parsed_data'] = {'total_net': float(line.strip())}
         except Exception as e:
@@ -217,7 +429,8 @@ class ST1Scale:
         
         Args:
             data_format (int): The format number (1, 2, 3, or 4) to use for parsing.
-                               This must match the scale's UF-6 setting.
+                               This must match the scale's UF-6 setting. Use stream()
+                               to detect the format automatically instead.
 
         Returns:
             dict | None: A dictionary containing the parsed data, or None on error.
@@ -247,9 +460,7 @@ if __name__ == "__main__":
     # You need to update this with the actual slave port shown by the sender
     SCALE_PORT = '/dev/pts/13'  # This will be updated by the sender
     
-    # IMPORTANT: Set this to match the format you configured in the scale's UF-6 menu.
-    # For this example, we assume the scale is set to "232 2" (Stream output - Format 1).
-    DATA_FORMAT_TO_TEST = 1 
+    # The UF-6 format (1-4) is detected from the data, no need to configure it here
 
     # Initialize the scale object
     scale = ST1Scale(port=SCALE_PORT, baudrate=9600, timeout=1)
@@ -265,17 +476,11 @@ if __name__ == "__main__":
         if scale.connect():
             print("\nSuccessfully connected to scale!")
             print("Reading data from scale...")
-            print(f"Expecting data in Format {DATA_FORMAT_TO_TEST}. Press Ctrl+C to exit.\n")
+            print("Data format is detected automatically. Press Ctrl+C to exit.\n")
             
             try:
-                while True:
-                    # Read and parse the data
-                    parsed_data = scale.read_parsed_data(data_format=DATA_FORMAT_TO_TEST)
-                    
-                    if parsed_data: # Check if dictionary is not empty
-                        print(parsed_data['parsed_data'].get('value', 'No value'))
-
-                    time.sleep(0.2) # Wait a bit before the next read
+                for record in scale.stream():
+                    print(f"[Format {scale.parser.detected_format}] {record}")
             
             except KeyboardInterrupt:
                 print("\nStopping...")
@@ -0,0 +1,232 @@
+"""
+Serial -> Screen -> Sound Latency Benchmark (Linux / pty)
+
+Drives a Fast Reaction app file headless through a pseudo-terminal pair and measures:
+  - byte written -> FastReactionBackend signal emitted (correctCountChanged / scoreChanged)
+  - byte written -> AudioServiceThread.play_crct_sound invoked
+
+The app module is loaded from its file (e.g. Fast_Reaction_V2.1.5.py) so the same run
+can be repeated against any of the V2.x files before a deployment.
+
+Usage:
+    python scripts_helper/serial_latency_benchmark.py --app Fast_Reaction_V2.1.5.py --rate 20 --count 400
+"""
+
+import argparse
+import importlib.util
+import os
+import pty
+import sys
+import threading
+import time
+
+# Headless Qt and audio must be configured before PyQt5 / pygame are imported
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+AUDIO_FILES = {
+    'miss_sound': 'Assets/mp3/miss.mp3',
+    'crct_sound': 'Assets/mp3/correct.mp3',
+    'mstk_sound': 'Assets/mp3/wrong-answer.mp3',
+}
+
+
+def load_app_module(app_file: str):
+    """Import an app file whose name contains dots (Fast_Reaction_V2.x.y.py)"""
+    path = app_file if os.path.isabs(app_file) else os.path.join(REPO_ROOT, app_file)
+    spec = importlib.util.spec_from_file_location("fast_reaction_benchmark_app", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentiles_ms(samples_ns: list) -> dict:
+    """Return sample count and p50/p95/p99/max in milliseconds"""
+    import numpy as np
+
+    if not samples_ns:
+        return {'n': 0, 'p50': float('nan'), 'p95': float('nan'), 'p99': float('nan'), 'max': float('nan')}
+    values = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {'n': len(samples_ns), 'p50': p50, 'p95': p95, 'p99': p99, 'max': float(values.max())}
+
+
+class PtyPanel:
+    """Fake reaction panel on the master side of a pty, recording write timestamps"""
+
+    def __init__(self):
+        self.master_fd, self.slave_fd = pty.openpty()
+        self.slave_name = os.ttyname(self.slave_fd)
+        self.crct_written_ns = {}   # nth Crct -> write time
+        self.score_written_ns = {}  # score value -> write time
+        self._stop = threading.Event()
+        self.start_answered = threading.Event()  # Set once "Start" was read and "OK" sent back
+        # Drain whatever the app sends (Start/Stop/Sc...) so the pty buffer never fills,
+        # answering the Start handshake like the real panel does
+        self._drain_thread = threading.Thread(target=self._drain, daemon=True)
+        self._drain_thread.start()
+
+    def _drain(self):
+        import select
+
+        pending = b""
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self.master_fd], [], [], 0.1)
+            if readable:
+                try:
+                    pending += os.read(self.master_fd, 4096)
+                except OSError:
+                    return
+                *lines, pending = pending.split(b"\n")
+                if any(line.strip() == b"Start" for line in lines):
+                    self.reply_ok()
+                    self.start_answered.set()
+
+    def reply_ok(self):
+        os.write(self.master_fd, b"OK\n")
+
+    def play(self, rate: float, count: int):
+        """Send `count` hits (Crct followed by Sc{score}) at `rate` hits per second"""
+        interval = 1.0 / rate
+        next_at = time.monotonic()
+        for hit in range(1, count + 1):
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            written = time.monotonic_ns()
+            os.write(self.master_fd, f"Crct\nSc{hit * 10}\n".encode())
+            self.crct_written_ns[hit] = written
+            self.score_written_ns[hit * 10] = written
+            next_at += interval
+
+    def close(self):
+        self._stop.set()
+        for fd in (self.master_fd, self.slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+def run_benchmark(app_file: str, rate: float, count: int, settle_ms: int) -> dict:
+    os.chdir(REPO_ROOT)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication, QMainWindow
+    from config import SerialConfig
+
+    qt_app = QApplication.instance() or QApplication(sys.argv)
+    app = load_app_module(app_file)
+    panel = PtyPanel()
+
+    backend_latency = []
+    score_latency = []
+    audio_latency = []
+
+    serial_thread = app.SimpleSerialThread(SerialConfig(enabled=True, port=panel.slave_name, auto_reconnect=False))
+    serial_thread.start()
+    deadline = time.monotonic() + 5
+    while not serial_thread.connected and time.monotonic() < deadline:
+        qt_app.processEvents()
+        time.sleep(0.01)
+    if not serial_thread.connected:
+        raise RuntimeError(f"Serial thread did not connect to {panel.slave_name}")
+
+    audio_thread = app.AudioServiceThread(AUDIO_FILES)
+    audio_thread.start()
+
+    window = QMainWindow()
+    screen = app.Active_screen(serial_thread=serial_thread)
+    screen.setupUi(window)
+    backend = screen.fastreaction_backend
+
+    def on_correct_changed(value):
+        now = time.monotonic_ns()
+        written = panel.crct_written_ns.get(int(value or 0))
+        if written is not None:
+            backend_latency.append(now - written)
+
+    def on_score_changed(value):
+        now = time.monotonic_ns()
+        written = panel.score_written_ns.get(int(value or 0))
+        if written is not None:
+            score_latency.append(now - written)
+
+    play_crct_sound = audio_thread.play_crct_sound
+
+    def timed_play_crct_sound():
+        now = time.monotonic_ns()
+        written = panel.crct_written_ns.get(int(backend.correct_count or 0))
+        if written is not None:
+            audio_latency.append(now - written)
+        play_crct_sound()
+
+    audio_thread.play_crct_sound = timed_play_crct_sound
+    backend.correctCountChanged.connect(on_correct_changed)
+    backend.scoreChanged.connect(on_score_changed)
+    # Same wiring MainApp uses for the correct sound
+    screen.crct_signal.connect(lambda: audio_thread.play_crct_sound())
+
+    app.gameStarted = True
+    serial_thread.start_monitoring()
+    # The panel answers "OK" only after reading "Start", so the handshake is measured as on hardware
+    deadline = time.monotonic() + 5
+    while not panel.start_answered.is_set() and time.monotonic() < deadline:
+        qt_app.processEvents()
+        time.sleep(0.01)
+    if not panel.start_answered.is_set():
+        raise RuntimeError("Fake panel never received the Start command")
+
+    writer = threading.Thread(target=panel.play, args=(rate, count), daemon=True)
+    writer.start()
+
+    def check_done():
+        if not writer.is_alive():
+            QTimer.singleShot(settle_ms, qt_app.quit)
+        else:
+            QTimer.singleShot(50, check_done)
+
+    QTimer.singleShot(0, check_done)
+    qt_app.exec_()
+
+    app.gameStarted = False
+    try:
+        serial_thread.stop_monitoring()
+    except Exception:
+        pass
+    serial_thread.stop()
+    audio_thread.stop()
+    # The screen does not own an MQTT connection (none is created for the benchmark)
+    if screen.mqtt_thread is not None:
+        screen.mqtt_thread.stop()
+    panel.close()
+
+    return {
+        'byte -> correctCountChanged': percentiles_ms(backend_latency),
+        'byte -> scoreChanged': percentiles_ms(score_latency),
+        'byte -> play_crct_sound': percentiles_ms(audio_latency),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial -> screen -> sound latency benchmark over a pty")
+    parser.add_argument('--app', default='Fast_Reaction_V2.1.5.py', help='App file to benchmark')
+    parser.add_argument('--rate', type=float, default=20.0, help='Hits per second sent by the fake panel')
+    parser.add_argument('--count', type=int, default=400, help='Number of hits to send')
+    parser.add_argument('--settle-ms', type=int, default=500, help='Time to keep the event loop running after the last hit')
+    args = parser.parse_args()
+
+    print(f"--- Serial Latency Benchmark: {args.app} @ {args.rate:g} hits/s x {args.count} ---")
+    results = run_benchmark(args.app, args.rate, args.count, args.settle_ms)
+
+    print(f"{'path':<30}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, stats in results.items():
+        print(f"{name:<30}{stats['n']:>6}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}{stats['max']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Serial Session Replayer (Linux / pty)
+
+Feeds a session log captured by SimpleSerialThread (SerialConfig.capture_enabled) back
+through a pseudo-terminal, so the game sees exactly what the panel sent on the floor.
+
+Point the game at the printed slave device (FAST_REACTION_SERIAL_PORT=/dev/pts/N) and
+start a game; replay begins when the game sends "Start" (or immediately with --no-wait).
+
+Usage:
+    python scripts_helper/serial_session_replayer.py serial_sessions/session_20251015_181200_000000.frsl --speed 10
+    python scripts_helper/serial_session_replayer.py session.frsl --speed max --loop
+"""
+
+import argparse
+import os
+import pty
+import select
+import sys
+import time
+import tty
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.serial_session_log import DIRECTION_RX, iter_session
+
+
+def parse_speed(value: str) -> float:
+    """'1', '10', '2.5' -> factor; 'max' -> 0 (no delays)"""
+    if value.lower() == "max":
+        return 0.0
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+def wait_for_start(master_fd: int):
+    """Block until the game writes 'Start' to the port"""
+    buffer = b""
+    while b"Start" not in buffer:
+        readable, _, _ = select.select([master_fd], [], [], 1.0)
+        if readable:
+            buffer = (buffer + os.read(master_fd, 1024))[-64:]
+
+
+def replay(master_fd: int, path: str, speed: float, port_id: int = 0, binary: bool = False) -> int:
+    """Write every line (or binary frame) panel port_id sent to the game to the pty; returns records sent"""
+    sent = 0
+    started = time.monotonic_ns()
+    for record in iter_session(path):
+        if record.direction != DIRECTION_RX or record.port_id != port_id:
+            continue
+        if speed:
+            delay = (started + record.offset_ns / speed - time.monotonic_ns()) / 1e9
+            if delay > 0:
+                time.sleep(delay)
+        os.write(master_fd, record.data if binary else record.data + b"\n")
+        sent += 1
+
+        # Keep the game's writes (Start/Stop/Sc...) from filling the pty buffer
+        while select.select([master_fd], [], [], 0)[0]:
+            os.read(master_fd, 4096)
+    return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a captured serial session through a pty")
+    parser.add_argument('log', help='Session log (.frsl) written by SimpleSerialThread')
+    parser.add_argument('--speed', type=parse_speed, default=1.0, help="Replay speed: 1, 10, ... or 'max'")
+    parser.add_argument('--no-wait', action='store_true', help="Start immediately instead of waiting for 'Start'")
+    parser.add_argument('--loop', action='store_true', help='Replay again for every new game')
+    parser.add_argument('--port-id', type=int, default=0, help='Panel to replay from a multi-port capture (0 = main port)')
+    parser.add_argument('--framing', choices=('line', 'binary'), default='line',
+                        help='Framing the session was captured with (SerialConfig.framing)')
+    args = parser.parse_args()
+
+    master_fd, slave_fd = pty.openpty()
+    tty.setraw(slave_fd)
+    print("--- Serial Session Replayer ---")
+    print(f"  Log: {args.log}")
+    print(f"  Speed: {'max' if not args.speed else f'{args.speed:g}x'}")
+    print(f"  Game should use: {os.ttyname(slave_fd)}")
+
+    try:
+        while True:
+            if not args.no_wait:
+                print("Waiting for 'Start' from the game...")
+                wait_for_start(master_fd)
+            started = time.monotonic()
+            sent = replay(master_fd, args.log, args.speed, args.port_id, args.framing == 'binary')
+            print(f"Replayed {sent} records in {time.monotonic() - started:.2f}s")
+            if not args.loop:
+                break
+    except KeyboardInterrupt:
+        print("\nReplayer stopped by user.")
+    finally:
+        os.close(master_fd)
+        os.close(slave_fd)
+
+
+if __name__ == "__main__":
+    main()
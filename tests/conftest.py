@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Modules import each other as top-level packages (utils.*, api.*), as when run from the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# utils.logger creates logs/ in the working directory; keep test runs out of the checkout
+os.chdir(tempfile.mkdtemp(prefix="fast_reaction_tests_"))
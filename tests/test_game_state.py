@@ -0,0 +1,40 @@
+"""Counter snapshots in utils.game_state"""
+
+from utils.game_state import GameCounterStore, merge_counters
+from utils.serial_events import SerialEvent, SerialEventKind
+
+K = SerialEventKind
+
+
+def event(kind, value=0, seq=1, port_id=0):
+    return SerialEvent(kind, value, 0, seq, "", port_id)
+
+
+def test_batch_counts_and_latest_score_per_panel():
+    store = GameCounterStore()
+    snap = store.apply_batch([
+        event(K.CORRECT, seq=1), event(K.MISTAKE, seq=2), event(K.MISS, seq=3),
+        event(K.SCORE, 10, seq=4, port_id=0), event(K.SCORE, 7, seq=5, port_id=1),
+        event(K.SCORE, 12, seq=6, port_id=0),
+    ])
+    assert (snap.correct, snap.wrong, snap.miss, snap.score, snap.seq) == (1, 1, 1, 19, 6)
+    assert [panel.score for panel in snap.panels] == [12, 7]
+    assert store.snapshot() == snap
+
+
+def test_reset_hides_old_snapshot_until_next_write():
+    store = GameCounterStore()
+    store.apply(event(K.CORRECT))
+    store.reset()
+    assert store.snapshot().correct == 0
+    # A writer that has not seen the reset yet starts from zero as well
+    assert store.apply(event(K.CORRECT, seq=2)).correct == 1
+
+
+def test_merge_counters():
+    a, b = GameCounterStore(), GameCounterStore()
+    a.apply_batch([event(K.CORRECT), event(K.SCORE, 10, seq=2)])
+    b.apply_batch([event(K.MISS, seq=5), event(K.SCORE, 4, seq=6)])
+    merged = merge_counters(a.snapshot(), b.snapshot())
+    assert (merged.correct, merged.miss, merged.score, merged.seq) == (1, 1, 14, 6)
+    assert len(merged.panels) == 2
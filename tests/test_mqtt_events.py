@@ -0,0 +1,146 @@
+"""Decoding and deduplication of MQTT panel messages in utils.mqtt_events"""
+
+import threading
+
+from utils.game_state import GameCounterStore
+from utils.mqtt_events import MqttEventIngest
+from utils.serial_events import SerialEventKind
+
+K = SerialEventKind
+TOPIC = "FastReaction/score/Pub"
+
+
+def make_ingest(**kwargs):
+    return MqttEventIngest(GameCounterStore(), **kwargs)
+
+
+def test_dup_redelivery_is_dropped_by_packet_id():
+    ingest = make_ingest()
+    assert ingest.add(TOPIC, "Crct\nSc10", mid=7) == 2
+    # QoS 1 redelivery of the same packet: same mid, DUP flag set
+    assert ingest.add(TOPIC, "Crct\nSc10", mid=7, dup=True) == 0
+    assert ingest.duplicates_dropped == 1
+    assert [(e.kind, e.value) for e in ingest.flush()] == [(K.CORRECT, 0), (K.SCORE, 10)]
+    assert ingest.store.snapshot().correct == 1
+
+
+def test_reused_packet_id_without_dup_is_kept():
+    # Packet ids are recycled by the broker; only a DUP delivery is a redelivery
+    ingest = make_ingest()
+    ingest.add(TOPIC, "Miss", mid=3)
+    assert ingest.add(TOPIC, "Miss", mid=3) == 1
+    assert ingest.duplicates_dropped == 0
+
+
+def test_sequenced_redelivery_is_dropped():
+    ingest = make_ingest()
+    assert ingest.add(TOPIC, "1:Crct\n2:Mstk") == 2
+    assert ingest.add(TOPIC, "2:Mstk\n3:Miss") == 1
+    assert ingest.duplicates_dropped == 1
+    assert [e.kind for e in ingest.flush()] == [K.CORRECT, K.MISTAKE, K.MISS]
+
+
+def test_sequence_restart_is_accepted():
+    ingest = make_ingest()
+    ingest.add(TOPIC, "5000:Crct")
+    # Far below the last sequence number: the publisher restarted, not a redelivery
+    assert ingest.add(TOPIC, "1:Crct") == 1
+    assert ingest.duplicates_dropped == 0
+
+
+def test_sequences_are_tracked_per_topic():
+    ingest = make_ingest(panel_ids={"a": 1, "b": 2})
+    ingest.add("a", "7:Crct")
+    assert ingest.add("b", "7:Crct") == 1
+    assert sorted(e.port_id for e in ingest.flush()) == [1, 2]
+
+
+def test_flush_keeps_latest_score_per_panel():
+    ingest = make_ingest(panel_ids={"a": 1, "b": 2})
+    ingest.add("a", "Sc10\nSc20")
+    ingest.add("b", "Sc5")
+    ingest.add("a", "Crct")
+    events = ingest.flush()
+    assert [(e.kind, e.value, e.port_id) for e in events] == [
+        (K.SCORE, 20, 1), (K.SCORE, 5, 2), (K.CORRECT, 0, 1)]
+    snapshot = ingest.store.snapshot()
+    assert (snapshot.score, snapshot.correct) == (25, 1)
+    assert ingest.flush() == []
+
+
+def test_reset_drops_pending_events_and_sequences():
+    ingest = make_ingest()
+    ingest.add(TOPIC, "9:Crct")
+    ingest.reset()
+    assert ingest.pending == 0
+    assert ingest.flush() == []
+    assert ingest.add(TOPIC, "9:Crct") == 1
+
+
+def test_flush_due_by_batch_size():
+    ingest = make_ingest(flush_interval_ms=60_000, max_batch_size=3)
+    ingest.add(TOPIC, "Crct\nCrct")
+    assert not ingest.flush_due()
+    ingest.add(TOPIC, "Crct")
+    assert ingest.flush_due()
+
+
+def test_concurrent_add_flush_and_reset_lose_nothing():
+    ingest = make_ingest(panel_ids={f"t{i}": i for i in range(4)})
+    per_thread = 2000
+    flushed = []
+    done = threading.Event()
+
+    def producer(topic):
+        for seq in range(1, per_thread + 1):
+            ingest.add(topic, f"{seq}:Crct")
+
+    def consumer():
+        while not done.is_set():
+            flushed.extend(ingest.flush())
+            ingest.reset()  # Sequences are forgotten, but pending events already taken are kept
+
+    producers = [threading.Thread(target=producer, args=(f"t{i}",)) for i in range(4)]
+    flusher = threading.Thread(target=consumer)
+    flusher.start()
+    for thread in producers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    done.set()
+    flusher.join()
+    flushed.extend(ingest.flush())
+
+    # Every event is either flushed once or dropped by a reset - never duplicated or torn
+    assert len({e.seq for e in flushed}) == len(flushed)
+    assert len(flushed) <= 4 * per_thread
+    assert all(e.kind == K.CORRECT for e in flushed)
+
+
+def test_concurrent_add_without_reset_delivers_every_event():
+    ingest = make_ingest(panel_ids={f"t{i}": i for i in range(4)})
+    per_thread = 2000
+    flushed = []
+    done = threading.Event()
+
+    def producer(topic):
+        for seq in range(1, per_thread + 1):
+            ingest.add(topic, f"{seq}:Crct")
+
+    def consumer():
+        while not done.is_set():
+            flushed.extend(ingest.flush())
+
+    producers = [threading.Thread(target=producer, args=(f"t{i}",)) for i in range(4)]
+    flusher = threading.Thread(target=consumer)
+    flusher.start()
+    for thread in producers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    done.set()
+    flusher.join()
+    flushed.extend(ingest.flush())
+
+    assert len(flushed) == 4 * per_thread
+    assert ingest.store.snapshot().correct == 4 * per_thread
@@ -0,0 +1,108 @@
+"""Binary frame and line decoding in utils.panel_protocol"""
+
+import pytest
+
+from utils.panel_protocol import (
+    FRAME_SYNC, FrameDecoder, LineDecoder, MAX_EVENTS_PER_FRAME, create_decoder, encode_frame,
+)
+from utils.serial_events import SerialEventKind
+
+K = SerialEventKind
+
+
+def kinds(messages):
+    return [(m.kind, m.value) for m in messages]
+
+
+def test_frame_round_trip():
+    frame = encode_frame([(K.CORRECT, 0), (K.SCORE, 120), (K.MISS, 0)])
+    messages = FrameDecoder().feed(frame)
+    assert kinds(messages) == [(K.CORRECT, 0), (K.SCORE, 120), (K.MISS, 0)]
+    assert [m.text for m in messages] == ["Crct", "Sc120", "Miss"]
+    # The wire bytes are attached to the first event of the frame only
+    assert messages[0].raw == frame
+    assert messages[1].raw == b"" and messages[2].raw == b""
+
+
+def test_frame_split_across_reads():
+    frame = encode_frame([(K.SCORE, -5), (K.OK, 0)])
+    decoder = FrameDecoder()
+    for i in range(len(frame) - 1):
+        assert decoder.feed(frame[i:i + 1]) == []
+    assert kinds(decoder.feed(frame[-1:])) == [(K.SCORE, -5), (K.OK, 0)]
+
+
+def test_frame_bad_crc_is_dropped_whole():
+    frame = bytearray(encode_frame([(K.CORRECT, 0), (K.MISTAKE, 0)]))
+    frame[-1] ^= 0xFF
+    decoder = FrameDecoder()
+    assert decoder.feed(bytes(frame)) == []
+    assert decoder.rejected_frames >= 1
+
+
+def test_frame_corrupted_payload_is_dropped():
+    frame = bytearray(encode_frame([(K.SCORE, 10)]))
+    frame[3] ^= 0x01
+    decoder = FrameDecoder()
+    assert decoder.feed(bytes(frame)) == []
+    assert decoder.rejected_frames >= 1
+
+
+@pytest.mark.parametrize("length", [0, 3, 7])
+def test_frame_bad_length_is_rejected(length):
+    decoder = FrameDecoder()
+    good = encode_frame([(K.CORRECT, 0)])
+    assert kinds(decoder.feed(bytes((FRAME_SYNC, length)) + good)) == [(K.CORRECT, 0)]
+    assert decoder.rejected_frames == 1
+
+
+def test_frame_resyncs_after_noise():
+    good = encode_frame([(K.SCORE, 42)])
+    noise = b"\x00\x13garbage" + bytes((FRAME_SYNC,)) + b"\x05\x01\x02"
+    decoder = FrameDecoder()
+    messages = decoder.feed(noise + good + b"\xff" + good)
+    assert kinds(messages) == [(K.SCORE, 42), (K.SCORE, 42)]
+
+
+def test_frame_unknown_kind_and_value_masking():
+    # Unknown kinds decode as UNKNOWN, and only SCORE events keep their value
+    messages = FrameDecoder().feed(encode_frame([(99, 7), (K.CORRECT, 3)]))
+    assert kinds(messages) == [(K.UNKNOWN, 0), (K.CORRECT, 0)]
+
+
+def test_encode_frame_limits():
+    with pytest.raises(ValueError):
+        encode_frame([])
+    with pytest.raises(ValueError):
+        encode_frame([(K.MISS, 0)] * (MAX_EVENTS_PER_FRAME + 1))
+    assert len(FrameDecoder().feed(encode_frame([(K.MISS, 0)] * MAX_EVENTS_PER_FRAME))) == MAX_EVENTS_PER_FRAME
+
+
+def test_frame_decoder_reset_drops_partial_frame():
+    frame = encode_frame([(K.OK, 0)])
+    decoder = FrameDecoder()
+    decoder.feed(frame[:3])
+    decoder.reset()
+    assert decoder.feed(frame[3:]) == []
+    assert kinds(decoder.feed(frame)) == [(K.OK, 0)]
+
+
+def test_line_decoder_split_and_case():
+    decoder = LineDecoder()
+    assert decoder.feed(b"CR") == []
+    assert kinds(decoder.feed(b"CT\r\nsc 15\nMstk\n\nhello\nOk")) == [
+        (K.CORRECT, 0), (K.SCORE, 15), (K.MISTAKE, 0), (K.UNKNOWN, 0)]
+    assert kinds(decoder.feed(b"\n")) == [(K.OK, 0)]
+
+
+def test_line_decoder_drops_overlong_partial_line():
+    decoder = LineDecoder()
+    decoder.feed(b"x" * 1000)
+    assert kinds(decoder.feed(b"Miss\n")) == [(K.MISS, 0)]
+
+
+def test_create_decoder():
+    assert isinstance(create_decoder("line"), LineDecoder)
+    assert isinstance(create_decoder("binary"), FrameDecoder)
+    with pytest.raises(ValueError):
+        create_decoder("morse")
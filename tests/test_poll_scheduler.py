@@ -0,0 +1,113 @@
+"""Polling intervals and conditional request caching in api.poll_scheduler"""
+
+import time
+
+import pytest
+
+from api.poll_scheduler import ConditionalCache, PollScheduler
+
+
+def scheduler(**kwargs):
+    options = dict(fast_interval=0.5, fast_period=0.0, idle_interval=3.0, backoff_factor=2.0,
+                   error_interval=1.0, error_interval_max=8.0, jitter=0.0)
+    options.update(kwargs)
+    return PollScheduler(**options)
+
+
+def test_unchanged_polls_relax_up_to_idle_interval():
+    poll = scheduler()
+    intervals = []
+    for _ in range(5):
+        poll.record_unchanged()
+        intervals.append(poll.interval)
+    assert intervals == [1.0, 2.0, 3.0, 3.0, 3.0]
+
+
+def test_fast_period_holds_fast_interval():
+    poll = scheduler(fast_period=60.0)
+    for _ in range(5):
+        poll.record_unchanged()
+    assert poll.interval == 0.5
+
+
+def test_change_resets_to_fast_interval():
+    poll = scheduler()
+    for _ in range(4):
+        poll.record_unchanged()
+    poll.record_change()
+    assert poll.interval == 0.5
+
+
+def test_errors_back_off_exponentially_up_to_max():
+    poll = scheduler()
+    intervals = []
+    for _ in range(6):
+        poll.record_error()
+        intervals.append(poll.interval)
+    assert intervals == [1.0, 2.0, 4.0, 8.0, 8.0, 8.0]
+
+
+def test_success_after_errors_restores_normal_interval():
+    poll = scheduler()
+    poll.record_unchanged()
+    for _ in range(3):
+        poll.record_error()
+    poll.record_unchanged()
+    assert poll.interval == 2.0
+    poll.record_error()
+    assert poll.interval == 1.0  # The error backoff starts over
+
+
+def test_jitter_stays_within_bounds():
+    poll = scheduler(jitter=0.2, fast_period=60.0)
+    delays = [poll.next_delay() for _ in range(200)]
+    assert all(0.4 <= delay <= 0.6 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_wait_returns_early_when_stopped():
+    poll = scheduler(fast_interval=5.0, fast_period=60.0)
+    started = time.monotonic()
+    assert poll.wait(lambda: True) is True
+    assert time.monotonic() - started < 1.0
+
+
+def test_wait_sleeps_full_delay():
+    poll = scheduler(fast_interval=0.05, fast_period=60.0)
+    assert poll.wait(lambda: False, slice_seconds=0.01) is False
+
+
+def test_from_config_uses_defaults_for_missing_fields():
+    class Config:
+        poll_fast_interval = 1.0
+
+    poll = PollScheduler.from_config(Config)
+    assert poll.fast_interval == 1.0
+    assert poll.idle_interval == 3.0
+
+
+class Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+def test_conditional_cache_validators_and_change_detection():
+    cache = ConditionalCache()
+    key = ConditionalCache.key("http://api/status", {"b": 2, "a": 1})
+    assert key == "http://api/status?a=1&b=2"
+    assert cache.request_headers(key) == {}
+
+    assert cache.store(key, Response({"ETag": '"v1"', "Last-Modified": "Mon"}), {"status": "idle"})
+    assert cache.request_headers(key) == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon"}
+    assert not cache.store(key, Response({"ETag": '"v1"'}), {"status": "idle"})
+    assert cache.store(key, Response({}), {"status": "playing"})
+    assert cache.request_headers(key) == {}
+    assert cache.body(key) == {"status": "playing"}
+
+    cache.clear(key)
+    assert cache.body(key) is None
+
+
+@pytest.mark.parametrize("params", [None, {}])
+def test_conditional_cache_key_without_params(params):
+    assert ConditionalCache.key("http://api/x", params) == "http://api/x"
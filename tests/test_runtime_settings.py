@@ -0,0 +1,70 @@
+"""Change notification and persistence in utils.runtime_settings"""
+
+import json
+
+from utils.runtime_settings import TIMER_VALUE_MS, RuntimeSettings
+
+
+def test_listeners_see_changes_only(tmp_path):
+    settings = RuntimeSettings(str(tmp_path / "settings.json"), legacy_files={})
+    seen = []
+    settings.subscribe(lambda key, value: seen.append((key, value)))
+    assert settings.set(TIMER_VALUE_MS, 60000)
+    assert not settings.set(TIMER_VALUE_MS, 60000)
+    assert seen == [(TIMER_VALUE_MS, 60000)]
+
+
+def test_unsubscribe(tmp_path):
+    settings = RuntimeSettings(str(tmp_path / "settings.json"), legacy_files={})
+    seen = []
+
+    def record(key, value):
+        seen.append(value)
+
+    settings.subscribe(record)
+    settings.set(TIMER_VALUE_MS, 1)
+    settings.unsubscribe(record)
+    settings.unsubscribe(record)  # Unknown listeners are ignored
+    settings.set(TIMER_VALUE_MS, 2)
+    assert seen == [1]
+
+
+def test_failing_listener_does_not_stop_others(tmp_path):
+    settings = RuntimeSettings(str(tmp_path / "settings.json"), legacy_files={})
+    seen = []
+
+    def broken(key, value):
+        raise RuntimeError("boom")
+
+    settings.subscribe(broken)
+    settings.subscribe(lambda key, value: seen.append(value))
+    settings.set(TIMER_VALUE_MS, 5)
+    assert seen == [5]
+
+
+def test_flush_persists_and_reloads(tmp_path):
+    path = tmp_path / "settings.json"
+    settings = RuntimeSettings(str(path), debounce_seconds=60, legacy_files={})
+    settings.set(TIMER_VALUE_MS, 90000)
+    settings.flush()
+    assert json.loads(path.read_text()) == {TIMER_VALUE_MS: 90000}
+    assert RuntimeSettings(str(path), legacy_files={}).get(TIMER_VALUE_MS) == 90000
+    assert [p.name for p in tmp_path.iterdir()] == ["settings.json"]  # No temp files left behind
+
+
+def test_legacy_file_is_migrated_once(tmp_path):
+    legacy = tmp_path / "file2.txt"
+    legacy.write_text("30000\n45000\n")
+    path = tmp_path / "settings.json"
+    settings = RuntimeSettings(str(path), legacy_files={TIMER_VALUE_MS: str(legacy)})
+    assert settings.get(TIMER_VALUE_MS) == 45000
+    assert json.loads(path.read_text()) == {TIMER_VALUE_MS: 45000}
+
+    legacy.write_text("1000\n")
+    assert RuntimeSettings(str(path), legacy_files={TIMER_VALUE_MS: str(legacy)}).get(TIMER_VALUE_MS) == 45000
+
+
+def test_corrupt_file_is_ignored(tmp_path):
+    path = tmp_path / "settings.json"
+    path.write_text("{not json")
+    assert RuntimeSettings(str(path), legacy_files={}).get(TIMER_VALUE_MS, 7) == 7
@@ -0,0 +1,159 @@
+"""ScoreOutbox state transitions and ScoreSender retry decisions"""
+
+import time
+
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from utils.score_outbox import (  # noqa: E402
+    STATUS_FAILED, STATUS_PENDING, STATUS_SENT, ScoreOutbox, ScoreSender, is_retryable,
+)
+
+SCORES = [{"userID": "u1", "nodeID": 1, "score": 30}, {"userID": "u2", "nodeID": 2, "score": 12}]
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    box = ScoreOutbox(str(tmp_path / "outbox.db"))
+    yield box
+    box.close()
+
+
+def test_enqueue_creates_pending_row(outbox):
+    assert outbox.enqueue("g1", SCORES, "Team A")
+    entry = outbox.get("g1")
+    assert entry.status == STATUS_PENDING
+    assert entry.attempts == 0
+    assert entry.total_score == 42
+    assert entry.individual_scores == SCORES
+    assert entry.idempotency_key == "g1"
+    assert [e.game_result_id for e in outbox.due()] == ["g1"]
+    assert outbox.pending_count() == 1
+
+
+def test_enqueue_upserts_pending_row(outbox):
+    outbox.enqueue("g1", SCORES, "Team A")
+    outbox.enqueue("g1", SCORES[:1], "Team B")
+    entry = outbox.get("g1")
+    assert (entry.team_name, entry.total_score) == ("Team B", 30)
+    assert len(outbox.entries()) == 1
+
+
+def test_enqueue_does_not_touch_sent_row(outbox):
+    outbox.enqueue("g1", SCORES, "Team A")
+    outbox.mark_sent("g1")
+    assert not outbox.enqueue("g1", SCORES[:1], "Team B")
+    entry = outbox.get("g1")
+    assert entry.status == STATUS_SENT
+    assert entry.team_name == "Team A"
+    assert entry.sent_at is not None
+    assert outbox.due() == []
+
+
+def test_failed_attempt_is_rescheduled(outbox):
+    outbox.enqueue("g1", SCORES)
+    later = time.time() + 60
+    outbox.mark_attempt_failed("g1", "HTTP 503", later)
+    entry = outbox.get("g1")
+    assert (entry.status, entry.attempts, entry.last_error) == (STATUS_PENDING, 1, "HTTP 503")
+    assert outbox.due() == []
+    assert outbox.due(now=later + 1)[0].game_result_id == "g1"
+    assert outbox.next_attempt_at() == pytest.approx(later)
+
+
+def test_give_up_and_requeue(outbox):
+    outbox.enqueue("g1", SCORES)
+    outbox.mark_attempt_failed("g1", "HTTP 400", None)
+    assert outbox.get("g1").status == STATUS_FAILED
+    assert outbox.pending_count() == 0
+    assert outbox.next_attempt_at() is None
+
+    assert outbox.requeue("g1")
+    entry = outbox.get("g1")
+    assert entry.status == STATUS_PENDING
+    assert outbox.due()[0].game_result_id == "g1"
+
+
+def test_requeue_sent_row_needs_force(outbox):
+    outbox.enqueue("g1", SCORES)
+    outbox.mark_sent("g1")
+    assert not outbox.requeue("g1")
+    assert outbox.get("g1").status == STATUS_SENT
+    assert outbox.requeue("g1", force=True)
+    assert outbox.get("g1").status == STATUS_PENDING
+    assert not outbox.requeue("missing", force=True)
+
+
+def test_entries_filter_by_status(outbox):
+    for game in ("g1", "g2", "g3"):
+        outbox.enqueue(game, SCORES)
+    outbox.mark_sent("g2")
+    outbox.mark_attempt_failed("g3", "HTTP 422", None)
+    assert [e.game_result_id for e in outbox.entries(STATUS_PENDING)] == ["g1"]
+    assert [e.game_result_id for e in outbox.entries(STATUS_SENT)] == ["g2"]
+    assert [e.game_result_id for e in outbox.entries(STATUS_FAILED)] == ["g3"]
+    assert len(outbox.entries()) == 3
+
+
+def test_rows_survive_reopen(tmp_path):
+    path = str(tmp_path / "outbox.db")
+    box = ScoreOutbox(path)
+    box.enqueue("g1", SCORES, "Team A")
+    box.close()
+    box = ScoreOutbox(path)
+    assert box.get("g1").status == STATUS_PENDING
+    box.close()
+
+
+@pytest.mark.parametrize("status, retryable", [
+    (None, True), (500, True), (503, True), (401, True), (408, True), (429, True),
+    (400, False), (403, False), (404, False), (409, False), (422, False),
+])
+def test_is_retryable(status, retryable):
+    assert is_retryable(status) is retryable
+
+
+def _sender(outbox, statuses, **kwargs):
+    calls = []
+
+    def submit(game_result_id, scores, key):
+        calls.append((game_result_id, key))
+        return statuses.pop(0)
+
+    return ScoreSender(outbox, submit, retry_interval=10, retry_interval_max=100, **kwargs), calls
+
+
+def test_sender_marks_sent(outbox):
+    outbox.enqueue("g1", SCORES)
+    sender, calls = _sender(outbox, [200])
+    sender._send(outbox.get("g1"))
+    assert calls == [("g1", "g1")]
+    assert outbox.get("g1").status == STATUS_SENT
+
+
+def test_sender_retries_server_errors(outbox):
+    outbox.enqueue("g1", SCORES)
+    sender, _ = _sender(outbox, [503])
+    before = time.time()
+    sender._send(outbox.get("g1"))
+    entry = outbox.get("g1")
+    assert (entry.status, entry.attempts) == (STATUS_PENDING, 1)
+    assert entry.next_attempt_at >= before + 10 * 0.8
+
+
+def test_sender_fails_permanent_rejection_at_once(outbox):
+    outbox.enqueue("g1", SCORES)
+    sender, _ = _sender(outbox, [422], max_attempts=50)
+    sender._send(outbox.get("g1"))
+    entry = outbox.get("g1")
+    assert (entry.status, entry.attempts, entry.last_error) == (STATUS_FAILED, 1, "HTTP 422")
+
+
+def test_sender_gives_up_after_max_attempts(outbox):
+    outbox.enqueue("g1", SCORES)
+    sender, _ = _sender(outbox, [None, 503], max_attempts=2)
+    sender._send(outbox.get("g1"))
+    assert outbox.get("g1").status == STATUS_PENDING
+    sender._send(outbox.get("g1"))
+    assert outbox.get("g1").status == STATUS_FAILED
@@ -0,0 +1,121 @@
+"""Token expiry and single-flight renewal in api.token_manager"""
+
+import base64
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from api.token_manager import TokenManager, extract_token, jwt_expiry  # noqa: E402
+
+
+def make_jwt(claims) -> str:
+    payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).rstrip(b"=").decode()
+    return f"header.{payload}.signature"
+
+
+def test_jwt_expiry():
+    assert jwt_expiry(make_jwt({"exp": 1700000000})) == 1700000000.0
+    assert jwt_expiry(make_jwt({"sub": "x"})) is None
+    assert jwt_expiry("opaque-token") is None
+    assert jwt_expiry("a.!!!.c") is None
+
+
+def test_extract_token():
+    assert extract_token({"data": {"token": "t1"}}) == "t1"
+    assert extract_token({"token": "t2"}) == "t2"
+    assert extract_token({"data": {}}) is None
+    assert extract_token(None) is None
+
+
+def test_concurrent_callers_share_one_login():
+    calls = []
+    release = threading.Event()
+
+    def login():
+        calls.append(1)
+        release.wait(2)
+        return "token"
+
+    manager = TokenManager(login, ttl_seconds=3600)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.get_token())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)  # Let every caller reach the in-flight login
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["token"] * 8
+
+
+def test_valid_token_is_reused():
+    calls = []
+    manager = TokenManager(lambda: calls.append(1) or f"token{len(calls)}", ttl_seconds=3600)
+    assert manager.get_token() == "token1"
+    assert manager.get_token() == "token1"
+    assert len(calls) == 1
+    assert manager.is_fresh()
+
+
+def test_refresh_margin_uses_jwt_expiry():
+    expires_at = time.time() + 1000
+    manager = TokenManager(lambda: make_jwt({"exp": expires_at}), refresh_margin=300)
+    manager.get_token()
+    assert manager.expires_in() == pytest.approx(1000, abs=2)
+    assert manager.is_valid() and manager.is_fresh()
+
+
+def test_short_lived_token_is_renewed_at_half_its_lifetime():
+    manager = TokenManager(lambda: make_jwt({"exp": time.time() + 10}), refresh_margin=300)
+    manager.get_token()
+    # A 300s margin on a 10s token would make it due at once; half the lifetime is used instead
+    assert manager.is_fresh()
+
+
+def test_expired_token_triggers_login():
+    tokens = iter([make_jwt({"exp": time.time() - 1}), "fresh"])
+    manager = TokenManager(lambda: next(tokens))
+    manager.get_token()
+    assert not manager.is_valid()
+    assert manager.get_token() == "fresh"
+
+
+def test_failed_login_keeps_no_token():
+    def login():
+        raise ConnectionError("down")
+
+    manager = TokenManager(login)
+    assert manager.get_token() is None
+    assert manager.token is None
+
+
+def test_invalidate_only_current_token():
+    tokens = iter(["old", "new"])
+    manager = TokenManager(lambda: next(tokens))
+    manager.get_token()
+    manager.refresh()
+    manager.invalidate("old")  # A late 401 for the previous token must not drop the new one
+    assert manager.token == "new"
+    manager.invalidate("new")
+    assert manager.token is None and not manager.is_valid()
+
+
+def test_background_thread_renews_due_token():
+    tokens = iter([make_jwt({"exp": time.time() + 0.4})] + [make_jwt({"exp": time.time() + 3600})] * 5)
+    manager = TokenManager(lambda: next(tokens), refresh_margin=300)
+    first = manager.get_token()
+    manager.start()
+    try:
+        deadline = time.time() + 3
+        while manager.token == first and time.time() < deadline:
+            time.sleep(0.05)
+        assert manager.token != first
+        assert manager.expires_in() > 3000
+    finally:
+        manager.stop()
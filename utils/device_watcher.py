@@ -0,0 +1,141 @@
+"""
+Device Watcher for Fast Reaction Game
+Wakes the serial thread as soon as a (USB) serial device node reappears under /dev
+
+Uses Linux inotify through ctypes, so there is no extra dependency. On other platforms,
+or if inotify cannot be set up, `available` is False and the caller falls back to
+timed reconnection with exponential backoff.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from typing import Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# inotify constants (linux/inotify.h)
+IN_ATTRIB = 0x00000004      # Permissions changed (udev finishing device setup)
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_IGNORED = 0x00008000     # Watch removed (directory deleted)
+_WATCH_MASK = IN_CREATE | IN_ATTRIB | IN_MOVED_TO
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+class DeviceWatcher:
+    """
+    Watch for a device path to (re)appear
+
+    Only the parent directory of the device is watched. Paths such as
+    /dev/serial/by-id/... vanish completely while the device is unplugged; in that
+    case the nearest existing ancestor is watched and the watch moves down as the
+    directories are recreated.
+    """
+
+    def __init__(self, device_path: str):
+        self.device_path = device_path
+        self._libc = None
+        self._fd: Optional[int] = None
+        self._wd = -1
+        self._watched_dir = None
+
+        if not sys.platform.startswith("linux") or not os.path.isabs(device_path):
+            return
+        try:
+            self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+            self._fd = fd
+            self._arm()
+            logger.info(f" Watching {self._watched_dir} for {device_path} hot-plug")
+        except Exception as e:
+            logger.warning(f"️  Device hot-plug notifications unavailable ({e}), using timed reconnection")
+            self.close()
+
+    @property
+    def available(self) -> bool:
+        return self._fd is not None
+
+    def fileno(self) -> Optional[int]:
+        return self._fd
+
+    def _arm(self):
+        """Watch the deepest existing directory on the way to the device"""
+        directory = os.path.dirname(self.device_path)
+        while directory and not os.path.isdir(directory):
+            directory = os.path.dirname(directory)
+        if directory == self._watched_dir and self._wd >= 0:
+            return
+        if self._wd >= 0:
+            self._libc.inotify_rm_watch(self._fd, self._wd)
+        wd = self._libc.inotify_add_watch(self._fd, directory.encode(), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._wd = wd
+        self._watched_dir = directory
+
+    def read_events(self) -> bool:
+        """
+        Consume pending notifications
+
+        Returns:
+            True if something relevant changed, i.e. the device may now be present
+        """
+        if self._fd is None:
+            return False
+
+        relevant = False
+        watched_parent = self._watched_dir == os.path.dirname(self.device_path)
+        target_name = os.path.basename(self.device_path).encode()
+        while True:
+            try:
+                buffer = os.read(self._fd, 4096)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                logger.warning(f"️  Error reading device notifications: {e}")
+                break
+            if not buffer:
+                break
+
+            offset = 0
+            while offset + _EVENT.size <= len(buffer):
+                _, mask, _, length = _EVENT.unpack_from(buffer, offset)
+                name = buffer[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+                if mask & IN_IGNORED:
+                    self._wd = -1
+                    relevant = True
+                elif not watched_parent or name == target_name:
+                    relevant = True
+
+        if relevant:
+            try:
+                # An intermediate directory may have appeared (or ours vanished): follow it
+                self._arm()
+            except OSError as e:
+                logger.debug(f" Could not re-arm device watch: {e}")
+        return relevant
+
+    def close(self):
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+        self._fd = None
+        self._wd = -1
+
+
+def device_present(device_path: str) -> bool:
+    """True if the device node exists (always True for non-path ports such as COM3)"""
+    if os.name == 'nt' or not os.path.isabs(device_path):
+        return True
+    return os.path.exists(device_path)
@@ -0,0 +1,120 @@
+"""
+Game State Store for Fast Reaction Game
+Single-writer counter blocks shared between the reader threads (serial, MQTT) and the UI thread
+"""
+
+from typing import Iterable, NamedTuple, Tuple
+
+from utils.serial_events import SerialEvent, SerialEventKind
+
+
+class PanelCounters(NamedTuple):
+    """Counters attributed to one reaction panel (serial port)"""
+    correct: int = 0
+    wrong: int = 0
+    miss: int = 0
+    score: int = 0
+
+
+class GameCounters(NamedTuple):
+    """Immutable snapshot of the in-game counters"""
+    correct: int = 0
+    wrong: int = 0
+    miss: int = 0
+    score: int = 0       # Sum of the latest Sc{score} reported by each panel
+    seq: int = 0         # Sequence number of the last event applied
+    generation: int = 0  # Bumped on every reset
+    panels: Tuple[PanelCounters, ...] = ()  # Indexed by SerialEvent.port_id
+
+
+class GameCounterStore:
+    """
+    Lock-free, single-writer store for correct/wrong/miss counts and the panel score.
+
+    The writer (the serial thread) builds a new immutable GameCounters tuple and
+    publishes it with a single reference assignment, which is atomic in CPython.
+    Readers call snapshot() and always get a coherent set of counters in O(1),
+    never a half-applied update.
+
+    reset() may be called from the UI thread. It only bumps the generation; the
+    writer notices on its next apply and starts from zero, and snapshot() hides
+    any value published under an older generation in the meantime.
+    """
+
+    def __init__(self):
+        self._generation = 0
+        self._snapshot = GameCounters()
+
+    def snapshot(self) -> GameCounters:
+        """Return the latest published counters (any thread)"""
+        snap = self._snapshot
+        generation = self._generation
+        if snap.generation != generation:
+            return GameCounters(generation=generation)
+        return snap
+
+    def reset(self) -> None:
+        """Zero all counters for a new game (UI thread)"""
+        self._generation += 1
+        self._snapshot = GameCounters(generation=self._generation)
+
+    def apply(self, event: SerialEvent) -> GameCounters:
+        """Apply one event and publish the result (writer thread only)"""
+        return self.apply_batch((event,))
+
+    def apply_batch(self, events: Iterable[SerialEvent]) -> GameCounters:
+        """Apply events in order and publish the result once (writer thread only)"""
+        generation = self._generation
+        snap = self._snapshot
+        if snap.generation != generation:
+            snap = GameCounters(generation=generation)
+
+        panels = [list(panel) for panel in snap.panels]
+        seq = snap.seq
+        for event in events:
+            kind = event.kind
+            port_id = event.port_id
+            while len(panels) <= port_id:
+                panels.append([0, 0, 0, 0])
+            panel = panels[port_id]
+            if kind == SerialEventKind.CORRECT:
+                panel[0] += 1
+            elif kind == SerialEventKind.MISTAKE:
+                panel[1] += 1
+            elif kind == SerialEventKind.MISS:
+                panel[2] += 1
+            elif kind == SerialEventKind.SCORE:
+                panel[3] = event.value
+            seq = event.seq
+
+        frozen = tuple(PanelCounters(*panel) for panel in panels)
+        snap = GameCounters(
+            correct=sum(panel.correct for panel in frozen),
+            wrong=sum(panel.wrong for panel in frozen),
+            miss=sum(panel.miss for panel in frozen),
+            score=sum(panel.score for panel in frozen),
+            seq=seq,
+            generation=generation,
+            panels=frozen,
+        )
+        self._snapshot = snap
+        return snap
+
+
+def merge_counters(*snapshots: GameCounters) -> GameCounters:
+    """
+    Combine snapshots from independent stores (e.g. serial panels and MQTT panels)
+
+    Counts and scores add up; panels are concatenated in argument order.
+    """
+    if len(snapshots) == 1:
+        return snapshots[0]
+    return GameCounters(
+        correct=sum(snap.correct for snap in snapshots),
+        wrong=sum(snap.wrong for snap in snapshots),
+        miss=sum(snap.miss for snap in snapshots),
+        score=sum(snap.score for snap in snapshots),
+        seq=max((snap.seq for snap in snapshots), default=0),
+        generation=max((snap.generation for snap in snapshots), default=0),
+        panels=tuple(panel for snap in snapshots for panel in snap.panels),
+    )
@@ -0,0 +1,166 @@
+"""
+Performance Metrics for Fast Reaction Game
+In-process counters, latency samples and queue-depth gauges, published over MQTT so a
+whole floor of stations can be watched from one dashboard
+
+Recording is cheap (a lock and a dict update) and safe from any thread. Every value is
+kept per window: "interval" is reset by each periodic report during play, "game" by the
+end-of-game summary.
+"""
+
+import collections
+import json
+import re
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+WINDOW_INTERVAL = "interval"
+WINDOW_GAME = "game"
+
+_LATENCY_SAMPLES = 512  # Per metric and window; percentiles cover the most recent samples
+
+# Path segments that are ids (numbers, hex object ids, UUIDs) collapse to ":id" in API metric names
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F]{24}|[0-9a-fA-F-]{32,36})$")
+
+
+class _Window:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.counters: Dict[str, int] = collections.defaultdict(int)
+        self.latencies: Dict[str, collections.deque] = {}
+
+
+def _percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, latency samples (ms) and gauges"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows = {WINDOW_INTERVAL: _Window(), WINDOW_GAME: _Window()}
+        self._gauges: Dict[str, Callable[[], float]] = {}
+
+    def increment(self, name: str, count: int = 1):
+        with self._lock:
+            for window in self._windows.values():
+                window.counters[name] += count
+
+    def observe(self, name: str, value_ms: float):
+        """Record one latency sample in milliseconds"""
+        with self._lock:
+            for window in self._windows.values():
+                samples = window.latencies.get(name)
+                if samples is None:
+                    samples = window.latencies[name] = collections.deque(maxlen=_LATENCY_SAMPLES)
+                samples.append(value_ms)
+
+    def register_gauge(self, name: str, read: Callable[[], float]):
+        """read() is called at report time, e.g. to sample a queue depth"""
+        with self._lock:
+            self._gauges[name] = read
+
+    def unregister_gauge(self, name: str):
+        with self._lock:
+            self._gauges.pop(name, None)
+
+    def reset(self, window: str):
+        with self._lock:
+            self._windows[window] = _Window()
+
+    def snapshot(self, window: str = WINDOW_INTERVAL, reset: bool = True) -> dict:
+        """Summarise a window: counts, rates per second, latency percentiles and current gauges"""
+        with self._lock:
+            current = self._windows[window]
+            if reset:
+                self._windows[window] = _Window()
+            gauges = dict(self._gauges)
+            counters = dict(current.counters)
+            latencies = {name: sorted(samples) for name, samples in current.latencies.items() if samples}
+
+        elapsed = max(time.monotonic() - current.started, 1e-6)
+        gauge_values = {}
+        for name, read in gauges.items():
+            try:
+                gauge_values[name] = read()
+            except Exception as e:
+                logger.debug(f" Gauge {name} unavailable: {e}")
+
+        return {
+            "window_s": round(elapsed, 3),
+            "counters": counters,
+            "rates": {name: round(count / elapsed, 3) for name, count in counters.items()},
+            "latency_ms": {
+                name: {
+                    "n": len(ordered),
+                    "p50": round(_percentile(ordered, 0.50), 3),
+                    "p95": round(_percentile(ordered, 0.95), 3),
+                    "max": round(ordered[-1], 3),
+                }
+                for name, ordered in latencies.items()
+            },
+            "gauges": gauge_values,
+        }
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
+
+
+def api_metric_name(method: str, url: str) -> str:
+    """'GET', 'https://host/api/game-results/6512.../status' -> 'api.GET /api/game-results/:id/status'"""
+    path = urlparse(url).path or "/"
+    segments = [":id" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/")]
+    return f"api.{method} {'/'.join(segments)}"
+
+
+def record_api_latency(response, *args, **kwargs):
+    """requests response hook: record the server round trip (response.elapsed) per endpoint"""
+    try:
+        request = response.request
+        metrics.observe(api_metric_name(request.method, request.url), response.elapsed.total_seconds() * 1000)
+        if response.status_code >= 400:
+            metrics.increment("api.errors")
+    except Exception as e:
+        logger.debug(f" Could not record API latency: {e}")
+    return response
+
+
+class MetricsPublisher:
+    """
+    Formats registry snapshots as compact JSON and hands them to a publish function
+
+    Args:
+        registry: Registry to report
+        publish: publish(topic, payload) -> bool, e.g. MqttThread.publish
+        topic: Destination topic, e.g. FastReaction/station-7/metrics
+        station: Station identifier included in every message
+    """
+
+    def __init__(self, registry: MetricsRegistry, publish: Callable[[str, str], bool], topic: str, station: str):
+        self.registry = registry
+        self._publish = publish
+        self.topic = topic
+        self.station = station
+
+    def publish(self, window: str = WINDOW_INTERVAL, kind: Optional[str] = None) -> bool:
+        report = self.registry.snapshot(window)
+        report["station"] = self.station
+        report["type"] = kind or window
+        report["ts"] = round(time.time(), 3)
+        payload = json.dumps(report, separators=(",", ":"))
+        try:
+            published = self._publish(self.topic, payload)
+        except Exception as e:
+            logger.warning(f"️  Could not publish metrics to {self.topic}: {e}")
+            return False
+        if published:
+            logger.debug(f" Published {report['type']} metrics ({len(payload)} bytes) to {self.topic}")
+        return bool(published)
@@ -0,0 +1,149 @@
+"""
+MQTT Panel Event Ingest for Fast Reaction Game
+Turns payloads on the MQTT data topics (MQTTConfig.data_topics) into the same SerialEvent
+batches the serial thread produces, for stations whose panels report over MQTT
+
+Payload: one or more panel messages, one per line, each optionally prefixed with the
+publisher's sequence number:
+    Crct
+    17:Sc120
+    18:Mstk
+
+Sequence numbers let redelivered QoS 1 messages be dropped. Unsequenced messages
+are deduplicated by packet id when the broker flags them as a redelivery (DUP).
+
+Each data topic is its own panel: events carry the topic's panel id as port_id, so
+Sc{score} values from different panels are kept apart in the GameCounterStore.
+"""
+
+import collections
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from utils.game_state import GameCounterStore
+from utils.panel_protocol import decode_line
+from utils.serial_events import SerialEvent, SerialEventKind
+
+_SEQUENCED_LINE = re.compile(r"(\d{1,18})\s*:\s*(.+)")
+
+# A sequence number this far below the last one seen means the publisher restarted
+SEQ_RESTART_GAP = 1000
+
+
+class MqttEventIngest:
+    """
+    Collects decoded events between flushes
+
+    add() is called from the paho on_message callback; flush() hands the caller one
+    batch with score updates coalesced to the latest value per panel and publishes it
+    to the counter store in a single step. reset() may come from another thread (a new
+    game started from the UI), so all three run under one lock.
+
+    Args:
+        panel_ids: Topic -> panel id (SerialEvent.port_id); unknown topics map to 0
+    """
+
+    def __init__(self, store: GameCounterStore, flush_interval_ms: int = 10, max_batch_size: int = 256,
+                 dedupe_window: int = 1024, panel_ids: Optional[Dict[str, int]] = None):
+        self.store = store
+        self.panel_ids = dict(panel_ids or {})
+        self._lock = threading.Lock()
+        self.flush_interval_ns = max(0, flush_interval_ms) * 1_000_000
+        self.max_batch_size = max(1, max_batch_size)
+        self._pending: List[SerialEvent] = []
+        self._first_pending_ns: Optional[int] = None
+        self._event_seq = 0
+        self._last_seq: Dict[str, int] = {}  # topic -> highest publisher sequence seen
+        self._recent_mids = collections.deque(maxlen=dedupe_window)
+        self._recent_mid_set = set()
+        self.duplicates_dropped = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def add(self, topic: str, payload: str, mid: int = 0, dup: bool = False) -> int:
+        """Decode one message; returns the number of events queued"""
+        with self._lock:
+            return self._add(topic, payload, mid, dup)
+
+    def _add(self, topic: str, payload: str, mid: int, dup: bool) -> int:
+        port_id = self.panel_ids.get(topic, 0)
+        if mid:
+            if dup and mid in self._recent_mid_set:
+                self.duplicates_dropped += 1
+                return 0
+            if len(self._recent_mids) == self._recent_mids.maxlen:
+                self._recent_mid_set.discard(self._recent_mids[0])
+            self._recent_mids.append(mid)
+            self._recent_mid_set.add(mid)
+
+        now = time.monotonic_ns()
+        added = 0
+        for line in payload.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            match = _SEQUENCED_LINE.fullmatch(line)
+            if match:
+                seq = int(match.group(1))
+                line = match.group(2).strip()
+                last = self._last_seq.get(topic)
+                if last is not None and seq <= last and last - seq < SEQ_RESTART_GAP:
+                    self.duplicates_dropped += 1
+                    continue
+                self._last_seq[topic] = seq
+
+            kind, value = decode_line(line)
+            if kind == SerialEventKind.UNKNOWN:
+                continue
+            self._event_seq += 1
+            self._pending.append(SerialEvent(kind, value, now, self._event_seq, line, port_id))
+            added += 1
+
+        if added and self._first_pending_ns is None:
+            self._first_pending_ns = now
+        return added
+
+    def seconds_until_flush(self, idle: float = 1.0) -> float:
+        """How long the network loop may block before the pending batch is due"""
+        if self._first_pending_ns is None:
+            return idle
+        remaining = self._first_pending_ns + self.flush_interval_ns - time.monotonic_ns()
+        return max(0.0, remaining / 1e9)
+
+    def flush_due(self) -> bool:
+        if self._first_pending_ns is None:
+            return False
+        return (len(self._pending) >= self.max_batch_size
+                or time.monotonic_ns() - self._first_pending_ns >= self.flush_interval_ns)
+
+    def flush(self) -> List[SerialEvent]:
+        """Return the pending batch (latest score per panel only) after publishing it to the store"""
+        with self._lock:
+            events = self._pending
+            if not events:
+                return []  # Never hand out the live list add() appends to
+            self._pending = []
+            self._first_pending_ns = None
+
+            last_score = {}  # port_id -> index of its latest score
+            for index, event in enumerate(events):
+                if event.kind == SerialEventKind.SCORE:
+                    last_score[event.port_id] = index
+            if last_score:
+                keep = set(last_score.values())
+                events = [event for index, event in enumerate(events)
+                          if event.kind != SerialEventKind.SCORE or index in keep]
+
+            self.store.apply_batch(events)
+            return events
+
+    def reset(self):
+        """Drop pending events and forget publisher sequence numbers (new game; any thread)"""
+        with self._lock:
+            self._pending = []
+            self._first_pending_ns = None
+            self._last_seq.clear()
@@ -0,0 +1,74 @@
+"""
+MQTT Topic Layout for Fast Reaction Game
+Maps the logical topics in MQTTConfig (FastReaction/game/start, ...) to the concrete
+topics one station uses on a broker shared by many stations
+
+With a station id (Settings.station_id) every topic is addressed to this station:
+    FastReaction/game/start  ->  FastReaction/{station}/game/start
+Topics listed in MQTTConfig.broadcast_topics are also subscribed in their global form,
+so a single publish still reaches every station (e.g. a fleet-wide timer change).
+Without a station id every topic stays global, exactly as before.
+"""
+
+from typing import Iterable, List
+
+DEFAULT_TOPIC_TEMPLATE = "{root}/{station}/{path}"
+
+_INVALID_STATION_CHARS = set("+#/")
+
+
+class TopicLayout:
+    """
+    Station-specific and broadcast forms of logical topic names
+
+    Args:
+        station: Station id; empty keeps all topics global
+        template: Station topic format, with {root} (first level of the logical name),
+            {path} (the rest) and {station}
+        broadcast: Logical names that are also subscribed in their global form
+        prefix: MQTTConfig.topic_prefix, prepended to every concrete topic
+    """
+
+    def __init__(self, station: str = "", template: str = DEFAULT_TOPIC_TEMPLATE,
+                 broadcast: Iterable[str] = (), prefix: str = ""):
+        if station and (_INVALID_STATION_CHARS & set(station)):
+            raise ValueError(f"Station id '{station}' must not contain '+', '#' or '/'")
+        self.station = station
+        self.template = template or DEFAULT_TOPIC_TEMPLATE
+        self.broadcast = frozenset(broadcast or ())
+        self.prefix = prefix or ""
+
+    @classmethod
+    def from_config(cls, mqtt_config, station: str = "") -> "TopicLayout":
+        return cls(
+            station=station,
+            template=getattr(mqtt_config, 'topic_template', DEFAULT_TOPIC_TEMPLATE),
+            broadcast=getattr(mqtt_config, 'broadcast_topics', None) or (),
+            prefix=getattr(mqtt_config, 'topic_prefix', ''),
+        )
+
+    def broadcast_topic(self, name: str) -> str:
+        """Global form shared by every station"""
+        return f"{self.prefix}{name}"
+
+    def station_topic(self, name: str) -> str:
+        """Topic that addresses this station only (the global form without a station id)"""
+        if not self.station:
+            return self.broadcast_topic(name)
+        root, _, path = name.partition("/")
+        topic = self.template.format(root=root, station=self.station, path=path)
+        # A single-level name leaves an empty {path}
+        return self.broadcast_topic("/".join(level for level in topic.split("/") if level))
+
+    def subscriptions(self, name: str) -> List[str]:
+        """Every concrete topic a logical name is received on"""
+        topics = [self.station_topic(name)]
+        if name in self.broadcast:
+            broadcast = self.broadcast_topic(name)
+            if broadcast not in topics:
+                topics.append(broadcast)
+        return topics
+
+    def expand(self, names: Iterable[str]) -> List[str]:
+        """Concrete topics for a list of logical names (e.g. MQTTConfig.control_topics)"""
+        return [topic for name in names for topic in self.subscriptions(name)]
@@ -0,0 +1,204 @@
+"""
+Panel Protocol for Fast Reaction Game
+Single decoder for everything the reaction panel sends, in either framing mode
+
+Line framing (default, what the panels ship with), case-insensitive:
+    Sc{score}\\n | Mstk\\n | Crct\\n | Miss\\n | Ok\\n
+
+Binary framing (SerialConfig.framing = "binary"):
+    frame:   0xA5 | payload length (u8) | payload | CRC-16/CCITT of length + payload (u16, big endian)
+    payload: one or more 5-byte events, kind (u8, SerialEventKind) | value (i32, little endian)
+
+A binary frame carries a whole burst of events, so a panel at high baud sends one
+frame instead of one line per hit and the reader does one struct unpack per event.
+A frame with a bad length or CRC is dropped whole and the decoder resynchronises on
+the next 0xA5, so line noise never turns into a miscounted hit.
+"""
+
+import re
+import struct
+import time
+from binascii import crc_hqx
+from typing import Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from utils.serial_events import SerialEvent, SerialEventKind
+
+FRAMING_LINE = "line"
+FRAMING_BINARY = "binary"
+
+FRAME_SYNC = 0xA5
+_FRAME_EVENT = struct.Struct("<Bi")
+_FRAME_CRC_INIT = 0xFFFF
+MAX_EVENTS_PER_FRAME = 0xFF // _FRAME_EVENT.size
+
+# Longest line kept while waiting for its terminator; anything longer is noise
+MAX_LINE_LENGTH = 256
+
+# Exact (lowercased) line -> kind; Sc{score} is matched separately
+_LINE_KINDS = {
+    "mstk": SerialEventKind.MISTAKE,
+    "crct": SerialEventKind.CORRECT,
+    "miss": SerialEventKind.MISS,
+    "ok": SerialEventKind.OK,
+}
+_SCORE_LINE = re.compile(r"sc\s*([+-]?\d{1,9})", re.IGNORECASE)
+
+_LINE_TEXT = {
+    SerialEventKind.MISTAKE: "Mstk",
+    SerialEventKind.CORRECT: "Crct",
+    SerialEventKind.MISS: "Miss",
+    SerialEventKind.OK: "Ok",
+}
+
+
+class DecodedMessage(NamedTuple):
+    """One message decoded from the port, before it is stamped into a SerialEvent"""
+    kind: SerialEventKind
+    value: int   # Score for SCORE messages, 0 otherwise
+    text: str    # Line form of the message, for logs and the legacy data_received signal
+    raw: bytes   # Bytes on the wire; empty for the later events of a multi-event frame
+
+
+def decode_line(line: str) -> Tuple[SerialEventKind, int]:
+    """
+    Decode one panel line (without its terminator)
+
+    Returns:
+        (kind, value); anything that is not exactly one of the known messages is UNKNOWN
+    """
+    token = line.strip()
+    kind = _LINE_KINDS.get(token.lower())
+    if kind is not None:
+        return kind, 0
+    match = _SCORE_LINE.fullmatch(token)
+    if match:
+        return SerialEventKind.SCORE, int(match.group(1))
+    return SerialEventKind.UNKNOWN, 0
+
+
+def format_line(kind: SerialEventKind, value: int = 0) -> str:
+    """Line form of a message (without terminator), e.g. Sc120 or Crct"""
+    if kind == SerialEventKind.SCORE:
+        return f"Sc{value}"
+    return _LINE_TEXT.get(kind, "")
+
+
+def parse_serial_line(line: str, timestamp_ns: Optional[int] = None, seq: int = 0, port_id: int = 0) -> SerialEvent:
+    """
+    Parse a raw serial line into a SerialEvent
+
+    Args:
+        line: Stripped line as read from the port
+        timestamp_ns: Arrival time from time.monotonic_ns(); stamped now if omitted
+        seq: Sequence number assigned by the reader
+        port_id: Panel the line arrived on
+
+    Returns:
+        SerialEvent; malformed or unrecognised lines come back as UNKNOWN
+    """
+    if timestamp_ns is None:
+        timestamp_ns = time.monotonic_ns()
+    kind, value = decode_line(line)
+    return SerialEvent(kind, value, timestamp_ns, seq, line, port_id)
+
+
+def encode_frame(events: Iterable[Tuple[int, int]]) -> bytes:
+    """Build one binary frame from (kind, value) pairs (panel firmware reference / test tools)"""
+    payload = b"".join(_FRAME_EVENT.pack(int(kind), value) for kind, value in events)
+    if not payload or len(payload) > 0xFF:
+        raise ValueError(f"A frame carries 1 to {MAX_EVENTS_PER_FRAME} events")
+    body = bytes((len(payload),)) + payload
+    return bytes((FRAME_SYNC,)) + body + crc_hqx(body, _FRAME_CRC_INIT).to_bytes(2, "big")
+
+
+class LineDecoder:
+    """Incremental decoder for newline-terminated panel lines"""
+
+    framing = FRAMING_LINE
+
+    def __init__(self):
+        self._buffer = b""
+
+    def feed(self, data: bytes) -> List[DecodedMessage]:
+        """Decode every complete line in data; a partial line is kept for the next call"""
+        lines = (self._buffer + data).split(b"\n")
+        self._buffer = lines.pop()
+        if len(self._buffer) > MAX_LINE_LENGTH:
+            self._buffer = b""
+
+        messages = []
+        for raw in lines:
+            raw = raw.strip()
+            if not raw:
+                continue
+            text = raw.decode("utf-8", errors="ignore")
+            kind, value = decode_line(text)
+            messages.append(DecodedMessage(kind, value, text, raw))
+        return messages
+
+    def reset(self):
+        self._buffer = b""
+
+
+class FrameDecoder:
+    """Incremental decoder for CRC-checked binary frames"""
+
+    framing = FRAMING_BINARY
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.rejected_frames = 0  # Bad length or CRC, counted for diagnostics
+
+    def feed(self, data: bytes) -> List[DecodedMessage]:
+        """Decode every complete frame in data; a partial frame is kept for the next call"""
+        buffer = self._buffer
+        buffer += data
+        messages = []
+        while True:
+            start = buffer.find(FRAME_SYNC)
+            if start < 0:
+                buffer.clear()
+                break
+            if start:
+                del buffer[:start]
+            if len(buffer) < 2:
+                break
+
+            length = buffer[1]
+            if length == 0 or length % _FRAME_EVENT.size:
+                self.rejected_frames += 1
+                del buffer[:1]
+                continue
+            end = length + 4
+            if len(buffer) < end:
+                break
+            if crc_hqx(buffer[1:end - 2], _FRAME_CRC_INIT) != int.from_bytes(buffer[end - 2:end], "big"):
+                self.rejected_frames += 1
+                del buffer[:1]
+                continue
+
+            frame = bytes(buffer[:end])
+            del buffer[:end]
+            raw = frame
+            for kind, value in _FRAME_EVENT.iter_unpack(frame[2:end - 2]):
+                try:
+                    kind = SerialEventKind(kind)
+                except ValueError:
+                    kind, value = SerialEventKind.UNKNOWN, 0
+                if kind != SerialEventKind.SCORE:
+                    value = 0
+                messages.append(DecodedMessage(kind, value, format_line(kind, value), raw))
+                raw = b""
+        return messages
+
+    def reset(self):
+        self._buffer.clear()
+
+
+def create_decoder(framing: str = FRAMING_LINE) -> Union[LineDecoder, FrameDecoder]:
+    """Return a fresh decoder for SerialConfig.framing"""
+    if framing == FRAMING_LINE:
+        return LineDecoder()
+    if framing == FRAMING_BINARY:
+        return FrameDecoder()
+    raise ValueError(f"Unknown serial framing '{framing}' (expected '{FRAMING_LINE}' or '{FRAMING_BINARY}')")
@@ -0,0 +1,169 @@
+"""
+Runtime Settings Store for Fast Reaction Game
+Values changed while the game runs (e.g. timers pushed over MQTT), kept in memory and
+persisted to a single JSON file
+
+set() only updates memory and notifies listeners, so it is cheap enough to call from
+the MQTT network thread. The file is rewritten at most once per debounce interval on a
+background timer thread, via a temporary file and os.replace() so a crash mid-write never
+leaves a truncated file behind.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Keys
+TIMER_VALUE_MS = "timer_value_ms"                # Game duration (FastReaction/game/timer)
+FINAL_SCREEN_TIMER_MS = "final_screen_timer_ms"  # Final screen duration (FastReaction/game/timerfinal)
+
+# Files the MQTT handlers used to write, imported once if no settings file exists yet
+LEGACY_FILES = {
+    TIMER_VALUE_MS: "file2.txt",
+    FINAL_SCREEN_TIMER_MS: "file.txt",
+}
+
+
+class RuntimeSettings:
+    """
+    Thread-safe key/value store with change notifications and debounced persistence
+
+    Listeners are called as listener(key, value) on the thread that changed the value,
+    and only when the value actually changed.
+    """
+
+    def __init__(self, path: str, debounce_seconds: float = 1.0, legacy_files: Optional[Dict[str, str]] = None):
+        self.path = path
+        self.debounce_seconds = debounce_seconds
+        self._lock = threading.Lock()
+        self._values: Dict[str, Any] = {}
+        self._listeners: List[Callable[[str, Any], None]] = []
+        self._save_timer: Optional[threading.Timer] = None
+        self._dirty = False
+
+        self._load(LEGACY_FILES if legacy_files is None else legacy_files)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._values.get(key, default)
+
+    def set(self, key: str, value: Any) -> bool:
+        """Update a value; returns True if it changed (listeners notified, save scheduled)"""
+        with self._lock:
+            if key in self._values and self._values[key] == value:
+                return False
+            self._values[key] = value
+            self._dirty = True
+            self._schedule_save_locked()
+            listeners = list(self._listeners)
+
+        logger.debug(f" Runtime setting {key} = {value!r}")
+        for listener in listeners:
+            try:
+                listener(key, value)
+            except Exception as e:
+                logger.warning(f"️  Runtime settings listener failed for {key}: {e}")
+        return True
+
+    def subscribe(self, listener: Callable[[str, Any], None]):
+        with self._lock:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, Any], None]):
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def flush(self):
+        """Write pending changes now (call on shutdown)"""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+        self._save()
+
+    def _schedule_save_locked(self):
+        if self._save_timer is not None:
+            return  # Already pending - this change goes out with it
+        timer = threading.Timer(self.debounce_seconds, self._save_from_timer)
+        timer.daemon = True
+        self._save_timer = timer
+        timer.start()
+
+    def _save_from_timer(self):
+        with self._lock:
+            self._save_timer = None
+        self._save()
+
+    def _save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self._values)
+            self._dirty = False
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix=".runtime_settings_", suffix=".tmp", dir=directory)
+            with os.fdopen(fd, "w") as f:
+                json.dump(snapshot, f, indent=2, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+            temp_path = None
+            logger.debug(f" Runtime settings saved to {self.path}")
+        except Exception as e:
+            logger.warning(f"️  Could not save runtime settings to {self.path}: {e}")
+            with self._lock:
+                self._dirty = True
+        finally:
+            if temp_path is not None:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+
+    def _load(self, legacy_files: Dict[str, str]):
+        try:
+            with open(self.path, "r") as f:
+                values = json.load(f)
+            if isinstance(values, dict):
+                self._values = values
+                logger.info(f" Runtime settings loaded from {self.path}")
+            else:
+                logger.warning(f"️  Ignoring {self.path}: expected a JSON object")
+            return
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            logger.warning(f"️  Could not read runtime settings from {self.path}: {e}")
+            return
+
+        # First run with the store: carry over values the old handlers left on disk
+        for key, legacy_path in legacy_files.items():
+            value = _read_legacy_value(legacy_path)
+            if value is not None:
+                self._values[key] = value
+                self._dirty = True
+                logger.info(f" Migrated {key}={value} from {legacy_path}")
+        if self._dirty:
+            self._save()
+
+
+def _read_legacy_value(path: str) -> Optional[int]:
+    """Last non-empty line of a legacy timer file as an int, or None"""
+    try:
+        with open(path, "r") as f:
+            lines = [line.strip() for line in f if line.strip()]
+        return int(lines[-1]) if lines else None
+    except FileNotFoundError:
+        return None
+    except (ValueError, OSError) as e:
+        logger.warning(f"️  Ignoring unreadable {path}: {e}")
+        return None
@@ -0,0 +1,298 @@
+"""
+Score Outbox for Fast Reaction Game
+Durable queue of score submissions in a local SQLite database (WAL mode), drained by a
+background sender
+
+GameManager only enqueues a game's result - one transaction, then the station moves on
+to the next team. ScoreSender posts pending rows to /game-result/scoring, retrying with
+exponential backoff until the server accepts them, and survives restarts because the
+rows stay on disk until they are marked sent.
+
+The gameResultID is the primary key and the idempotency key: a game can only be queued
+once, re-enqueueing it updates the still-pending row, and every attempt carries the same
+Idempotency-Key header so a retry after a lost response is recognisable server-side.
+
+external_csv_submitter.py lists and resubmits rows from the same database.
+"""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from utils.logger import get_logger
+from utils.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Row status
+STATUS_PENDING = "pending"  # Waiting to be sent (or retried)
+STATUS_SENT = "sent"        # Accepted by the server
+STATUS_FAILED = "failed"    # Gave up after max_attempts; resubmit with external_csv_submitter.py
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS score_outbox (
+    game_result_id  TEXT PRIMARY KEY,
+    team_name       TEXT NOT NULL DEFAULT '',
+    payload         TEXT NOT NULL,
+    total_score     INTEGER NOT NULL DEFAULT 0,
+    status          TEXT NOT NULL DEFAULT 'pending',
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    last_error      TEXT,
+    created_at      REAL NOT NULL,
+    updated_at      REAL NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    sent_at         REAL
+);
+CREATE INDEX IF NOT EXISTS score_outbox_due ON score_outbox (status, next_attempt_at);
+"""
+
+# 4xx answers that may succeed on a later attempt; any other 4xx is a permanent rejection
+_RETRYABLE_CLIENT_ERRORS = (401, 408, 429)
+
+
+def is_retryable(status) -> bool:
+    """Whether a failed submission (HTTP status, None = no response) is worth retrying"""
+    return status is None or not (400 <= status < 500) or status in _RETRYABLE_CLIENT_ERRORS
+
+
+_COLUMNS = ("game_result_id, team_name, payload, total_score, status, attempts, last_error, "
+            "created_at, next_attempt_at, sent_at")
+
+
+@dataclass
+class OutboxEntry:
+    """One queued game result"""
+    game_result_id: str
+    team_name: str
+    individual_scores: List[Dict]
+    total_score: int
+    status: str
+    attempts: int
+    last_error: Optional[str]
+    created_at: float
+    next_attempt_at: float
+    sent_at: Optional[float]
+
+    @property
+    def idempotency_key(self) -> str:
+        return self.game_result_id
+
+    @classmethod
+    def from_row(cls, row) -> "OutboxEntry":
+        (game_result_id, team_name, payload, total_score, status, attempts, last_error,
+         created_at, next_attempt_at, sent_at) = row
+        return cls(game_result_id, team_name, json.loads(payload), total_score, status, attempts,
+                   last_error, created_at, next_attempt_at, sent_at)
+
+
+class ScoreOutbox:
+    """
+    Thread-safe access to the outbox database
+
+    Several processes may open the same file (the game and external_csv_submitter.py);
+    WAL lets readers run alongside the writer, and busy_timeout covers short write locks.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")  # Durable across app crashes; WAL keeps it consistent
+            self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def enqueue(self, game_result_id: str, individual_scores: List[Dict], team_name: str = "") -> bool:
+        """
+        Queue a game result for submission
+
+        Returns:
+            True if the row is pending, False if this game was already sent (nothing changed)
+        """
+        now = time.time()
+        payload = json.dumps(individual_scores)
+        total_score = sum(score.get('score', 0) for score in individual_scores)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO score_outbox (game_result_id, team_name, payload, total_score, status, "
+                "attempts, created_at, updated_at, next_attempt_at) VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?) "
+                "ON CONFLICT (game_result_id) DO UPDATE SET team_name = excluded.team_name, "
+                "payload = excluded.payload, total_score = excluded.total_score, status = excluded.status, "
+                "updated_at = excluded.updated_at, next_attempt_at = excluded.next_attempt_at "
+                "WHERE score_outbox.status != ?",
+                (game_result_id, team_name, payload, total_score, STATUS_PENDING, now, now, now, STATUS_SENT))
+            row = self._conn.execute("SELECT status FROM score_outbox WHERE game_result_id = ?",
+                                     (game_result_id,)).fetchone()
+        return row is not None and row[0] == STATUS_PENDING
+
+    def get(self, game_result_id: str) -> Optional[OutboxEntry]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM score_outbox WHERE game_result_id = ?",
+                                     (game_result_id,)).fetchone()
+        return OutboxEntry.from_row(row) if row else None
+
+    def entries(self, status: Optional[str] = None) -> List[OutboxEntry]:
+        """All rows (or those with one status), oldest first"""
+        query = f"SELECT {_COLUMNS} FROM score_outbox"
+        params = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY created_at", params).fetchall()
+        return [OutboxEntry.from_row(row) for row in rows]
+
+    def due(self, now: Optional[float] = None, limit: int = 20) -> List[OutboxEntry]:
+        """Pending rows whose next attempt is due, oldest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM score_outbox WHERE status = ? AND next_attempt_at <= ? "
+                "ORDER BY created_at LIMIT ?",
+                (STATUS_PENDING, time.time() if now is None else now, limit)).fetchall()
+        return [OutboxEntry.from_row(row) for row in rows]
+
+    def next_attempt_at(self) -> Optional[float]:
+        """Earliest next attempt over all pending rows, None if nothing is pending"""
+        with self._lock:
+            row = self._conn.execute("SELECT MIN(next_attempt_at) FROM score_outbox WHERE status = ?",
+                                     (STATUS_PENDING,)).fetchone()
+        return row[0] if row else None
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM score_outbox WHERE status = ?",
+                                      (STATUS_PENDING,)).fetchone()[0]
+
+    def mark_sent(self, game_result_id: str):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE score_outbox SET status = ?, attempts = attempts + 1, last_error = NULL, "
+                "updated_at = ?, sent_at = ? WHERE game_result_id = ?",
+                (STATUS_SENT, now, now, game_result_id))
+
+    def mark_attempt_failed(self, game_result_id: str, error: str, next_attempt_at: Optional[float]):
+        """Record a failed attempt; next_attempt_at None gives up (status failed)"""
+        status = STATUS_PENDING if next_attempt_at is not None else STATUS_FAILED
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE score_outbox SET status = ?, attempts = attempts + 1, last_error = ?, "
+                "updated_at = ?, next_attempt_at = ? WHERE game_result_id = ?",
+                (status, error, now, next_attempt_at if next_attempt_at is not None else now, game_result_id))
+
+    def requeue(self, game_result_id: str, force: bool = False) -> bool:
+        """Make a failed (or, with force, a sent) row pending again, due now"""
+        allowed = (STATUS_FAILED, STATUS_SENT) if force else (STATUS_FAILED,)
+        now = time.time()
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"UPDATE score_outbox SET status = ?, updated_at = ?, next_attempt_at = ? "
+                f"WHERE game_result_id = ? AND status IN ({', '.join('?' * len(allowed))})",
+                (STATUS_PENDING, now, now, game_result_id, *allowed))
+        return cursor.rowcount > 0
+
+
+class ScoreSender(QThread):
+    """
+    Background sender draining a ScoreOutbox
+
+    Args:
+        outbox: Queue to drain
+        submit: submit(game_result_id, individual_scores, idempotency_key) -> HTTP status or
+            None without a response; runs on this thread (GameAPI.submit_final_scores_status)
+        retry_interval: Delay after the first failed attempt, doubled per further failure
+        retry_interval_max: Longest delay between attempts
+        max_attempts: Give up (status failed) after this many attempts; 0 retries forever
+
+    A 2xx marks the row sent. A 4xx other than 401/408/429 means the server will never
+    accept this payload, so the row is marked failed at once instead of being retried.
+    """
+    submitted = pyqtSignal(str)       # game_result_id accepted by the server
+    gave_up = pyqtSignal(str, str)    # game_result_id, last error
+
+    IDLE_WAKEUP = 60.0  # Re-check the database this often even without wake()
+
+    def __init__(self, outbox: ScoreOutbox, submit: Callable[[str, List[Dict], str], Optional[int]],
+                 retry_interval: float = 5.0, retry_interval_max: float = 300.0, max_attempts: int = 0):
+        super().__init__()
+        self.outbox = outbox
+        self._submit = submit
+        self.retry_interval = max(0.1, retry_interval)
+        self.retry_interval_max = max(self.retry_interval, retry_interval_max)
+        self.max_attempts = max(0, max_attempts)
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def wake(self):
+        """Send due rows now (any thread), e.g. right after enqueue()"""
+        self._wake.set()
+
+    def stop(self, timeout_ms: int = 5000):
+        self._stopping.set()
+        self._wake.set()
+        if not self.wait(timeout_ms):
+            logger.warning("️  Score sender did not stop in time")
+
+    def run(self):
+        pending = self.outbox.pending_count()
+        logger.info(f" Score sender started ({pending} pending in {self.outbox.path})")
+        while not self._stopping.is_set():
+            for entry in self.outbox.due():
+                if self._stopping.is_set():
+                    break
+                self._send(entry)
+
+            next_attempt = self.outbox.next_attempt_at()
+            delay = self.IDLE_WAKEUP if next_attempt is None else min(self.IDLE_WAKEUP, next_attempt - time.time())
+            if delay > 0:
+                self._wake.wait(delay)
+            self._wake.clear()
+        logger.info(" Score sender stopped")
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.retry_interval * 2 ** max(0, attempts - 1), self.retry_interval_max)
+        return delay * random.uniform(0.8, 1.2)
+
+    def _send(self, entry: OutboxEntry):
+        logger.info(f" Submitting queued scores for {entry.game_result_id} "
+                    f"(team '{entry.team_name}', attempt {entry.attempts + 1})")
+        status = None
+        try:
+            status = self._submit(entry.game_result_id, entry.individual_scores, entry.idempotency_key)
+            error = f"HTTP {status}" if status is not None else "no response"
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+
+        if status is not None and 200 <= status < 300:
+            self.outbox.mark_sent(entry.game_result_id)
+            metrics.increment("scores.sent")
+            self.submitted.emit(entry.game_result_id)
+            return
+
+        attempts = entry.attempts + 1
+        if not is_retryable(status):
+            self.outbox.mark_attempt_failed(entry.game_result_id, error, None)
+            metrics.increment("scores.rejected")
+            logger.error(f" Scores for {entry.game_result_id} rejected by the server ({error}), not retrying")
+            self.gave_up.emit(entry.game_result_id, error)
+            return
+        metrics.increment("scores.retries")
+        if self.max_attempts and attempts >= self.max_attempts:
+            self.outbox.mark_attempt_failed(entry.game_result_id, error, None)
+            logger.error(f" Giving up on scores for {entry.game_result_id} after {attempts} attempts: {error}")
+            self.gave_up.emit(entry.game_result_id, error)
+            return
+        delay = self._backoff(attempts)
+        self.outbox.mark_attempt_failed(entry.game_result_id, error, time.time() + delay)
+        logger.warning(f"️  Scores for {entry.game_result_id} not submitted ({error}), retrying in {delay:.0f}s")
@@ -0,0 +1,28 @@
+"""
+Serial Event Records for Fast Reaction Game
+Compact, timestamped record for each message the panel sends (decoded by utils.panel_protocol)
+"""
+
+from enum import IntEnum
+from typing import NamedTuple
+
+
+class SerialEventKind(IntEnum):
+    """Kinds of lines the reaction panel sends"""
+    UNKNOWN = 0
+    SCORE = 1    # Sc{score}
+    CORRECT = 2  # Crct
+    MISTAKE = 3  # Mstk
+    MISS = 4     # Miss
+    OK = 5       # Ok
+
+
+class SerialEvent(NamedTuple):
+    """One decoded panel message"""
+    kind: SerialEventKind
+    value: int          # Score for SCORE events, 0 otherwise
+    timestamp_ns: int   # time.monotonic_ns() when the line arrived
+    seq: int            # Per-thread sequence number, increases by one per line
+    raw: str            # Line form of the message, kept for logging and legacy consumers
+    port_id: int = 0    # Panel the line arrived on (0 = SerialConfig.port, 1.. = extra_ports)
+
@@ -0,0 +1,131 @@
+"""
+Serial Session Log for Fast Reaction Game
+Compact append-only binary capture of every line received from / sent to the panel
+
+File layout:
+    header:  b"FRSL" | version (u8) | session start wall clock, ns since epoch (u64)
+    record:  port/direction (u8) | delta since previous record, microseconds (u32) | length (u16) | payload
+
+The first record byte holds the direction in bit 0 and the panel port id in bits 1-7.
+
+Timestamps come from time.monotonic_ns(), so the deltas keep the real gaps between
+lines even if the wall clock is adjusted mid-game.
+"""
+
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Iterator, NamedTuple, Optional, Union
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAGIC = b"FRSL"
+VERSION = 1
+FILE_EXTENSION = ".frsl"
+
+DIRECTION_RX = 0  # Panel -> app
+DIRECTION_TX = 1  # App -> panel
+
+_HEADER = struct.Struct("<4sBQ")
+_RECORD = struct.Struct("<BIH")
+_MAX_DELTA_US = 0xFFFFFFFF
+_MAX_PAYLOAD = 0xFFFF
+
+
+class SessionRecord(NamedTuple):
+    """One captured line"""
+    direction: int
+    offset_ns: int  # Time since the first record of the session
+    data: bytes
+    port_id: int = 0
+
+
+class SerialSessionRecorder:
+    """
+    Append-only recorder for one game session
+
+    record() is safe to call from any thread; once close() has run it is a no-op.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._last_ns = None
+        self._file = open(path, "ab")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, time.time_ns()))
+        logger.info(f" Serial session capture started: {path}")
+
+    @classmethod
+    def for_game(cls, directory: str) -> 'SerialSessionRecorder':
+        """Create a recorder with a timestamped file name inside directory"""
+        os.makedirs(directory, exist_ok=True)
+        name = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}{FILE_EXTENSION}"
+        return cls(os.path.join(directory, name))
+
+    def record(self, direction: int, data: Union[str, bytes], timestamp_ns: Optional[int] = None, port_id: int = 0) -> None:
+        """Append one line (without its terminator) captured at timestamp_ns on panel port_id"""
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+        payload = data.encode("utf-8", errors="replace") if isinstance(data, str) else bytes(data)
+        payload = payload[:_MAX_PAYLOAD]
+
+        with self._lock:
+            if self._file is None:
+                return
+            if self._last_ns is None:
+                self._last_ns = timestamp_ns
+            delta_us = min(max(0, (timestamp_ns - self._last_ns) // 1000), _MAX_DELTA_US)
+            # Advance by what was stored so rounding never accumulates across records
+            self._last_ns += delta_us * 1000
+            try:
+                self._file.write(_RECORD.pack(direction | (port_id & 0x7F) << 1, delta_us, len(payload)))
+                self._file.write(payload)
+            except Exception as e:
+                logger.warning(f"️  Serial session capture write failed: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._file.close()
+                logger.info(f" Serial session capture saved: {self.path}")
+            except Exception as e:
+                logger.warning(f"️  Error closing serial session capture: {e}")
+            self._file = None
+
+
+def read_session_header(path: str) -> int:
+    """Return the session start wall clock (ns since epoch) stored in the header"""
+    with open(path, "rb") as f:
+        magic, version, started_ns = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a serial session log (version {VERSION})")
+    return started_ns
+
+
+def iter_session(path: str) -> Iterator[SessionRecord]:
+    """Yield the records of a session log in order; a truncated tail is ignored"""
+    with open(path, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return
+        magic, version, _ = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a serial session log (version {VERSION})")
+
+        offset_ns = 0
+        while True:
+            head = f.read(_RECORD.size)
+            if len(head) < _RECORD.size:
+                return
+            flags, delta_us, length = _RECORD.unpack(head)
+            data = f.read(length)
+            if len(data) < length:
+                return
+            offset_ns += delta_us * 1000
+            yield SessionRecord(flags & 1, offset_ns, data, flags >> 1)